@@ -42,7 +42,7 @@ BACKENDS: dict[str, dict[str, Any]] = {
         "side": "browser",
         "query_language": "json",
         "placeholder": '{"vector": [...], "limit": 10}',
-        "help": "JSON: vector, filter, limit, recommend, ids",
+        "help": "JSON: vector, vectors (batch search), filter, limit, recommend, ids",
     },
     "pinecone": {
         "name": "Pinecone",
@@ -56,14 +56,14 @@ BACKENDS: dict[str, dict[str, Any]] = {
         "side": "browser",
         "query_language": "graphql",
         "placeholder": "{ Get { Class(limit: 10) { ... } } }",
-        "help": "GraphQL with nearVector, nearText, where",
+        "help": 'GraphQL with nearVector, nearText, where; or JSON {"scan": Class} for a paged load',
     },
     "chroma": {
         "name": "Chroma",
         "side": "python",
         "query_language": "dict",
         "placeholder": '{"query_embeddings": [...], "n_results": 10}',
-        "help": "Dict: query_embeddings, where, n_results",
+        "help": "Dict: query_embeddings (one or more), where, n_results",
     },
     "lancedb": {
         "name": "LanceDB",
@@ -0,0 +1,34 @@
+"""Merging the result sets of a multi-query (batch) search."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def merge_results(result_sets: list[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    """Merge per-query point lists into one point set, deduplicated by id.
+
+    Each point is tagged with ``queries`` (indices of all queries that matched it)
+    and ``query`` (the index of the query it scored best for); its ``score`` is the
+    best one. Points keep the order in which they were first matched.
+
+    Args:
+        result_sets: Points per query, in query order.
+
+    Returns:
+        Merged points.
+    """
+    merged: dict[Any, dict[str, Any]] = {}
+    for index, points in enumerate(result_sets):
+        for point in points:
+            existing = merged.get(point["id"])
+            if existing is None:
+                merged[point["id"]] = {**point, "query": index, "queries": [index]}
+                continue
+            if index not in existing["queries"]:
+                existing["queries"].append(index)
+            score = point.get("score")
+            if score is not None and (existing.get("score") is None or score > existing["score"]):
+                existing["score"] = score
+                existing["query"] = index
+    return list(merged.values())
@@ -0,0 +1,84 @@
+"""Result cache for Python-side backend queries."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+def normalize_query(query: Any) -> str:
+    """Canonical query text: JSON compared by content, anything else with whitespace collapsed."""
+    text = query.strip() if isinstance(query, str) else json.dumps(query)
+    try:
+        return json.dumps(json.loads(text), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        return re.sub(r"\s+", " ", text)
+
+
+def query_key(backend: str, config: dict[str, Any], query: Any) -> str:
+    """Cache key from backend name, a hash of the connection config and the normalized query."""
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True, default=repr).encode()).hexdigest()[:16]
+    return f"{backend}|{digest}|{normalize_query(query)}"
+
+
+class QueryCache:
+    """Size-bounded LRU of query results that expire after a TTL.
+
+    Thread-safe, since queries run on a background executor.
+
+    Args:
+        max_entries: Results kept before the least recently used is evicted.
+        ttl: Seconds a result stays valid (0, the default, disables caching).
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: float = 0.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """Cached result for key, or None (counted as a miss)."""
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a result, evicting the least recently used beyond ``max_entries``."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Hits, misses, hit rate and current size."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+        }
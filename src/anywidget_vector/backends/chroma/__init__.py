@@ -11,17 +11,24 @@ Query Format (dict):
         "n_results": 10
     }
 
+    # Several query embeddings: results merged by id and tagged with the
+    # matching query indices (``query``, ``queries``)
+    {"query_embeddings": [[0.1, 0.2, ...], [0.3, 0.1, ...]], "n_results": 10}
+
     # Get by IDs
     {"ids": ["id1", "id2"]}
 
     # Get with filter only
     {"where": {"category": "tech"}, "limit": 100}
 
+    # Only some fields ("embeddings", "metadatas", "documents")
+    {"where": {"category": "tech"}, "limit": 100, "include": ["metadatas"]}
+
 Where operators: $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin
 Combined: $and, $or
 """
 
-from anywidget_vector.backends.chroma.client import execute_query
-from anywidget_vector.backends.chroma.converter import build_where, to_points
+from anywidget_vector.backends.chroma.client import execute_query, get_pages
+from anywidget_vector.backends.chroma.converter import build_where, to_columns, to_points
 
-__all__ = ["build_where", "execute_query", "to_points"]
+__all__ = ["build_where", "execute_query", "get_pages", "to_columns", "to_points"]
@@ -3,33 +3,105 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from anywidget_vector.backends.chroma.converter import to_points
 
+DEFAULT_INCLUDE = ("embeddings", "metadatas", "documents")
+
+
+def get_pages(
+    collection: Any,
+    *,
+    page_size: int = 1000,
+    limit: int | None = None,
+    where: dict[str, Any] | None = None,
+    include: Sequence[str] = DEFAULT_INCLUDE,
+    max_workers: int = 1,
+) -> Iterator[dict[str, Any]]:
+    """Page through a collection with ``collection.get(offset=..., limit=...)``.
+
+    With ``max_workers`` > 1, that many pages are requested at once; pages are
+    still yielded in offset order and fetching stops after the first short page.
+
+    Args:
+        collection: chromadb Collection object.
+        page_size: Records requested per get call.
+        limit: Maximum number of records overall (None for the whole collection).
+        where: Optional metadata filter.
+        include: Fields to fetch ("embeddings", "metadatas", "documents").
+        max_workers: Pages fetched concurrently.
+
+    Yields:
+        Chroma get responses, one per page.
+    """
+
+    def get(offset: int) -> dict[str, Any]:
+        size = page_size if limit is None else min(page_size, limit - offset)
+        return collection.get(where=where, offset=offset, limit=size, include=list(include))
+
+    def offsets() -> Iterator[int]:
+        offset = 0
+        while limit is None or offset < limit:
+            yield offset
+            offset += page_size
+
+    if max_workers <= 1:
+        for offset in offsets():
+            page = get(offset)
+            if page["ids"]:
+                yield page
+            if len(page["ids"]) < page_size:
+                return
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        window = []
+        for offset in offsets():
+            window.append(pool.submit(get, offset))
+            if len(window) < max_workers:
+                continue
+            for future in window:
+                page = future.result()
+                if page["ids"]:
+                    yield page
+                if len(page["ids"]) < page_size:
+                    return
+            window = []
+        for future in window:
+            page = future.result()
+            if page["ids"]:
+                yield page
+
 
 def execute_query(
     collection: Any,
     query: str | dict[str, Any],
+    *,
+    page_size: int = 1000,
 ) -> list[dict[str, Any]]:
     """Execute query against Chroma collection.
 
+    Filter-only and get-all queries are fetched in pages of ``page_size``. An
+    ``include`` list in the query limits the fields fetched.
+
     Args:
         collection: Chroma collection object
         query: Query dict or JSON string
+        page_size: Records per get call for filter-only and get-all queries
 
     Returns:
         List of points
     """
     if isinstance(query, str):
         query = json.loads(query)
+    include = list(query.get("include", DEFAULT_INCLUDE))
 
     # Get by IDs
     if "ids" in query:
-        response = collection.get(
-            ids=query["ids"],
-            include=["embeddings", "metadatas", "documents"],
-        )
+        response = collection.get(ids=query["ids"], include=include)
         return to_points(response)
 
     # Query by embeddings
@@ -39,22 +111,16 @@ def execute_query(
             n_results=query.get("n_results", 10),
             where=query.get("where"),
             where_document=query.get("where_document"),
-            include=["embeddings", "metadatas", "documents", "distances"],
-        )
-        return to_points(response)
-
-    # Get with filter
-    if "where" in query:
-        response = collection.get(
-            where=query["where"],
-            limit=query.get("limit", 100),
-            include=["embeddings", "metadatas", "documents"],
+            include=include if "distances" in include else [*include, "distances"],
         )
         return to_points(response)
 
-    # Get all (with limit)
-    response = collection.get(
+    # Get with filter, or get all (with limit)
+    pages = get_pages(
+        collection,
+        page_size=page_size,
         limit=query.get("limit", 100),
-        include=["embeddings", "metadatas", "documents"],
+        where=query.get("where"),
+        include=include,
     )
-    return to_points(response)
+    return [point for page in pages for point in to_points(page)]
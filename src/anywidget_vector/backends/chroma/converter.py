@@ -4,28 +4,53 @@ from __future__ import annotations
 
 from typing import Any
 
+from anywidget_vector.backends.batch import merge_results
+from anywidget_vector.backends.columns import build_columns
+
+_RESPONSE_FIELDS = ("ids", "embeddings", "metadatas", "documents", "distances")
+
 
 def to_points(response: dict[str, Any]) -> list[dict[str, Any]]:
-    """Convert Chroma response to points format."""
-    # Handle query results (nested lists) vs get results (flat lists)
-    is_query = "distances" in response
+    """Convert Chroma response to points format.
+
+    A query with several query embeddings returns one result set per embedding;
+    the sets are merged into one point set (see ``merge_results``).
+    """
+    # Query results (nested lists, one per query embedding) vs get results (flat lists)
+    if "distances" not in response:
+        return _flat_points(response)
+    sets = [_flat_points(flat) for flat in _query_sets(response)]
+    if len(sets) <= 1:
+        return sets[0] if sets else []
+    return merge_results(sets)
+
+
+def _query_sets(response: dict[str, Any]) -> list[dict[str, Any]]:
+    """Split a query response into one flat response per query embedding."""
+    n = len(response.get("ids") or [])
+    return [{key: response[key][q] for key in _RESPONSE_FIELDS if response.get(key) is not None} for q in range(n)]
+
 
-    ids = response.get("ids", [[]])[0] if is_query else response.get("ids", [])
-    embeddings = response.get("embeddings", [[]])[0] if is_query else response.get("embeddings", [])
-    metadatas = response.get("metadatas", [[]])[0] if is_query else response.get("metadatas", [])
-    distances = response.get("distances", [[]])[0] if is_query else []
-    documents = response.get("documents", [[]])[0] if is_query else response.get("documents", [])
+def _flat_points(response: dict[str, Any]) -> list[dict[str, Any]]:
+    """Convert a flat response (get result or one query's result set) to points."""
+
+    def field(key: str) -> Any:
+        value = response.get(key)
+        return [] if value is None else value
+
+    ids, embeddings, metadatas = field("ids"), field("embeddings"), field("metadatas")
+    distances, documents = field("distances"), field("documents")
 
     points = []
     for i, id_ in enumerate(ids):
         point: dict[str, Any] = {"id": str(id_)}
 
         # Score from distance (invert since distance = dissimilarity)
-        if distances and i < len(distances):
+        if i < len(distances):
             point["score"] = 1 / (1 + distances[i])
 
         # Embeddings -> coordinates
-        if embeddings and i < len(embeddings) and embeddings[i]:
+        if i < len(embeddings) and embeddings[i] is not None and len(embeddings[i]):
             vec = embeddings[i]
             point["x"] = float(vec[0]) if len(vec) > 0 else 0
             point["y"] = float(vec[1]) if len(vec) > 1 else 0
@@ -33,11 +58,11 @@ def to_points(response: dict[str, Any]) -> list[dict[str, Any]]:
             point["vector"] = vec
 
         # Document content
-        if documents and i < len(documents) and documents[i]:
+        if i < len(documents) and documents[i]:
             point["document"] = documents[i]
 
         # Metadata
-        if metadatas and i < len(metadatas) and metadatas[i]:
+        if i < len(metadatas) and metadatas[i]:
             point.update(metadatas[i])
 
         points.append(point)
@@ -45,6 +70,38 @@ def to_points(response: dict[str, Any]) -> list[dict[str, Any]]:
     return points
 
 
+def to_columns(response: dict[str, Any]) -> dict[str, Any]:
+    """Convert a Chroma get or query response to columns (see ``backends.columns``).
+
+    Documents become a ``document`` column and query distances a ``score`` column.
+    Multi-query results are merged as in ``to_points``, with ``query`` and
+    ``queries`` columns.
+    """
+    is_query = "distances" in response
+    if is_query and len(response.get("ids") or []) > 1:
+        points = to_points(response)
+        fields = [{k: v for k, v in p.items() if k not in ("id", "x", "y", "z", "vector")} for p in points]
+        return build_columns([p["id"] for p in points], [p.get("vector") for p in points], fields)
+
+    def field(key: str) -> Any:
+        value = response.get(key)
+        return value[0] if is_query and value is not None else value
+
+    ids = field("ids") or []
+    metadatas = field("metadatas") or [None] * len(ids)
+    documents = field("documents")
+    distances = field("distances") if is_query else None
+    fields = []
+    for i, meta in enumerate(metadatas):
+        row = dict(meta or {})
+        if documents is not None and documents[i]:
+            row["document"] = documents[i]
+        if distances is not None:
+            row["score"] = 1 / (1 + distances[i])
+        fields.append(row)
+    return build_columns(ids, field("embeddings"), fields)
+
+
 def build_where(conditions: list[tuple[str, str, Any]]) -> dict[str, Any]:
     """Build Chroma where filter from conditions.
 
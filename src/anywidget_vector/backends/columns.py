@@ -0,0 +1,59 @@
+"""Columnar form of backend results, shared by the ``to_columns()`` converters.
+
+A columns dict has ``ids`` (list of str), ``vectors`` (float32 array of shape
+(N, D), or None unless every record has a vector of the same length) and
+``metadata`` (field name -> list of N values, None where a record lacks the field).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+
+def build_columns(
+    ids: Sequence[Any],
+    vectors: Sequence[Any] | None,
+    fields: Iterable[dict[str, Any] | None],
+) -> dict[str, Any]:
+    """Build a columns dict from per-record ids, vectors and field dicts.
+
+    The vectors are converted to a matrix in a single ``np.asarray`` call.
+    Requires numpy.
+
+    Args:
+        ids: Record ids.
+        vectors: Record vectors (None entries allowed), or None.
+        fields: Record metadata dicts, in record order.
+
+    Returns:
+        Columns dict.
+    """
+    n = len(ids)
+    matrix = _vector_matrix(vectors, n)
+
+    metadata: dict[str, list[Any]] = {}
+    for i, row in enumerate(fields):
+        for key, value in (row or {}).items():
+            column = metadata.get(key)
+            if column is None:
+                column = metadata[key] = [None] * n
+            column[i] = value
+    return {"ids": [str(id_) for id_ in ids], "vectors": matrix, "metadata": metadata}
+
+
+def _vector_matrix(vectors: Sequence[Any] | None, n: int) -> Any:
+    """Stack n record vectors into a float32 matrix, or None if any is missing or ragged."""
+    import numpy as np
+
+    if vectors is None or not n or len(vectors) != n:
+        return None
+    if getattr(vectors, "ndim", None) == 2:
+        return np.asarray(vectors, dtype=np.float32)
+    if not all(v is not None and len(v) for v in vectors):
+        return None
+    try:
+        matrix = np.asarray(vectors, dtype=np.float32)
+    except (TypeError, ValueError):
+        return None
+    return matrix if matrix.ndim == 2 else None
@@ -15,6 +15,6 @@ Query Format (Grafeo Query Language):
 """
 
 from anywidget_vector.backends.grafeo.client import execute_query
-from anywidget_vector.backends.grafeo.converter import to_points
+from anywidget_vector.backends.grafeo.converter import to_columns, to_points
 
-__all__ = ["execute_query", "to_points"]
+__all__ = ["execute_query", "to_columns", "to_points"]
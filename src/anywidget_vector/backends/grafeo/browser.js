@@ -3,6 +3,8 @@
  * Mirrors the qdrant/client.js pattern.
  */
 
+import { fetchJson } from "../../ui/request.js";
+
 /**
  * Execute a query against Grafeo server.
  */
@@ -21,18 +23,7 @@ export async function executeQuery(query, config) {
     body.database = config.database;
   }
 
-  const resp = await fetch(url + "/query", {
-    method: "POST",
-    headers,
-    body: JSON.stringify(body),
-  });
-
-  if (!resp.ok) {
-    const errText = await resp.text();
-    throw new Error("Grafeo error: " + (errText || resp.status));
-  }
-
-  return await resp.json();
+  return fetchJson(url + "/query", { method: "POST", headers, body: JSON.stringify(body) }, config, "Grafeo");
 }
 
 /**
@@ -4,16 +4,23 @@ from __future__ import annotations
 
 from typing import Any
 
+from anywidget_vector.backends.columns import build_columns
+
+
+def _records(results: Any) -> list[Any]:
+    """Normalize the different Grafeo result types to a list of records."""
+    if hasattr(results, "to_dict"):
+        return results.to_dict("records")
+    if hasattr(results, "records"):
+        return [dict(r) for r in results.records()]
+    if not isinstance(results, list):
+        return list(results)
+    return results
+
 
 def to_points(results: Any) -> list[dict[str, Any]]:
     """Convert Grafeo results to points format."""
-    # Handle different result types
-    if hasattr(results, "to_dict"):
-        results = results.to_dict("records")
-    elif hasattr(results, "records"):
-        results = [dict(r) for r in results.records()]
-    elif not isinstance(results, list):
-        results = list(results)
+    results = _records(results)
 
     points = []
     for i, item in enumerate(results):
@@ -44,3 +51,23 @@ def to_points(results: Any) -> list[dict[str, Any]]:
             points.append({"id": f"point_{i}", "data": item, "x": 0, "y": 0, "z": 0})
 
     return points
+
+
+def to_columns(results: Any) -> dict[str, Any]:
+    """Convert Grafeo results to columns (see ``backends.columns``).
+
+    Non-dict records become a ``data`` column.
+    """
+    ids, vectors, fields = [], [], []
+    for i, item in enumerate(_records(results)):
+        if not isinstance(item, dict):
+            item = {"data": item}
+        ids.append(item.get("id", f"point_{i}"))
+        vector = item.get("vector")
+        if vector is None:
+            vector = item.get("embedding")
+        vectors.append(vector)
+        # Without a vector, x/y/z fields give the position
+        skip = ("id", "vector", "embedding", "x", "y", "z") if vector is not None else ("id", "vector", "embedding")
+        fields.append({k: v for k, v in item.items() if k not in skip})
+    return build_columns(ids, vectors, fields)
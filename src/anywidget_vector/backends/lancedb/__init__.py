@@ -7,16 +7,23 @@ Query Format:
     # With SQL filter
     {"vector": [...], "where": "category = 'tech' AND year > 2020", "limit": 10}
 
+    # Batch search: several query vectors at once, results merged by id and
+    # tagged with the matching query indices (``query``, ``queries``)
+    {"vectors": [[0.1, 0.2, ...], [0.3, 0.1, ...]], "limit": 10}
+
     # Filter only (no vector)
     {"where": "category = 'tech'", "limit": 100}
 
+    # Only some columns (filter-only queries)
+    {"where": "year > 2020", "select": ["id", "vector", "title"], "limit": 100}
+
     # Full-text search
     {"fts": "search query", "limit": 10}
 
 SQL WHERE supports: =, !=, <, >, <=, >=, AND, OR, IN, LIKE, IS NULL, IS NOT NULL
 """
 
-from anywidget_vector.backends.lancedb.client import execute_query
-from anywidget_vector.backends.lancedb.converter import to_points
+from anywidget_vector.backends.lancedb.client import execute_query, scan_batches, scan_points
+from anywidget_vector.backends.lancedb.converter import batch_to_columns, to_columns, to_points
 
-__all__ = ["execute_query", "to_points"]
+__all__ = ["batch_to_columns", "execute_query", "scan_batches", "scan_points", "to_columns", "to_points"]
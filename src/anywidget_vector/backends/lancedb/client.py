@@ -3,11 +3,46 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterator, Sequence
 from typing import Any
 
+from anywidget_vector.backends.batch import merge_results
 from anywidget_vector.backends.lancedb.converter import to_points
 
 
+def scan_batches(
+    table: Any,
+    *,
+    where: str | None = None,
+    columns: Sequence[str] | None = None,
+    limit: int | None = None,
+    batch_size: int = 4096,
+) -> Iterator[Any]:
+    """Scan a table with the filter, projection and limit pushed down to LanceDB.
+
+    Args:
+        table: LanceDB table object.
+        where: Optional SQL filter.
+        columns: Columns to read (None for all).
+        limit: Maximum number of rows (None for all matching rows).
+        batch_size: Rows per record batch.
+
+    Yields:
+        pyarrow RecordBatches.
+    """
+    scan = table.search()
+    if where:
+        scan = scan.where(where)
+    if columns is not None:
+        scan = scan.select(list(columns))
+    yield from scan.limit(limit).to_batches(batch_size)
+
+
+def scan_points(table: Any, **kwargs: Any) -> list[dict[str, Any]]:
+    """Scan a table (see ``scan_batches``) and convert the rows to points."""
+    return to_points([row for batch in scan_batches(table, **kwargs) for row in batch.to_pylist()])
+
+
 def execute_query(
     table: Any,
     query: str | dict[str, Any],
@@ -34,6 +69,17 @@ def execute_query(
         results = search.limit(limit).to_list()
         return to_points(results)
 
+    # Batch search: LanceDB runs every query vector in one vectorized search and
+    # tags each row with the ``query_index`` it belongs to
+    if "vectors" in query:
+        search = table.search(query["vectors"])
+        if "where" in query:
+            search = search.where(query["where"])
+        sets: list[list[dict[str, Any]]] = [[] for _ in query["vectors"]]
+        for row in search.limit(limit).to_list():
+            sets[row.pop("query_index", 0)].append(row)
+        return merge_results([to_points(rows) for rows in sets])
+
     # Full-text search
     if "fts" in query:
         search = table.search(query["fts"], query_type="fts")
@@ -42,15 +88,5 @@ def execute_query(
         results = search.limit(limit).to_list()
         return to_points(results)
 
-    # Filter only
-    if "where" in query:
-        # Use pandas for filtered scan
-        df = table.to_pandas()
-        # Simple eval for WHERE clause (in production, use proper SQL parser)
-        # For now, return all and let filter happen client-side
-        results = df.head(limit).to_dict("records")
-        return to_points(results)
-
-    # Get all
-    results = table.to_pandas().head(limit).to_dict("records")
-    return to_points(results)
+    # Filter only, or get all: scan with the filter pushed down
+    return scan_points(table, where=query.get("where"), columns=query.get("select"), limit=limit)
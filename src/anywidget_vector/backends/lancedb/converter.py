@@ -4,6 +4,10 @@ from __future__ import annotations
 
 from typing import Any
 
+from anywidget_vector.backends.columns import build_columns
+
+VECTOR_COLUMNS = ("vector", "embedding", "embeddings", "_vec")
+
 
 def to_points(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Convert LanceDB results to points format."""
@@ -18,7 +22,7 @@ def to_points(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
 
         # Find vector field
         vector = None
-        for key in ("vector", "embedding", "embeddings", "_vec"):
+        for key in VECTOR_COLUMNS:
             if key in row and row[key] is not None:
                 vector = row[key]
                 break
@@ -41,6 +45,63 @@ def to_points(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
     return points
 
 
+def to_columns(results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Convert LanceDB result rows (e.g. from ``to_list()``) to columns (see ``backends.columns``).
+
+    A ``_distance`` becomes a ``score`` column; for Arrow scans use ``batch_to_columns``.
+    """
+    ids, vectors, fields = [], [], []
+    for i, row in enumerate(results):
+        ids.append(row.get("id", f"point_{i}"))
+        vectors.append(next((row[key] for key in VECTOR_COLUMNS if row.get(key) is not None), None))
+        fields.append({k: v for k, v in row.items() if k not in ("id", "_distance", *VECTOR_COLUMNS)})
+        if "_distance" in row:
+            fields[-1]["score"] = 1 / (1 + row["_distance"])
+    return build_columns(ids, vectors, fields)
+
+
+def batch_to_columns(batch: Any, start: int = 0) -> dict[str, Any]:
+    """Convert a pyarrow RecordBatch of LanceDB rows to columns.
+
+    A fixed-size float32 vector column without nulls is viewed as an (N, D) array
+    without copying its buffer; other float widths are cast to float32 like the
+    other converters' matrices.
+
+    Args:
+        batch: pyarrow RecordBatch.
+        start: Row number of the batch's first row, for generated ids.
+
+    Returns:
+        Columns dict (see ``backends.columns``).
+    """
+    import numpy as np
+
+    names = batch.schema.names
+    n = batch.num_rows
+    raw_ids = batch.column("id").to_pylist() if "id" in names else [None] * n
+    ids = [f"point_{start + i}" if id_ is None else str(id_) for i, id_ in enumerate(raw_ids)]
+
+    vectors = None
+    vector_name = next((name for name in VECTOR_COLUMNS if name in names), None)
+    if vector_name is not None and n:
+        column = batch.column(vector_name)
+        size = getattr(column.type, "list_size", None)
+        if size and column.null_count == 0:
+            vectors = column.flatten().to_numpy(zero_copy_only=False).reshape(n, size).astype(np.float32, copy=False)
+        elif column.null_count == 0:
+            vectors = np.asarray(column.to_pylist(), dtype=np.float32)
+        if vectors is not None and vectors.ndim != 2:
+            vectors = None
+
+    metadata: dict[str, list[Any]] = {}
+    for name in names:
+        if name == "_distance":
+            metadata["score"] = [1 / (1 + d) for d in batch.column(name).to_pylist()]
+        elif name not in ("id", *VECTOR_COLUMNS):
+            metadata[name] = batch.column(name).to_pylist()
+    return {"ids": ids, "vectors": vectors, "metadata": metadata}
+
+
 def build_where(conditions: list[tuple[str, str, Any]]) -> str:
     """Build SQL WHERE clause from conditions.
 
@@ -0,0 +1,26 @@
+"""Helpers for loading large collections page by page."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+_DONE: Any = object()
+
+
+def prefetched[T](pages: Iterable[T]) -> Iterator[T]:
+    """Yield pages while the next one is already being fetched on a background thread.
+
+    The consumer's work on one page (conversion, appending to a widget) overlaps
+    with the network round trip for the next.
+    """
+    it = iter(pages)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(next, it, _DONE)
+        while True:
+            page = future.result()
+            if page is _DONE:
+                return
+            future = pool.submit(next, it, _DONE)
+            yield page
@@ -16,6 +16,24 @@ Query Format (JSON):
 Filter operators: $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin
 """
 
-from anywidget_vector.backends.pinecone.converter import build_filter, to_points
+from anywidget_vector.backends.pinecone.client import RestIndex, fetch_pages, list_ids, query_all, supports_list
+from anywidget_vector.backends.pinecone.converter import (
+    build_filter,
+    records_to_columns,
+    records_to_points,
+    to_columns,
+    to_points,
+)
 
-__all__ = ["build_filter", "to_points"]
+__all__ = [
+    "RestIndex",
+    "build_filter",
+    "fetch_pages",
+    "list_ids",
+    "query_all",
+    "records_to_columns",
+    "records_to_points",
+    "supports_list",
+    "to_columns",
+    "to_points",
+]
@@ -1,4 +1,5 @@
 // Pinecone browser-side client
+import { fetchJson } from "../../ui/request.js";
 
 export async function executeQuery(query, config) {
   const { url, apiKey, namespace } = config;
@@ -8,12 +9,8 @@ export async function executeQuery(query, config) {
 
   if (parsed.ids) {
     // Fetch by IDs
-    const resp = await fetch(`${url}/vectors/fetch?${parsed.ids.map(id => `ids=${id}`).join("&")}`, {
-      method: "GET",
-      headers,
-    });
-    if (!resp.ok) throw new Error(`Pinecone error: ${await resp.text()}`);
-    return await resp.json();
+    const ids = parsed.ids.map(id => `ids=${id}`).join("&");
+    return fetchJson(`${url}/vectors/fetch?${ids}`, { method: "GET", headers }, config, "Pinecone");
   }
 
   // Query
@@ -26,9 +23,7 @@ export async function executeQuery(query, config) {
     namespace: parsed.namespace || namespace,
   };
 
-  const resp = await fetch(`${url}/query`, { method: "POST", headers, body: JSON.stringify(body) });
-  if (!resp.ok) throw new Error(`Pinecone error: ${await resp.text()}`);
-  return await resp.json();
+  return fetchJson(`${url}/query`, { method: "POST", headers, body: JSON.stringify(body) }, config, "Pinecone");
 }
 
 export function toPoints(response) {
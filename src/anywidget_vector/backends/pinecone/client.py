@@ -0,0 +1,253 @@
+"""Pinecone Python client helpers for bulk export (queries run in the browser)."""
+
+from __future__ import annotations
+
+import json
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+# Pinecone's list endpoint returns at most 100 ids per page
+LIST_PAGE_LIMIT = 100
+# Largest top_k a Pinecone query accepts
+QUERY_TOP_K_LIMIT = 10000
+
+
+class RestIndex:
+    """Minimal Pinecone data-plane client over the REST API.
+
+    Implements list and fetch for bulk export, and describe_index_stats and query
+    for the fallback on pod-based indexes (which have no list API).
+
+    Works with any host speaking the Pinecone REST protocol, including local
+    stand-ins, and needs no SDK. Pinecone SDK ``Index`` objects can be used
+    interchangeably with the functions below.
+
+    Args:
+        host: Index host URL, e.g. ``https://my-index-abc123.svc.pinecone.io``.
+        api_key: Pinecone API key.
+        timeout: Seconds to wait for each request.
+    """
+
+    def __init__(self, host: str, api_key: str = "", *, timeout: float = 30.0) -> None:
+        if "://" not in host:
+            host = f"https://{host}"
+        self.host = host.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def _get(self, path: str, params: list[tuple[str, Any]]) -> dict[str, Any]:
+        query = urllib.parse.urlencode([(k, v) for k, v in params if v is not None])
+        request = urllib.request.Request(
+            f"{self.host}{path}?{query}",
+            headers={"Api-Key": self.api_key, "Accept": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+            return json.loads(resp.read())
+
+    def _post(self, path: str, body: dict[str, Any]) -> dict[str, Any]:
+        request = urllib.request.Request(
+            f"{self.host}{path}",
+            data=json.dumps(body).encode(),
+            headers={"Api-Key": self.api_key, "Accept": "application/json", "Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+            return json.loads(resp.read())
+
+    def list_paginated(
+        self, *, namespace: str = "", limit: int = LIST_PAGE_LIMIT, pagination_token: str | None = None
+    ) -> dict[str, Any]:
+        """List one page of vector ids."""
+        params = [("namespace", namespace), ("limit", limit), ("paginationToken", pagination_token)]
+        return self._get("/vectors/list", params)
+
+    def fetch(self, ids: list[str], *, namespace: str = "") -> dict[str, Any]:
+        """Fetch vectors (values and metadata) by id."""
+        return self._get("/vectors/fetch", [("namespace", namespace), *(("ids", i) for i in ids)])
+
+    def describe_index_stats(self) -> dict[str, Any]:
+        """Index statistics, including the vector ``dimension``."""
+        return self._post("/describe_index_stats", {})
+
+    def query(
+        self,
+        *,
+        vector: list[float],
+        top_k: int,
+        include_values: bool = False,
+        include_metadata: bool = False,
+        namespace: str = "",
+    ) -> dict[str, Any]:
+        """Similarity query; returns ``matches``."""
+        body = {
+            "vector": vector,
+            "topK": top_k,
+            "includeValues": include_values,
+            "includeMetadata": include_metadata,
+            "namespace": namespace,
+        }
+        return self._post("/query", body)
+
+
+def _as_dict(obj: Any) -> dict[str, Any]:
+    """SDK response objects and plain dicts alike."""
+    if isinstance(obj, dict):
+        return obj
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    return dict(obj)
+
+
+def _retryable(error: Exception) -> bool:
+    """Retry rate limiting, server errors and connection failures, not client or parsing errors."""
+    status = getattr(error, "status", None) or getattr(error, "code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(error, (urllib.error.URLError, OSError, TimeoutError))
+
+
+def with_retry[T](call: Callable[[], T], *, retries: int = 3, backoff: float = 0.5) -> T:
+    """Run ``call``, retrying retryable failures with exponential backoff."""
+    attempt = 0
+    while True:
+        try:
+            return call()
+        except Exception as e:
+            if attempt >= retries or not _retryable(e):
+                raise
+            time.sleep(backoff * 2**attempt)
+            attempt += 1
+
+
+def supports_list(index: Any, *, namespace: str = "", retries: int = 3, backoff: float = 0.5) -> bool:
+    """Whether the index serves the list API (serverless indexes do, pod-based ones do not)."""
+    try:
+        with_retry(lambda: index.list_paginated(namespace=namespace, limit=1), retries=retries, backoff=backoff)
+    except AttributeError:
+        # SDK versions without the list API
+        return False
+    except Exception as e:
+        status = getattr(e, "status", None) or getattr(e, "code", None)
+        if isinstance(status, int) and 400 <= status < 500:
+            return False
+        raise
+    return True
+
+
+def query_all(index: Any, *, namespace: str = "", limit: int | None = None) -> dict[str, Any]:
+    """Fetch up to ``limit`` vectors with one zero-vector similarity query.
+
+    The fallback for indexes without the list API; capped at ``QUERY_TOP_K_LIMIT``.
+    """
+    dimension = _as_dict(index.describe_index_stats())["dimension"]
+    response = index.query(
+        vector=[0.0] * dimension,
+        top_k=min(limit or QUERY_TOP_K_LIMIT, QUERY_TOP_K_LIMIT),
+        include_values=True,
+        include_metadata=True,
+        namespace=namespace,
+    )
+    return _as_dict(response)
+
+
+def list_ids(
+    index: Any,
+    *,
+    namespace: str = "",
+    page_size: int = LIST_PAGE_LIMIT,
+    limit: int | None = None,
+    retries: int = 3,
+    backoff: float = 0.5,
+) -> Iterator[list[str]]:
+    """Enumerate vector ids page by page with the list API.
+
+    Yields:
+        Lists of ids, at most ``page_size`` each, ``limit`` overall.
+    """
+    token = None
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = min(page_size, LIST_PAGE_LIMIT) if remaining is None else min(page_size, LIST_PAGE_LIMIT, remaining)
+        page = _as_dict(
+            with_retry(
+                lambda size=size, token=token: index.list_paginated(
+                    namespace=namespace, limit=size, pagination_token=token
+                ),
+                retries=retries,
+                backoff=backoff,
+            )
+        )
+        ids = [_as_dict(v)["id"] for v in page.get("vectors") or []][:size]
+        if ids:
+            yield ids
+        if remaining is not None:
+            remaining -= len(ids)
+        token = (page.get("pagination") or {}).get("next")
+        if not token or not ids:
+            return
+
+
+def fetch_pages(
+    index: Any,
+    *,
+    namespace: str = "",
+    limit: int | None = None,
+    batch_size: int = LIST_PAGE_LIMIT,
+    max_workers: int = 4,
+    retries: int = 3,
+    backoff: float = 0.5,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> Iterator[list[dict[str, Any]]]:
+    """Export vectors: list ids, then fetch them in parallel batches.
+
+    Batches are fetched on a bounded thread pool with retry and backoff, at most
+    two per worker in flight, and yielded in listing order.
+
+    Args:
+        index: Pinecone SDK ``Index`` or ``RestIndex``.
+        namespace: Namespace to export.
+        limit: Maximum number of vectors (None for the whole namespace).
+        batch_size: Ids per fetch call (at most 100).
+        max_workers: Concurrent fetch calls.
+        retries: Retries per call for rate limits, server and connection errors.
+        backoff: Initial retry delay in seconds, doubled on each retry.
+        on_progress: Called with (fetched, listed) after each batch.
+
+    Yields:
+        Lists of records with id, values and metadata, one per batch.
+    """
+    listed = fetched = 0
+
+    def fetch(ids: list[str]) -> list[dict[str, Any]]:
+        response = _as_dict(
+            with_retry(lambda: index.fetch(ids=ids, namespace=namespace), retries=retries, backoff=backoff)
+        )
+        vectors = {k: _as_dict(v) for k, v in (response.get("vectors") or {}).items()}
+        return [vectors[i] for i in ids if i in vectors]
+
+    def finish(future: Future[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+        nonlocal fetched
+        records = future.result()
+        fetched += len(records)
+        if on_progress:
+            on_progress(fetched, listed)
+        return records
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        inflight: deque[Future[list[dict[str, Any]]]] = deque()
+        pages = list_ids(
+            index, namespace=namespace, page_size=batch_size, limit=limit, retries=retries, backoff=backoff
+        )
+        for ids in pages:
+            listed += len(ids)
+            inflight.append(pool.submit(fetch, ids))
+            while len(inflight) > 2 * max_workers or (inflight and inflight[0].done()):
+                yield finish(inflight.popleft())
+        while inflight:
+            yield finish(inflight.popleft())
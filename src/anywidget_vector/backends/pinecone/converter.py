@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import Any
 
+from anywidget_vector.backends.columns import build_columns
+
 
 def to_points(response: dict[str, Any]) -> list[dict[str, Any]]:
     """Convert Pinecone response to points format."""
@@ -35,6 +37,28 @@ def to_points(response: dict[str, Any]) -> list[dict[str, Any]]:
     return points
 
 
+def records_to_points(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Convert fetched Pinecone records (id, values, metadata) to points format."""
+    return to_points({"matches": records})
+
+
+def to_columns(response: dict[str, Any]) -> dict[str, Any]:
+    """Convert a Pinecone response to columns (see ``backends.columns``).
+
+    Scores and metadata fields become metadata columns.
+    """
+    matches = response.get("matches") or []
+    fields = [
+        {"score": m["score"], **(m.get("metadata") or {})} if "score" in m else m.get("metadata") for m in matches
+    ]
+    return build_columns([m.get("id", "") for m in matches], [m.get("values") for m in matches], fields)
+
+
+def records_to_columns(records: list[dict[str, Any]]) -> dict[str, Any]:
+    """Convert fetched Pinecone records (id, values, metadata) to columns."""
+    return to_columns({"matches": records})
+
+
 def build_filter(conditions: list[tuple[str, str, Any]]) -> dict[str, Any]:
     """Build Pinecone filter from conditions.
 
@@ -11,6 +11,10 @@ Query Format (JSON):
         "limit": 10
     }
 
+    # Batch search: several query vectors in one request, results merged by id
+    # and tagged with the matching query indices (``query``, ``queries``)
+    {"vectors": [[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]], "limit": 10}
+
     # Recommend by ID
     {"recommend": {"positive": ["point_123"]}, "limit": 10}
 
@@ -21,6 +25,13 @@ Query Format (JSON):
     {"filter": {"must": [...]}, "limit": 100}
 """
 
-from anywidget_vector.backends.qdrant.converter import build_filter, to_points
+from anywidget_vector.backends.qdrant.client import scroll_pages
+from anywidget_vector.backends.qdrant.converter import (
+    build_filter,
+    records_to_columns,
+    records_to_points,
+    to_columns,
+    to_points,
+)
 
-__all__ = ["build_filter", "to_points"]
+__all__ = ["build_filter", "records_to_columns", "records_to_points", "scroll_pages", "to_columns", "to_points"]
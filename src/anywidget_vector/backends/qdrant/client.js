@@ -1,4 +1,5 @@
 // Qdrant browser-side client
+import { fetchJson } from "../../ui/request.js";
 
 export async function executeQuery(query, config) {
   const { url, apiKey, collection } = config;
@@ -20,6 +21,19 @@ export async function executeQuery(query, config) {
       with_payload: true,
       with_vectors: true,
     };
+  } else if (parsed.vectors) {
+    // Batch search: every query vector in one round trip
+    endpoint = `${url}/collections/${collection}/points/search/batch`;
+    body = {
+      searches: parsed.vectors.map(vector => ({
+        vector,
+        filter: parsed.filter,
+        limit: parsed.limit || 10,
+        with_payload: true,
+        with_vectors: true,
+        score_threshold: parsed.score_threshold,
+      })),
+    };
   } else if (parsed.vector) {
     endpoint = `${url}/collections/${collection}/points/search`;
     body = {
@@ -39,17 +53,14 @@ export async function executeQuery(query, config) {
       with_vectors: true,
     };
   } else {
-    throw new Error("Invalid query: need vector, ids, recommend, or filter");
+    throw new Error("Invalid query: need vector, vectors, ids, recommend, or filter");
   }
 
-  const resp = await fetch(endpoint, { method: "POST", headers, body: JSON.stringify(body) });
-  if (!resp.ok) throw new Error(`Qdrant error: ${await resp.text()}`);
-  return await resp.json();
+  return fetchJson(endpoint, { method: "POST", headers, body: JSON.stringify(body) }, config, "Qdrant");
 }
 
-export function toPoints(response) {
-  const results = response.result || response.points || [];
-  return results.map(r => ({
+function recordToPoint(r) {
+  return {
     id: String(r.id),
     score: r.score,
     x: r.vector?.[0] ?? r.payload?.x ?? 0,
@@ -57,5 +68,35 @@ export function toPoints(response) {
     z: r.vector?.[2] ?? r.payload?.z ?? 0,
     vector: r.vector,
     ...r.payload,
-  }));
+  };
+}
+
+// Merge per-query result sets by id: `queries` lists every query that matched a point,
+// `query` the one it scored best for (as backends/batch.py does on the Python side)
+function mergeResultSets(sets) {
+  const merged = new Map();
+  sets.forEach((points, index) => {
+    for (const point of points) {
+      const existing = merged.get(point.id);
+      if (!existing) {
+        merged.set(point.id, { ...point, query: index, queries: [index] });
+        continue;
+      }
+      if (!existing.queries.includes(index)) existing.queries.push(index);
+      if (point.score != null && (existing.score == null || point.score > existing.score)) {
+        existing.score = point.score;
+        existing.query = index;
+      }
+    }
+  });
+  return [...merged.values()];
+}
+
+export function toPoints(response) {
+  const results = response.result || response.points || [];
+  // Batch search returns one result list per query vector
+  if (results.length && Array.isArray(results[0])) {
+    return mergeResultSets(results.map(set => set.map(recordToPoint)));
+  }
+  return results.map(recordToPoint);
 }
@@ -0,0 +1,48 @@
+"""Qdrant Python client helpers (bulk loading; queries run in the browser)."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+
+def scroll_pages(
+    client: Any,
+    collection: str,
+    *,
+    page_size: int = 1000,
+    limit: int | None = None,
+    with_vectors: bool = True,
+    scroll_filter: Any = None,
+) -> Iterator[list[Any]]:
+    """Scroll through a collection, following ``next_page_offset``.
+
+    Args:
+        client: qdrant_client.QdrantClient instance.
+        collection: Collection name.
+        page_size: Records requested per scroll call.
+        limit: Maximum number of records overall (None for the whole collection).
+        with_vectors: Include vectors in the records.
+        scroll_filter: Optional Qdrant filter.
+
+    Yields:
+        Lists of Qdrant records, one per page.
+    """
+    offset = None
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = page_size if remaining is None else min(page_size, remaining)
+        records, offset = client.scroll(
+            collection,
+            scroll_filter=scroll_filter,
+            limit=size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=with_vectors,
+        )
+        if records:
+            yield records
+        if remaining is not None:
+            remaining -= len(records)
+        if offset is None or not records:
+            return
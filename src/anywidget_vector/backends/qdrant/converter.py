@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import Any
 
+from anywidget_vector.backends.columns import build_columns
+
 
 def to_points(response: dict[str, Any]) -> list[dict[str, Any]]:
     """Convert Qdrant response to points format.
@@ -42,6 +44,45 @@ def to_points(response: dict[str, Any]) -> list[dict[str, Any]]:
     return points
 
 
+def records_to_points(records: list[Any]) -> list[dict[str, Any]]:
+    """Convert qdrant_client records (from scroll or retrieve) to points format.
+
+    Args:
+        records: Records with id, vector and payload attributes
+
+    Returns:
+        List of point dicts with id, x, y, z, vector and payload fields
+    """
+    points = []
+    for r in records:
+        point: dict[str, Any] = {"id": str(r.id)}
+        vec = r.vector
+        if vec:
+            point["x"] = float(vec[0]) if len(vec) > 0 else 0.0
+            point["y"] = float(vec[1]) if len(vec) > 1 else 0.0
+            point["z"] = float(vec[2]) if len(vec) > 2 else 0.0
+            point["vector"] = list(vec)
+        if r.payload:
+            point.update(r.payload)
+        points.append(point)
+    return points
+
+
+def to_columns(response: dict[str, Any]) -> dict[str, Any]:
+    """Convert a Qdrant REST response to columns (see ``backends.columns``).
+
+    Scores and payload fields become metadata columns.
+    """
+    results = response.get("result") or response.get("points") or []
+    fields = [{"score": r["score"], **(r.get("payload") or {})} if "score" in r else r.get("payload") for r in results]
+    return build_columns([r.get("id", "") for r in results], [r.get("vector") for r in results], fields)
+
+
+def records_to_columns(records: list[Any]) -> dict[str, Any]:
+    """Convert qdrant_client records (from scroll or retrieve) to columns."""
+    return build_columns([r.id for r in records], [r.vector for r in records], [r.payload for r in records])
+
+
 def build_filter(conditions: list[tuple[str, str, Any]]) -> dict[str, Any]:
     """Build Qdrant filter from conditions.
 
@@ -26,8 +26,12 @@ Query Format (GraphQL):
 
     # Near text (requires text2vec module)
     { Get { Article(nearText: {concepts: ["AI"]}, limit: 10) { ... } } }
+
+Paged scan (JSON, loads the class page by page with the `after` cursor):
+    {"scan": "Article", "pageSize": 1000, "limit": 20000, "properties": ["title"]}
 """
 
-from anywidget_vector.backends.weaviate.converter import build_where, to_points
+from anywidget_vector.backends.weaviate.client import cursor_pages
+from anywidget_vector.backends.weaviate.converter import build_where, to_columns, to_points
 
-__all__ = ["build_where", "to_points"]
+__all__ = ["build_where", "cursor_pages", "to_columns", "to_points"]
@@ -1,4 +1,7 @@
 // Weaviate browser-side client
+import { fetchJson } from "../../ui/request.js";
+
+const SCAN_PAGE_SIZE = 1000;
 
 export async function executeQuery(query, config) {
   const { url, apiKey } = config;
@@ -8,14 +11,8 @@ export async function executeQuery(query, config) {
   // Query is GraphQL string
   const graphql = typeof query === "string" ? query : JSON.stringify(query);
 
-  const resp = await fetch(`${url}/v1/graphql`, {
-    method: "POST",
-    headers,
-    body: JSON.stringify({ query: graphql }),
-  });
-
-  if (!resp.ok) throw new Error(`Weaviate error: ${await resp.text()}`);
-  const data = await resp.json();
+  const init = { method: "POST", headers, body: JSON.stringify({ query: graphql }) };
+  const data = await fetchJson(`${url}/v1/graphql`, init, config, "Weaviate");
 
   if (data.errors) {
     throw new Error(`GraphQL error: ${data.errors[0].message}`);
@@ -48,3 +45,44 @@ export function toPoints(response, className) {
     return point;
   });
 }
+
+// Scan query: {"scan": "Article", "pageSize": 1000, "limit": 20000, "properties": ["title"]}
+// ("scan": true uses config.className). Returns null for GraphQL queries.
+export function parseScanQuery(query, config) {
+  let parsed;
+  try {
+    parsed = typeof query === "string" ? JSON.parse(query) : query;
+  } catch {
+    return null;
+  }
+  if (!parsed || typeof parsed !== "object" || !parsed.scan) return null;
+  return {
+    className: parsed.scan === true ? config.className || config.class || "Vector" : parsed.scan,
+    pageSize: parsed.pageSize || SCAN_PAGE_SIZE,
+    limit: parsed.limit || null,
+    properties: parsed.properties || [],
+  };
+}
+
+function scanPageQuery(scan, size, after) {
+  const args = after ? `limit: ${size}, after: ${JSON.stringify(after)}` : `limit: ${size}`;
+  return `{ Get { ${scan.className}(${args}) { ${scan.properties.join(" ")} _additional { id vector } } } }`;
+}
+
+// Page through a class with the `after` cursor. The next page is requested before
+// the current one is yielded, so conversion and rendering overlap the round trip.
+export async function* scanPages(scan, config) {
+  let fetched = 0;
+  let size = scan.limit ? Math.min(scan.pageSize, scan.limit) : scan.pageSize;
+  let next = executeQuery(scanPageQuery(scan, size, null), config);
+  while (next) {
+    const response = await next;
+    const items = response?.data?.Get?.[scan.className] || [];
+    fetched += items.length;
+    const after = items.at(-1)?._additional?.id;
+    const done = items.length < size || !after || (scan.limit && fetched >= scan.limit);
+    size = scan.limit ? Math.min(scan.pageSize, scan.limit - fetched) : scan.pageSize;
+    next = done ? null : executeQuery(scanPageQuery(scan, size, after), config);
+    if (items.length) yield toPoints(response, scan.className);
+  }
+}
@@ -0,0 +1,49 @@
+"""Weaviate Python client helpers (bulk loading; queries run in the browser)."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+
+def cursor_pages(
+    client: Any,
+    class_name: str,
+    *,
+    page_size: int = 1000,
+    limit: int | None = None,
+    properties: Sequence[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Page through a class with the ``after`` cursor instead of offsets.
+
+    Cursor pages are not bound by Weaviate's offset/limit window, and every page
+    costs the same however deep it is.
+
+    Args:
+        client: weaviate.Client instance.
+        class_name: Weaviate class name.
+        page_size: Objects requested per Get query.
+        limit: Maximum number of objects overall (None for the whole class).
+        properties: Properties to fetch besides id and vector.
+
+    Yields:
+        GraphQL Get responses, one per page.
+    """
+    after = None
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = page_size if remaining is None else min(page_size, remaining)
+        query = client.query.get(class_name, list(properties or [])).with_additional(["id", "vector"]).with_limit(size)
+        if after is not None:
+            query = query.with_after(after)
+        response = query.do()
+        items = response.get("data", {}).get("Get", {}).get(class_name) or []
+        if items:
+            yield response
+        if remaining is not None:
+            remaining -= len(items)
+        if len(items) < size:
+            return
+        after = items[-1].get("_additional", {}).get("id")
+        if after is None:
+            return
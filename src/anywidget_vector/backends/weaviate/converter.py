@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import Any
 
+from anywidget_vector.backends.columns import build_columns
+
 
 def to_points(response: dict[str, Any], class_name: str) -> list[dict[str, Any]]:
     """Convert Weaviate GraphQL response to points format."""
@@ -34,6 +36,24 @@ def to_points(response: dict[str, Any], class_name: str) -> list[dict[str, Any]]
     return points
 
 
+def to_columns(response: dict[str, Any], class_name: str) -> dict[str, Any]:
+    """Convert Weaviate GraphQL response to columns (see ``backends.columns``).
+
+    Properties become metadata columns, and a distance becomes a ``score`` column.
+    """
+    data = response.get("data", {}).get("Get", {}).get(class_name) or []
+    ids, vectors, fields = [], [], []
+    for i, item in enumerate(data):
+        additional = item.get("_additional") or {}
+        ids.append(additional.get("id", f"point_{i}"))
+        vectors.append(additional.get("vector"))
+        row = {k: v for k, v in item.items() if k != "_additional"}
+        if "distance" in additional:
+            row["score"] = 1 - additional["distance"]
+        fields.append(row)
+    return build_columns(ids, vectors, fields)
+
+
 def build_where(conditions: list[tuple[str, str, Any]]) -> dict[str, Any]:
     """Build Weaviate where filter from conditions.
 
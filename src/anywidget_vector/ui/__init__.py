@@ -1,5 +1,6 @@
 """UI module aggregation - loads CSS and JS components."""
 
+import json
 from pathlib import Path
 
 _UI_DIR = Path(__file__).parent
@@ -25,11 +26,18 @@ def get_esm() -> str:
     # Read component files
     icons_js = _read_file(_STATIC_DIR / "icons.js")
     constants_js = _read_file(_UI_DIR / "constants.js")
+    selection_js = _read_file(_UI_DIR / "selection.js")
+    positions_js = _read_file(_UI_DIR / "positions.js")
     sidebar_js = _read_file(_UI_DIR / "sidebar.js")
     toolbar_js = _read_file(_UI_DIR / "toolbar.js")
     settings_js = _read_file(_UI_DIR / "settings.js")
     properties_js = _read_file(_UI_DIR / "properties.js")
     canvas_js = _read_file(_UI_DIR / "canvas.js")
+    compute_js = _read_file(_UI_DIR / "compute.js")
+    metadata_js = _read_file(_UI_DIR / "metadata.js")
+    querycache_js = _read_file(_UI_DIR / "querycache.js")
+    request_js = _read_file(_UI_DIR / "request.js")
+    worker_js = _read_file(_UI_DIR / "worker.js")
 
     # Read browser-side backend clients
     qdrant_client = _read_file(_BACKENDS_DIR / "qdrant" / "client.js")
@@ -50,6 +58,15 @@ import {{ OrbitControls }} from "https://esm.sh/three@0.160.0/addons/controls/Or
 // === Constants ===
 {_strip_imports_exports(constants_js)}
 
+// === Selection Encoding ===
+{_strip_imports_exports(selection_js)}
+
+// === Quantized Positions ===
+{_strip_imports_exports(positions_js)}
+
+// === Backend Requests ===
+{_strip_imports_exports(request_js)}
+
 // === Backend Clients ===
 // Qdrant
 {_rename_functions(qdrant_client, "qdrant")}
@@ -66,11 +83,12 @@ import {{ OrbitControls }} from "https://esm.sh/three@0.160.0/addons/controls/Or
 // Grafeo WASM (embed)
 {_prepare_grafeo_embed(grafeo_embed)}
 
-// Unified query executor
-async function executeBackendQuery(model) {{
+// Unified query executor; `signal` aborts the backend requests
+async function executeBackendQuery(model, signal) {{
   const backend = model.get("backend");
   const query = model.get("query_input");
-  const config = model.get("backend_config") || {{}};
+  const timeout = (model.get("query_timeout") || 0) * 1000;
+  const config = {{ ...(model.get("backend_config") || {{}}), signal, timeout }};
   const mode = model.get("grafeo_connection_mode") || "embedded";
 
   let response, points;
@@ -92,6 +110,19 @@ async function executeBackendQuery(model) {{
   }} else if (backend === "pinecone") {{
     response = await pineconeExecute(query, config);
     points = pineconeToPoints(response);
+  }} else if (backend === "weaviate" && weaviateParseScanQuery(query, config)) {{
+    // Paged scan: show pages as they arrive, resending points only when they double
+    points = [];
+    let shown = 0;
+    for await (const page of weaviateScanPages(weaviateParseScanQuery(query, config), config)) {{
+      signal?.throwIfAborted();
+      for (const point of page) points.push(point);
+      if (points.length >= 2 * shown) {{
+        model.set("points", points.slice());
+        model.save_changes();
+        shown = points.length;
+      }}
+    }}
   }} else if (backend === "weaviate") {{
     const className = config.className || config.class || "Vector";
     response = await weaviateExecute(query, config);
@@ -103,6 +134,19 @@ async function executeBackendQuery(model) {{
   return points;
 }}
 
+// === Compute Worker (inline fallback) ===
+{_strip_imports_exports(worker_js)}
+
+// === Compute Pool ===
+const COMPUTE_WORKER_SOURCE = {json.dumps(worker_js)};
+{_strip_imports_exports(compute_js)}
+
+// === Lazy Point Metadata ===
+{_strip_imports_exports(metadata_js)}
+
+// === Query Result Cache ===
+{_strip_imports_exports(querycache_js)}
+
 // === Sidebar (Explorer) ===
 {_strip_imports_exports(sidebar_js)}
 
@@ -193,10 +237,12 @@ function render({{ model, el }}) {{
   if (model.get("show_toolbar")) {{
     toolbarUI = createToolbar(model, {{
       onRunQuery: () => runQuery(),
+      onCancelQuery: () => cancelQuery(),
       onFilterInput: (text) => {{
         if (canvas) {{
-          const result = canvas.applyFilter(text, false);
-          if (toolbarUI) toolbarUI.setFilterCount(result.matched, result.total);
+          canvas.applyFilter(text, false).then((result) => {{
+            if (result && toolbarUI) toolbarUI.setFilterCount(result.matched, result.total);
+          }});
         }}
       }},
       onToggleSidebar: () => sidebar?.toggle(),
@@ -216,10 +262,22 @@ function render({{ model, el }}) {{
   main.className = "avs-main";
   wrapper.appendChild(main);
 
+  // Quantized positions are filled into the points before any other change:points handler runs
+  applyQuantizedPositions(model);
+  model.on("change:points", () => applyQuantizedPositions(model));
+  model.on("change:_positions", () => applyQuantizedPositions(model));
+
+  // Shared worker-backed compute for filtering, neighbours and stats
+  const compute = createComputeClient(model);
+  // Full point rows for the tooltip and properties panel (fetched on demand when lazy)
+  const metadata = createMetadataClient(model);
+  // Browser-side query results, reused within query_cache_ttl
+  const queryCache = createQueryCache(model);
+
   // Sidebar (left, explorer panel)
   sidebar = createSidebar(model, {{
     onClose: () => sidebar?.close(),
-  }});
+  }}, compute);
   main.appendChild(sidebar.element);
 
   const canvasContainer = document.createElement("div");
@@ -237,21 +295,46 @@ function render({{ model, el }}) {{
 
   propertiesPanel = createPropertiesPanel(model, {{
     onClose: () => propertiesPanel?.close(),
-  }});
+  }}, metadata);
   main.appendChild(propertiesPanel.element);
   if (model.get("show_properties")) propertiesPanel.open();
 
   const canvas = createCanvas(model, canvasContainer, {{
     onHover: (point) => propertiesPanel?.setHoveredPoint(point),
-  }});
+    onBuildProgress: (fraction) => toolbarUI?.setBuildProgress(fraction),
+  }}, compute, metadata);
+
+  // Bumped by every run and cancel; a browser-side result is only applied if still current
+  let querySeq = 0;
+  // Browser-side request in flight: {{ key, promise, controller }}
+  let inflight = null;
+
+  // Points for a browser-side query. An identical query in flight is joined rather than
+  // sent again; a different one is aborted, since this query supersedes it.
+  function fetchBrowserQuery(cacheKey) {{
+    if (inflight && inflight.key === cacheKey) return inflight.promise;
+    inflight?.controller.abort(new DOMException("Superseded by a newer query", "AbortError"));
+    const controller = new AbortController();
+    const promise = executeBackendQuery(model, controller.signal).then((points) => {{
+      queryCache.put(cacheKey, points);
+      return points;
+    }});
+    const entry = {{ key: cacheKey, promise, controller }};
+    inflight = entry;
+    const clear = () => {{
+      if (inflight === entry) inflight = null;
+    }};
+    promise.then(clear, clear);
+    return promise;
+  }}
 
   async function runQuery() {{
     const query = model.get("query_input") || "";
 
     // Apply hard client-side filter (completely hide non-matching)
     if (canvas) {{
-      const result = canvas.applyFilter(query, true);
-      if (toolbarUI) toolbarUI.setFilterCount(result.matched, result.total);
+      const result = await canvas.applyFilter(query, true);
+      if (result && toolbarUI) toolbarUI.setFilterCount(result.matched, result.total);
     }}
 
     // Additionally run a backend query if connected
@@ -262,10 +345,14 @@ function render({{ model, el }}) {{
 
     const isBrowserSide = (backendInfo && backendInfo.side === "browser") ||
       (backend === "grafeo" && (mode === "server" || mode === "wasm"));
-    const hasBackend = isBrowserSide || status === "connected";
+    // A running Python-side query leaves the status at "connecting"; a new one supersedes it
+    const hasBackend = isBrowserSide || status === "connected" || model.get("_active_query") !== 0;
 
     if (!hasBackend) return;
 
+    const seq = ++querySeq;
+    const started = performance.now();
+    let waitForKernel = false;
     if (toolbarUI) toolbarUI.setLoading(true);
 
     try {{
@@ -274,25 +361,57 @@ function render({{ model, el }}) {{
       model.save_changes();
 
       if (isBrowserSide) {{
-        const points = await executeBackendQuery(model);
+        const cacheConfig = {{ ...(model.get("backend_config") || {{}}), mode, url: model.get("grafeo_server_url") }};
+        const cacheKey = queryCache.keyFor(backend, cacheConfig, query);
+        const points = (await queryCache.get(cacheKey)) || (await fetchBrowserQuery(cacheKey));
+        if (seq !== querySeq) return;
         model.set("points", points);
         model.set("connection_status", "connected");
+        model.set("query_latency", performance.now() - started);
         model.save_changes();
       }} else {{
+        // The kernel runs it in the background and reports progress through _active_query
         model.set("_execute_query", Date.now());
         model.save_changes();
+        waitForKernel = true;
       }}
     }} catch (err) {{
+      if (seq !== querySeq) return;
       model.set("query_error", err.message);
       model.set("connection_status", "error");
       model.save_changes();
       console.error("Query error:", err);
     }} finally {{
-      if (toolbarUI) toolbarUI.setLoading(false);
+      if (toolbarUI && seq === querySeq && !waitForKernel) toolbarUI.setLoading(false);
     }}
   }}
 
-  return () => {{ canvas.cleanup(); }};
+  function cancelQuery() {{
+    querySeq++;
+    inflight?.controller.abort(new DOMException("Query cancelled", "AbortError"));
+    inflight = null;
+    const active = model.get("_active_query");
+    if (active) {{
+      model.set("_cancel_query", active);
+    }} else {{
+      model.set("connection_status", "connected");
+    }}
+    model.save_changes();
+    if (toolbarUI) toolbarUI.setLoading(false);
+  }}
+
+  function onActiveQuery() {{
+    if (toolbarUI) toolbarUI.setLoading(model.get("_active_query") !== 0);
+  }}
+  model.on("change:_active_query", onActiveQuery);
+
+  return () => {{
+    model.off("change:_active_query", onActiveQuery);
+    canvas.cleanup();
+    compute.dispose();
+    metadata.dispose();
+    queryCache.dispose();
+  }};
 }}
 
 export default {{ render }};
@@ -309,8 +428,8 @@ def _strip_imports_exports(code: str) -> str:
             continue
         if stripped.startswith("export function "):
             line = line.replace("export function ", "function ")
-        elif stripped.startswith("export async function "):
-            line = line.replace("export async function ", "async function ")
+        elif stripped.startswith("export async function"):
+            line = line.replace("export async function", "async function")
         elif stripped.startswith("export const "):
             line = line.replace("export const ", "const ")
         elif stripped.startswith("export default"):
@@ -326,6 +445,8 @@ def _rename_functions(code: str, prefix: str) -> str:
     code = code.replace("async function executeQuery", f"async function {prefix}Execute")
     code = code.replace("function executeQuery", f"async function {prefix}Execute")
     code = code.replace("function toPoints", f"function {prefix}ToPoints")
+    code = code.replace("function parseScanQuery", f"function {prefix}ParseScanQuery")
+    code = code.replace("function* scanPages", f"function* {prefix}ScanPages")
     return code
 
 
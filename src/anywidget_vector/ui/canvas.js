@@ -2,57 +2,155 @@
 import * as THREE from "https://esm.sh/three@0.160.0";
 import { OrbitControls } from "https://esm.sh/three@0.160.0/addons/controls/OrbitControls.js";
 import { COLOR_SCALES, CATEGORICAL_COLORS } from "./constants.js";
+import { getSelectedRows, setSelectedRows } from "./selection.js";
 
-// Shape geometries factory
+// Shape geometries by level of detail: 0 is full tessellation, higher is coarser.
+// Flat-faced shapes are already minimal and look the same at every level.
 const SHAPE_GEOMETRIES = {
-  sphere: () => new THREE.SphereGeometry(1, 16, 16),
+  sphere: (lod = 0) => [
+    () => new THREE.SphereGeometry(1, 16, 16),
+    () => new THREE.IcosahedronGeometry(1, 1),
+    () => new THREE.OctahedronGeometry(1),
+  ][lod](),
   cube: () => new THREE.BoxGeometry(1, 1, 1),
-  cone: () => new THREE.ConeGeometry(0.7, 1.4, 16),
+  cone: (lod = 0) => new THREE.ConeGeometry(0.7, 1.4, 16 >> lod),
   tetrahedron: () => new THREE.TetrahedronGeometry(1),
   octahedron: () => new THREE.OctahedronGeometry(1),
-  cylinder: () => new THREE.CylinderGeometry(0.5, 0.5, 1, 16),
+  cylinder: (lod = 0) => new THREE.CylinderGeometry(0.5, 0.5, 1, 16 >> lod),
 };
-
-// Distance metrics
-const DISTANCE_METRICS = {
-  euclidean: (a, b) => {
-    const dx = a.x - b.x, dy = a.y - b.y, dz = a.z - b.z;
-    return Math.sqrt(dx*dx + dy*dy + dz*dz);
-  },
-  cosine: (a, b) => {
-    const dot = a.x*b.x + a.y*b.y + a.z*b.z;
-    const magA = Math.sqrt(a.x*a.x + a.y*a.y + a.z*a.z);
-    const magB = Math.sqrt(b.x*b.x + b.y*b.y + b.z*b.z);
-    if (magA === 0 || magB === 0) return 1;
-    return 1 - (dot / (magA * magB));
-  },
-  manhattan: (a, b) => Math.abs(a.x - b.x) + Math.abs(a.y - b.y) + Math.abs(a.z - b.z),
-  dot_product: (a, b) => -(a.x*b.x + a.y*b.y + a.z*b.z),
-};
-
-export function createCanvas(model, container, callbacks) {
+const SHAPE_NAMES = Object.keys(SHAPE_GEOMETRIES);
+
+// Instanced points are drawn at the LOD level for their on-screen radius:
+// full detail from LOD_FULL_PX, mid detail from LOD_MID_PX, coarsest below.
+const SHAPE_LOD_LEVELS = 3;
+const LOD_FULL_PX = 12;
+const LOD_MID_PX = 3;
+// Instances are re-bucketed once the camera has been still this long
+const LOD_SETTLE_MS = 150;
+
+// Nearest neighbours of a hovered point whose metadata is fetched ahead of time
+const METADATA_PREFETCH_NEIGHBORS = 8;
+
+// A hover sync the kernel has not acknowledged within this long no longer holds back the next
+const HOVER_ACK_TIMEOUT_MS = 2000;
+
+// Point construction is time-sliced: at most this much work per animation frame.
+// Instances are filled in BUILD_STRIDE interleaved passes, so a uniform coarse
+// subset of the cloud is on screen after the first pass.
+const BUILD_FRAME_BUDGET_MS = 12;
+const BUILD_STRIDE = 16;
+
+// Ease-in-out for layout transitions
+const easeInOutCubic = t => (t < 0.5 ? 4 * t * t * t : 1 - Math.pow(-2 * t + 2, 3) / 2);
+
+// Per-point state flags. Instanced points read them from a per-instance
+// attribute in the shader, so a selection or filter change writes one byte per point.
+const POINT_UNSELECTED = 1; // a selection exists and this point is not in it
+const POINT_FILTERED = 2;   // excluded by a hard search filter
+const POINT_DIMMED = 4;     // excluded by the soft search filter preview
+const POINT_HOVERED = 8;
+const POINT_HIDDEN = POINT_UNSELECTED | POINT_FILTERED;
+
+// Octree tuning: points per leaf before splitting, and a depth cap for duplicates
+const OCTREE_LEAF_SIZE = 128;
+const OCTREE_MAX_DEPTH = 16;
+
+export function createCanvas(model, container, callbacks, compute, metadata) {
   let scene, camera, renderer, controls;
   let pointsGroup, connectionsGroup;
+  let connectionLines = null;
+  // Geometries, materials and instanced meshes reused across point rebuilds
+  const resources = createResourcePool();
   let raycaster, mouse;
   let hoveredObject = null;
   let tooltip;
   let axesGroup, gridHelper;
-  let animationId;
-  let resizeObserver;
+  let animationId = null;
+  let resizeObserver, visibilityObserver;
+  // On-demand rendering: frames are only drawn when something marked the scene dirty
+  let needsRender = false;
+  let isOnScreen = true;
   let selectionRect, boxOverlay;
   let selectionGroup;
   let lassoOverlayEl, lassoSvg, lassoPathEl;
   let isLassoing = false, lassoCoords = [];
   let currentMode = model.get("selection_mode") || "click";
-
-  function setSelection(ids) {
-    model.set("selected_points", ids);
+  // Spatial index over point positions, rebuilt once per data version
+  let spatialIndex = null;
+  // POINT_* flags per point, and where each point is drawn
+  let pointState = new Uint8Array(0);
+  let pointMeshes = [];
+  let pointSlots = new Uint32Array(0);
+  // Instanced layout: shape index, rgb and radius per point, and the LOD each point is drawn at
+  let instanceShapes = null, instanceColors = null, pointRadii = null, pointLods = null;
+  let lodTimer = null;
+  // Incremented by every createPoints(); an in-flight build stops when it no longer matches
+  let buildId = 0;
+  let buildingPoints = false;
+  // Points and positions the instances were last written for. A layout transition
+  // moves instances from morphOrigins (per point) to shownPositions on the GPU.
+  let shownPoints = null, shownPositions = null;
+  let morphOrigins = null, morph = null;
+  // Timeline playback of set_frames() layouts. The instances hold frames framePair and
+  // framePair + 1, so moving between them only changes the shader's morph progress.
+  let frames = null, framePair = -1, framePosition = 0;
+  let playback = null;
+  let frameIndexStale = false;
+  let timelineEl, timelinePlayBtn, timelineSlider, timelineLabel;
+  const viewProjMatrix = new THREE.Matrix4();
+
+  // Kernel-bound interaction events. Selection is applied locally at once but synced after
+  // event_throttle ms of quiet; hover syncs (only while Python has on_hover handlers) are
+  // throttled, and at most one is unacknowledged, with newer hovers replacing the pending one.
+  let selectionSyncTimer = null;
+  let pendingHover, lastHoverSync = 0, hoverSyncTimer = null;
+  let hoverSent = 0, hoverSentAt = 0, lastHoverKey = null;
+
+  function setSelection(rows) {
+    setSelectedRows(model, rows);
     model.set("_selection_version", (model.get("_selection_version") || 0) + 1);
+    clearTimeout(selectionSyncTimer);
+    selectionSyncTimer = setTimeout(() => {
+      selectionSyncTimer = null;
+      model.save_changes();
+    }, model.get("event_throttle") ?? 100);
+  }
+
+  function queueHoverSync(pointIndex, pointId) {
+    if (!model.get("_hover_sync")) return;
+    pendingHover = pointIndex === -1 ? null : { id: pointId, index: pointIndex };
+    flushHoverSync();
+  }
+
+  function flushHoverSync() {
+    if (pendingHover === undefined || hoverSyncTimer !== null) return;
+    const key = pendingHover && `${pendingHover.index}:${pendingHover.id}`;
+    if (key === lastHoverKey) {
+      // Unchanged since the last sync: the kernel would see no change and never ack it
+      pendingHover = undefined;
+      return;
+    }
+    const now = performance.now();
+    const waiting = hoverSent > (model.get("_hover_ack") || 0) && now - hoverSentAt < HOVER_ACK_TIMEOUT_MS;
+    const wait = waiting ? HOVER_ACK_TIMEOUT_MS - (now - hoverSentAt)
+      : lastHoverSync + (model.get("event_throttle") ?? 100) - now;
+    if (wait > 0) {
+      hoverSyncTimer = setTimeout(() => {
+        hoverSyncTimer = null;
+        flushHoverSync();
+      }, wait);
+      return;
+    }
+    model.set("hovered_point", pendingHover);
     model.save_changes();
+    pendingHover = undefined;
+    lastHoverKey = key;
+    hoverSent++;
+    hoverSentAt = lastHoverSync = now;
   }
 
   init();
-  animate();
+  requestRender();
 
   function init() {
     // Scene
@@ -82,10 +180,19 @@ export function createCanvas(model, container, callbacks) {
         camera.aspect = width / height;
         camera.updateProjectionMatrix();
         renderer.setSize(width, height);
+        requestRender();
+        scheduleLodUpdate();
       }
     });
     resizeObserver.observe(container);
 
+    // Pause rendering entirely while the widget is scrolled out of view
+    visibilityObserver = new IntersectionObserver((entries) => {
+      isOnScreen = entries[entries.length - 1].isIntersecting;
+      if (isOnScreen && needsRender) requestRender();
+    });
+    visibilityObserver.observe(container);
+
     // Controls
     controls = new OrbitControls(camera, renderer.domElement);
     controls.enableDamping = true;
@@ -94,6 +201,9 @@ export function createCanvas(model, container, callbacks) {
     controls.enableZoom = false; // disable built-in scroll zoom
     const target = model.get("camera_target") || [0, 0, 0];
     controls.target.set(target[0], target[1], target[2]);
+    // Fired on user interaction and on every damped update while the camera settles
+    controls.addEventListener("change", requestRender);
+    controls.addEventListener("change", scheduleLodUpdate);
 
     // Custom smooth scroll zoom with reduced sensitivity
     renderer.domElement.addEventListener("wheel", (e) => {
@@ -129,7 +239,9 @@ export function createCanvas(model, container, callbacks) {
     setupBoxSelection();
     setupLassoSelection();
     setupKeyboardShortcuts();
+    setupTimeline();
     createPoints();
+    loadFrames();
     createConnections();
     fitToView();
     bindModelEvents();
@@ -146,6 +258,7 @@ export function createCanvas(model, container, callbacks) {
         e.preventDefault();
         fitToView();
       } else if (e.key === "Escape") {
+        if (hoveredObject) setPointHovered(hoveredObject.pointIndex, false);
         hoveredObject = null;
         hideTooltip();
         setSelection([]);
@@ -154,6 +267,7 @@ export function createCanvas(model, container, callbacks) {
   }
 
   function setupAxesAndGrid() {
+    requestRender();
     while (axesGroup.children.length > 0) axesGroup.remove(axesGroup.children[0]);
     if (gridHelper) { scene.remove(gridHelper); gridHelper = null; }
 
@@ -188,19 +302,43 @@ export function createCanvas(model, container, callbacks) {
   }
 
   function createPoints() {
-    while (pointsGroup.children.length > 0) {
-      const obj = pointsGroup.children[0];
-      if (obj.geometry) obj.geometry.dispose();
-      if (obj.material) obj.material.dispose();
-      pointsGroup.remove(obj);
-    }
+    requestRender();
+    finishMorph();
+    // Meshes are detached, not disposed: their GPU resources belong to the pool
+    pointsGroup.clear();
+    resources.begin();
 
     const points = model.get("points") || [];
-    if (points.length === 0) return;
+    spatialIndex = null;
+    frameIndexStale = false;
+    framePair = -1;
+    hoveredObject = null;
+    pointState = new Uint8Array(points.length);
+    pointMeshes = new Array(points.length);
+    pointSlots = new Uint32Array(points.length);
+    instanceShapes = instanceColors = pointRadii = pointLods = null;
+    shownPoints = points;
+    shownPositions = compute.positions();
+    if (points.length === 0) {
+      buildId++;
+      buildingPoints = false;
+      callbacks.onBuildProgress?.(null);
+      resources.sweep();
+      return;
+    }
 
+    runBuild(buildPoints(points, pointOptions(points)));
+  }
+
+  // Color, size and shape mapping options for the current traits and data
+  function pointOptions(points) {
     // Auto-scale point sizes relative to data extent
+    const positions = compute.positions();
     const box = new THREE.Box3();
-    points.forEach(p => box.expandByPoint(new THREE.Vector3(p.x ?? 0, p.y ?? 0, p.z ?? 0)));
+    const corner = new THREE.Vector3();
+    for (let i = 0; i < positions.length; i += 3) {
+      box.expandByPoint(corner.set(positions[i], positions[i + 1], positions[i + 2]));
+    }
     const dataSize = box.getSize(new THREE.Vector3()).length() || 1;
     const scaleFactor = dataSize / 10;
     const rawRange = model.get("size_range") || [0.02, 0.06];
@@ -217,21 +355,134 @@ export function createCanvas(model, container, callbacks) {
     };
 
     // Compute domains
-    if (opts.colorField && !opts.colorDomain) {
-      const values = points.map(p => p[opts.colorField]).filter(v => typeof v === "number");
-      if (values.length > 0) opts.colorDomain = [Math.min(...values), Math.max(...values)];
-    }
-    if (opts.sizeField) {
-      const values = points.map(p => p[opts.sizeField]).filter(v => typeof v === "number");
-      if (values.length > 0) opts.sizeDomain = [Math.min(...values), Math.max(...values)];
-    }
+    if (opts.colorField && !opts.colorDomain) opts.colorDomain = numericExtent(points, opts.colorField);
+    if (opts.sizeField) opts.sizeDomain = numericExtent(points, opts.sizeField);
+    return opts;
+  }
+
+  // Drive a build generator in slices of BUILD_FRAME_BUDGET_MS per animation frame.
+  // The first slice runs immediately, so small datasets are built synchronously.
+  // Each yield reports progress in [0, 1]; a newer createPoints() abandons the build.
+  function runBuild(steps) {
+    const id = ++buildId;
+    buildingPoints = true;
+    const slice = () => {
+      if (id !== buildId) return;
+      const start = performance.now();
+      let step;
+      do {
+        step = steps.next();
+      } while (!step.done && performance.now() - start < BUILD_FRAME_BUDGET_MS);
+      requestRender();
+      if (step.done) {
+        buildingPoints = false;
+        callbacks.onBuildProgress?.(null);
+        if (frames) showFrame(framePosition);
+        // The camera may have moved while the build was running
+        scheduleLodUpdate();
+      } else {
+        callbacks.onBuildProgress?.(step.value);
+        requestAnimationFrame(slice);
+      }
+    };
+    slice();
+  }
 
-    const useInstancing = model.get("use_instancing") && points.length > 100;
+  function* buildPoints(points, opts) {
+    const count = points.length;
+    pointRadii = new Float32Array(count);
+    const useInstancing = model.get("use_instancing") && count > 100;
     if (useInstancing) {
-      createInstancedPoints(points, opts);
+      instanceShapes = new Uint8Array(count);
+      instanceColors = new Float32Array(count * 3);
+      for (let i = 0; i < count; i++) {
+        const point = points[i];
+        pointRadii[i] = getPointSize(point, opts);
+        instanceShapes[i] = SHAPE_NAMES.indexOf(getPointShape(point, opts));
+        getPointColor(point, opts).toArray(instanceColors, i * 3);
+        if ((i & 1023) === 1023) yield (i / count) * 0.5;
+      }
+      pointLods = computeInstanceLods();
+      for (const progress of fillInstances(pointLods, true)) yield 0.5 + progress * 0.5;
     } else {
+      points.forEach((p, i) => { pointRadii[i] = getPointSize(p, opts); });
       createIndividualPoints(points, opts);
     }
+    resources.sweep();
+
+    spatialIndex = buildSpatialIndex(compute.positions(), pointRadii, count);
+  }
+
+  function isPointHidden(idx) {
+    return (pointState[idx] & POINT_HIDDEN) !== 0;
+  }
+
+  // Set `flag` on the points where test(i) is true and clear it elsewhere (clearing
+  // `alsoClear` everywhere), then push the states out
+  function setPointFlag(flag, test, alsoClear = 0) {
+    for (let i = 0; i < pointState.length; i++) {
+      const state = pointState[i] & ~(flag | alsoClear);
+      pointState[i] = test(i) ? state | flag : state;
+    }
+    pointsGroup.children.forEach(obj => {
+      if (obj.userData.isInstanced) {
+        const indices = obj.userData.pointIndices;
+        const attr = obj.geometry.getAttribute("instanceState");
+        for (let i = 0; i < indices.length; i++) attr.array[i] = pointState[indices[i]];
+        // Pending ranges (e.g. a hover this frame) would limit the upload to those slots
+        attr.clearUpdateRanges();
+        attr.needsUpdate = true;
+      } else {
+        applyMeshState(obj);
+      }
+    });
+    requestRender();
+  }
+
+  function setPointHovered(idx, hovered) {
+    const mesh = pointMeshes[idx];
+    if (!mesh) return;
+    if (hovered) pointState[idx] |= POINT_HOVERED;
+    else pointState[idx] &= ~POINT_HOVERED;
+    if (mesh.userData.isInstanced) {
+      const attr = mesh.geometry.getAttribute("instanceState");
+      attr.array[pointSlots[idx]] = pointState[idx];
+      attr.addUpdateRange(pointSlots[idx], 1);
+      attr.needsUpdate = true;
+    } else {
+      applyMeshState(mesh);
+    }
+    requestRender();
+  }
+
+  // Non-instanced points express their state through visibility and a shared material
+  function applyMeshState(mesh) {
+    const state = pointState[mesh.userData.pointIndex];
+    mesh.visible = (state & POINT_HIDDEN) === 0;
+    mesh.material = pointMaterial(mesh.userData.color, state);
+  }
+
+  // Nearest visible point under the cursor, or -1
+  function pickPoint() {
+    const index = currentSpatialIndex();
+    if (!index || playback) return -1;
+    raycaster.setFromCamera(mouse, camera);
+    return pickSpatialIndex(index, raycaster.ray, isPointHidden);
+  }
+
+  // Spatial index for the positions on screen; rebuilt lazily after the timeline moved
+  function currentSpatialIndex() {
+    if (frameIndexStale && frames && pointRadii) {
+      spatialIndex = buildSpatialIndex(currentFramePositions(), pointRadii, pointRadii.length);
+      frameIndexStale = false;
+    }
+    return spatialIndex;
+  }
+
+  function updateViewProjection() {
+    camera.updateMatrixWorld();
+    viewProjMatrix.multiplyMatrices(camera.projectionMatrix, camera.matrixWorldInverse);
+    return viewProjMatrix;
   }
 
   function getPointColor(point, opts) {
@@ -261,136 +512,509 @@ export function createCanvas(model, container, callbacks) {
     if (opts.shapeField && point[opts.shapeField] !== undefined) {
       const value = String(point[opts.shapeField]);
       if (opts.shapeMap[value] && SHAPE_GEOMETRIES[opts.shapeMap[value]]) return opts.shapeMap[value];
-      const shapes = Object.keys(SHAPE_GEOMETRIES);
-      return shapes[hashString(value) % shapes.length];
+      return SHAPE_NAMES[hashString(value) % SHAPE_NAMES.length];
     }
     return "sphere";
   }
 
+  function pointMaterial(color, state = 0) {
+    const look = state & (POINT_DIMMED | POINT_HOVERED);
+    return resources.material(`${color.getHexString()}:${look}`, () => new THREE.MeshPhongMaterial({
+      color,
+      transparent: (look & POINT_DIMMED) !== 0,
+      opacity: look & POINT_DIMMED ? 0.08 : 1,
+      emissive: look & POINT_HOVERED ? 0x595959 : 0x000000,
+    }));
+  }
+
   function createIndividualPoints(points, opts) {
     points.forEach((point, idx) => {
       const shape = getPointShape(point, opts);
-      const geometry = SHAPE_GEOMETRIES[shape]();
       const color = getPointColor(point, opts);
-      const material = new THREE.MeshPhongMaterial({ color });
-      const mesh = new THREE.Mesh(geometry, material);
+      const mesh = new THREE.Mesh(resources.geometry(shape), pointMaterial(color));
       const size = getPointSize(point, opts);
       mesh.scale.set(size, size, size);
       mesh.position.set(point.x ?? 0, point.y ?? 0, point.z ?? 0);
-      mesh.userData = { pointIndex: idx, pointId: point.id || `point_${idx}` };
+      mesh.userData = { pointIndex: idx, pointId: point.id || `point_${idx}`, color };
+      pointMeshes[idx] = mesh;
       pointsGroup.add(mesh);
     });
   }
 
-  function createInstancedPoints(points, opts) {
-    const groups = {};
-    points.forEach((point, idx) => {
-      const shape = getPointShape(point, opts);
-      if (!groups[shape]) groups[shape] = [];
-      groups[shape].push({ point, idx });
+  function scheduleLodUpdate() {
+    if (!instanceShapes) return;
+    clearTimeout(lodTimer);
+    lodTimer = setTimeout(bucketInstances, LOD_SETTLE_MS);
+  }
+
+  // Re-distribute instanced points over the (shape, LOD) meshes for the current
+  // camera. Nothing is rewritten if no point changed level.
+  function bucketInstances() {
+    if (!instanceShapes || buildingPoints || morph) return;
+    const lods = computeInstanceLods();
+    if (pointLods && pointLods.every((lod, i) => lod === lods[i])) return;
+    pointLods = lods;
+    const steps = fillInstances(lods);
+    while (!steps.next().done);
+    if (frames) {
+      framePair = -1;
+      showFrame(framePosition);
+    }
+    requestRender();
+  }
+
+  // When only the layout changed (same points in the same order, drawn instanced),
+  // animate the instances to their new positions instead of rebuilding. Returns
+  // false if a full createPoints() is needed.
+  function morphPoints() {
+    const points = model.get("points") || [];
+    const duration = model.get("transition_duration") || 0;
+    const count = points.length;
+    if (duration <= 0 || !instanceShapes || buildingPoints || frames) return false;
+    if (!shownPoints || shownPoints.length !== count) return false;
+    for (let i = 0; i < count; i++) {
+      if (points[i].id !== shownPoints[i].id) return false;
+    }
+
+    // Sizes and colors may depend on the new data; a changed shape needs a rebuild
+    const opts = pointOptions(points);
+    const shapes = new Uint8Array(count);
+    for (let i = 0; i < count; i++) {
+      shapes[i] = SHAPE_NAMES.indexOf(getPointShape(points[i], opts));
+      if (shapes[i] !== instanceShapes[i]) return false;
+    }
+
+    // Start from wherever the points are drawn right now, even mid-transition
+    const from = new Float32Array(count * 3);
+    const t = morph ? easeInOutCubic(Math.min(1, (performance.now() - morph.start) / morph.duration)) : 1;
+    for (let i = 0; i < count * 3; i++) {
+      from[i] = morph ? morphOrigins[i] + (shownPositions[i] - morphOrigins[i]) * t : shownPositions[i];
+    }
+    const to = compute.positions();
+    points.forEach((p, i) => {
+      pointRadii[i] = getPointSize(p, opts);
+      getPointColor(p, opts).toArray(instanceColors, i * 3);
+    });
+    writeInstanceLayout(from, to);
+
+    shownPoints = points;
+    shownPositions = to;
+    morphOrigins = from;
+    morph = { start: performance.now(), duration };
+    setMorphProgress(0);
+    // Bounding spheres only cover the end positions while instances are in flight
+    pointsGroup.children.forEach(mesh => { mesh.frustumCulled = false; });
+    spatialIndex = buildSpatialIndex(to, pointRadii, count);
+    return true;
+  }
+
+  // Rewrite every instance's start position, end position, size and color in place
+  function writeInstanceLayout(from, to) {
+    for (let i = 0; i < instanceShapes.length; i++) {
+      const mesh = pointMeshes[i], slot = pointSlots[i];
+      const m = mesh.instanceMatrix.array, o = slot * 16, r = pointRadii[i];
+      m[o] = m[o + 5] = m[o + 10] = r;
+      m[o + 12] = to[i * 3];
+      m[o + 13] = to[i * 3 + 1];
+      m[o + 14] = to[i * 3 + 2];
+      mesh.geometry.getAttribute("instanceOrigin").array.set(from.subarray(i * 3, i * 3 + 3), slot * 3);
+      mesh.instanceColor.array.set(instanceColors.subarray(i * 3, i * 3 + 3), slot * 3);
+    }
+    // Whole buffers: drop ranges still pending from progressive flushes or hovers,
+    // which would otherwise limit the upload to those ranges
+    pointsGroup.children.forEach(mesh => {
+      const origin = mesh.geometry.getAttribute("instanceOrigin");
+      for (const attr of [mesh.instanceMatrix, mesh.instanceColor, origin]) {
+        attr.clearUpdateRanges();
+        attr.needsUpdate = true;
+      }
+      mesh.boundingSphere = null;
+    });
+  }
+
+  function setMorphProgress(t) {
+    resources.material("instanced", createInstancedPointMaterial).userData.morphProgress.value = t;
+    requestRender();
+  }
+
+  // Called every rendered frame; keeps frames coming until the transition ends
+  function stepMorph() {
+    if (!morph) return;
+    const t = (performance.now() - morph.start) / morph.duration;
+    if (t >= 1) {
+      finishMorph();
+      scheduleLodUpdate();
+    } else {
+      setMorphProgress(easeInOutCubic(t));
+    }
+  }
+
+  function finishMorph() {
+    if (!morph) return;
+    morph = null;
+    morphOrigins = null;
+    setMorphProgress(1);
+    pointsGroup.children.forEach(mesh => { mesh.frustumCulled = true; });
+  }
+
+  function setupTimeline() {
+    timelineEl = document.createElement("div");
+    timelineEl.className = "avs-timeline";
+    timelineEl.style.display = "none";
+
+    timelinePlayBtn = document.createElement("button");
+    timelinePlayBtn.className = "avs-zoom-btn";
+    timelinePlayBtn.innerHTML = ICONS.play;
+    timelinePlayBtn.title = "Play";
+    timelinePlayBtn.addEventListener("click", () => (playback ? stopPlayback() : startPlayback()));
+
+    timelineSlider = document.createElement("input");
+    timelineSlider.type = "range";
+    timelineSlider.className = "avs-timeline-slider";
+    timelineSlider.min = 0;
+    timelineSlider.step = 0.01;
+    timelineSlider.addEventListener("input", () => {
+      stopPlayback(false);
+      showFrame(parseFloat(timelineSlider.value));
     });
+    timelineSlider.addEventListener("change", syncFrame);
 
-    for (const [shape, items] of Object.entries(groups)) {
-      const geometry = SHAPE_GEOMETRIES[shape]();
-      const material = new THREE.MeshPhongMaterial({ vertexColors: false });
-      const instancedMesh = new THREE.InstancedMesh(geometry, material, items.length);
-      const matrix = new THREE.Matrix4();
-      const colors = new Float32Array(items.length * 3);
-
-      items.forEach(({ point, idx }, i) => {
-        const size = getPointSize(point, opts);
-        const pointColor = getPointColor(point, opts);
-        matrix.identity();
-        matrix.makeScale(size, size, size);
-        matrix.setPosition(point.x ?? 0, point.y ?? 0, point.z ?? 0);
-        instancedMesh.setMatrixAt(i, matrix);
-        colors[i * 3] = pointColor.r;
-        colors[i * 3 + 1] = pointColor.g;
-        colors[i * 3 + 2] = pointColor.b;
+    timelineLabel = document.createElement("span");
+    timelineLabel.className = "avs-timeline-label";
+
+    timelineEl.appendChild(timelinePlayBtn);
+    timelineEl.appendChild(timelineSlider);
+    timelineEl.appendChild(timelineLabel);
+    container.appendChild(timelineEl);
+  }
+
+  // Read the frame buffer sent by set_frames(); frames that don't match the points are ignored
+  function loadFrames() {
+    const count = model.get("frame_count") || 0;
+    const raw = model.get("_frames");
+    const n = (model.get("points") || []).length;
+    const hadFrames = frames !== null;
+    stopPlayback(false);
+    frames = null;
+    framePair = -1;
+    if (count > 0 && n > 0 && raw && raw.byteLength === count * n * 12) {
+      const view = ArrayBuffer.isView(raw) ? raw : new DataView(raw);
+      // Float32Array views need 4-byte alignment
+      frames = view.byteOffset % 4 === 0
+        ? new Float32Array(view.buffer, view.byteOffset, view.byteLength / 4)
+        : new Float32Array(view.buffer.slice(view.byteOffset, view.byteOffset + view.byteLength));
+    }
+    timelineEl.style.display = frames && count > 1 ? "" : "none";
+    timelineSlider.max = Math.max(0, count - 1);
+    if (frames) {
+      showFrame(model.get("frame") || 0);
+    } else if (hadFrames) {
+      // Back to the points' own positions
+      frameIndexStale = false;
+      if (instanceShapes && !buildingPoints) {
+        writeInstanceLayout(shownPositions, shownPositions);
+        pointsGroup.children.forEach(mesh => { mesh.frustumCulled = true; });
+        spatialIndex = buildSpatialIndex(shownPositions, pointRadii, pointRadii.length);
+      } else {
+        createPoints();
+      }
+      setMorphProgress(1);
+    }
+  }
+
+  // Show the layout at fractional frame position f
+  function showFrame(f) {
+    const count = model.get("frame_count") || 0;
+    framePosition = Math.min(Math.max(f, 0), Math.max(0, count - 1));
+    timelineSlider.value = framePosition;
+    const labels = model.get("frame_labels") || [];
+    timelineLabel.textContent = `${labels[Math.round(framePosition)] ?? Math.round(framePosition)} / ${labels[count - 1] ?? count - 1}`;
+    if (!frames || buildingPoints) return;
+
+    finishMorph();
+    const n = pointState.length;
+    const k = Math.min(Math.floor(framePosition), Math.max(0, count - 2));
+    const next = Math.min(k + 1, count - 1);
+    const t = framePosition - k;
+    if (instanceShapes) {
+      if (k !== framePair) {
+        writeInstanceLayout(frames.subarray(k * n * 3, (k + 1) * n * 3), frames.subarray(next * n * 3, (next + 1) * n * 3));
+        framePair = k;
+        // Bounding spheres only cover the end frame of the pair
+        pointsGroup.children.forEach(mesh => { mesh.frustumCulled = false; });
+      }
+      setMorphProgress(t);
+    } else {
+      const a = k * n * 3, b = next * n * 3;
+      pointsGroup.children.forEach(mesh => {
+        const o = mesh.userData.pointIndex * 3;
+        mesh.position.set(
+          frames[a + o] + (frames[b + o] - frames[a + o]) * t,
+          frames[a + o + 1] + (frames[b + o + 1] - frames[a + o + 1]) * t,
+          frames[a + o + 2] + (frames[b + o + 2] - frames[a + o + 2]) * t,
+        );
       });
+      requestRender();
+    }
+    frameIndexStale = true;
+  }
+
+  // Interpolated positions at the current frame position
+  function currentFramePositions() {
+    const count = model.get("frame_count") || 0;
+    const n = pointRadii.length;
+    const k = Math.min(Math.floor(framePosition), Math.max(0, count - 2));
+    const next = Math.min(k + 1, count - 1);
+    const t = framePosition - k;
+    const out = new Float32Array(n * 3);
+    for (let i = 0; i < n * 3; i++) {
+      const a = frames[k * n * 3 + i];
+      out[i] = a + (frames[next * n * 3 + i] - a) * t;
+    }
+    return out;
+  }
+
+  function startPlayback() {
+    const count = model.get("frame_count") || 0;
+    if (!frames || count < 2) return;
+    if (framePosition >= count - 1) showFrame(0);
+    playback = { last: performance.now() };
+    timelinePlayBtn.innerHTML = ICONS.pause;
+    timelinePlayBtn.title = "Pause";
+    requestRender();
+  }
+
+  function stopPlayback(sync = true) {
+    if (!playback) return;
+    playback = null;
+    timelinePlayBtn.innerHTML = ICONS.play;
+    timelinePlayBtn.title = "Play";
+    if (sync) syncFrame();
+  }
+
+  // The frame position only goes back to Python when playback stops or a scrub ends
+  function syncFrame() {
+    model.set("frame", framePosition);
+    model.save_changes();
+  }
+
+  // Called every rendered frame; advances playback at frame_rate frames per second
+  function stepPlayback() {
+    if (!playback) return;
+    const now = performance.now();
+    // Cap the step so that time spent off-screen doesn't skip ahead
+    const dt = Math.min(now - playback.last, 100) / 1000;
+    playback.last = now;
+    const count = model.get("frame_count") || 0;
+    const f = framePosition + dt * (model.get("frame_rate") || 4);
+    showFrame(f);
+    if (f >= count - 1) stopPlayback();
+    else requestRender();
+  }
+
+  // LOD level per instanced point from its projected radius in pixels
+  function computeInstanceLods() {
+    const count = instanceShapes.length;
+    const positions = compute.positions();
+    const eye = camera.position;
+    const pixelsPerUnit = renderer.domElement.clientHeight / (2 * Math.tan(THREE.MathUtils.degToRad(camera.fov) / 2));
+    const lods = new Uint8Array(count);
+    for (let i = 0; i < count; i++) {
+      const dx = positions[i * 3] - eye.x, dy = positions[i * 3 + 1] - eye.y, dz = positions[i * 3 + 2] - eye.z;
+      const px = pointRadii[i] * pixelsPerUnit / Math.max(Math.sqrt(dx*dx + dy*dy + dz*dz), 1e-6);
+      lods[i] = px >= LOD_FULL_PX ? 0 : px >= LOD_MID_PX ? 1 : 2;
+    }
+    return lods;
+  }
+
+  // Write every instanced point into one InstancedMesh per (shape, LOD). Points are
+  // visited in BUILD_STRIDE interleaved passes and each mesh draws only its filled
+  // prefix, so a partially filled set of meshes shows an evenly thinned cloud.
+  // Yields progress in [0, 1] every 1024 points; when `progressive`, the filled
+  // slots are also uploaded every 16384 points instead of only at the end.
+  function* fillInstances(lods, progressive = false) {
+    const count = instanceShapes.length;
+    const positions = compute.positions();
+    const sizes = new Uint32Array(SHAPE_NAMES.length * SHAPE_LOD_LEVELS);
+    const shapeTotals = new Uint32Array(SHAPE_NAMES.length);
+    for (let i = 0; i < count; i++) {
+      sizes[instanceShapes[i] * SHAPE_LOD_LEVELS + lods[i]]++;
+      shapeTotals[instanceShapes[i]]++;
+    }
+
+    pointsGroup.clear();
+    const material = resources.material("instanced", createInstancedPointMaterial);
+    const meshes = [];
+    sizes.forEach((size, bucket) => {
+      if (size === 0) return;
+      const shape = Math.floor(bucket / SHAPE_LOD_LEVELS);
+      const lod = bucket % SHAPE_LOD_LEVELS;
+      // Headroom so that points moving between levels rarely force a reallocation
+      const capacity = Math.min(shapeTotals[shape], Math.ceil(size * 1.5));
+      const mesh = resources.instancedMesh(
+        `${SHAPE_NAMES[shape]}:${lod}`, resources.geometry(SHAPE_NAMES[shape], lod), material, size, capacity,
+      );
+      mesh.count = 0;
+      mesh.userData = { isInstanced: true, pointIndices: new Uint32Array(size) };
+      meshes[bucket] = mesh;
+      pointsGroup.add(mesh);
+    });
+
+    const fill = new Uint32Array(sizes.length);
+    // Upload only the slots written since the last flush, and draw up to them
+    const flush = () => {
+      meshes.forEach((mesh, bucket) => {
+        const from = mesh.count, to = fill[bucket];
+        if (to === from) return;
+        const state = mesh.geometry.getAttribute("instanceState");
+        mesh.instanceMatrix.addUpdateRange(from * 16, (to - from) * 16);
+        mesh.instanceColor.addUpdateRange(from * 3, (to - from) * 3);
+        state.addUpdateRange(from, to - from);
+        mesh.instanceMatrix.needsUpdate = mesh.instanceColor.needsUpdate = state.needsUpdate = true;
+        mesh.count = to;
+        mesh.boundingSphere = null;
+      });
+    };
+
+    let done = 0;
+    for (let pass = 0; pass < BUILD_STRIDE; pass++) {
+      for (let i = pass; i < count; i += BUILD_STRIDE) {
+        const bucket = instanceShapes[i] * SHAPE_LOD_LEVELS + lods[i];
+        const mesh = meshes[bucket];
+        const slot = fill[bucket]++;
+        mesh.userData.pointIndices[slot] = i;
+        pointMeshes[i] = mesh;
+        pointSlots[i] = slot;
+
+        // Uniform scale plus translation, written straight into the column-major matrix
+        const m = mesh.instanceMatrix.array, o = slot * 16, r = pointRadii[i];
+        m.fill(0, o, o + 16);
+        m[o] = m[o + 5] = m[o + 10] = r;
+        m[o + 12] = positions[i * 3];
+        m[o + 13] = positions[i * 3 + 1];
+        m[o + 14] = positions[i * 3 + 2];
+        m[o + 15] = 1;
+        mesh.instanceColor.array.set(instanceColors.subarray(i * 3, i * 3 + 3), slot * 3);
+        mesh.geometry.getAttribute("instanceState").array[slot] = pointState[i];
+
+        if ((++done & 1023) === 0) {
+          if (progressive && (done & 16383) === 0) flush();
+          yield done / count;
+        }
+      }
+    }
+    flush();
+  }
+
+  // All edges live in one indexed LineSegments over the point positions. The
+  // position buffer is uploaded once per data version; edge changes only rewrite
+  // the index and the per-vertex weights.
+  function ensureConnectionLines(count) {
+    const positions = compute.positions();
+    const capacity = connectionLines?.geometry.getIndex().array.length ?? 0;
+    if (connectionLines && connectionLines.userData.positions === positions && capacity >= count) {
+      return connectionLines;
+    }
+    const material = connectionLines?.material || new THREE.LineBasicMaterial({
+      vertexColors: true,
+      transparent: true,
+      depthWrite: false,
+    });
+    disposeConnectionLines(false);
+
+    const geometry = new THREE.BufferGeometry();
+    geometry.setAttribute("position", new THREE.BufferAttribute(Float32Array.from(positions), 3));
+    // rgba multiplier on the material color; alpha encodes neighbour distance
+    geometry.setAttribute("color", new THREE.BufferAttribute(new Float32Array(positions.length / 3 * 4).fill(1), 4));
+    geometry.setIndex(new THREE.BufferAttribute(new Uint32Array(capacity >= count ? capacity : Math.max(count, capacity * 2)), 1));
+    geometry.setDrawRange(0, 0);
+    geometry.computeBoundingSphere();
+
+    connectionLines = new THREE.LineSegments(geometry, material);
+    connectionLines.userData.positions = positions;
+    connectionsGroup.add(connectionLines);
+    updateConnectionStyle();
+    return connectionLines;
+  }
 
-      geometry.setAttribute("color", new THREE.InstancedBufferAttribute(colors, 3));
-      material.vertexColors = true;
-      instancedMesh.instanceMatrix.needsUpdate = true;
-      instancedMesh.userData = {
-        isInstanced: true,
-        pointIndices: items.map(({ idx }) => idx),
-        pointIds: items.map(({ point, idx }) => point.id || `point_${idx}`)
-      };
-      pointsGroup.add(instancedMesh);
+  function disposeConnectionLines(disposeMaterial = true) {
+    if (!connectionLines) return;
+    connectionsGroup.remove(connectionLines);
+    connectionLines.geometry.dispose();
+    if (disposeMaterial) connectionLines.material.dispose();
+    connectionLines = null;
+  }
+
+  function updateConnectionStyle() {
+    if (!connectionLines) return;
+    connectionLines.material.color.set(model.get("connection_color") || "#ffffff");
+    connectionLines.material.opacity = model.get("connection_opacity") || 0.3;
+    requestRender();
+  }
+
+  // Replace the drawn edges; with `distances`, edge i fades with distances[i].
+  // Star edges from a reference point own their far vertex, so its weight is the edge's.
+  function setConnectionEdges(edges, distances = null) {
+    const lines = ensureConnectionLines(edges.length);
+    const geometry = lines.geometry;
+    const index = geometry.getIndex();
+    index.array.set(edges);
+    index.needsUpdate = true;
+    geometry.setDrawRange(0, edges.length);
+
+    const weights = geometry.getAttribute("color");
+    if (lines.userData.weighted) {
+      weights.array.fill(1);
+      lines.userData.weighted = false;
+    }
+    if (distances && distances.length > 0) {
+      const near = distances[0], far = distances[distances.length - 1];
+      const span = far - near || 1;
+      for (let i = 0; i < distances.length; i++) {
+        weights.array[edges[i * 2 + 1] * 4 + 3] = 1 - 0.75 * (distances[i] - near) / span;
+      }
+      lines.userData.weighted = true;
     }
+    weights.needsUpdate = true;
+    requestRender();
   }
 
   function createConnections() {
-    while (connectionsGroup.children.length > 0) {
-      const obj = connectionsGroup.children[0];
-      if (obj.geometry) obj.geometry.dispose();
-      if (obj.material) obj.material.dispose();
-      connectionsGroup.remove(obj);
+    requestRender();
+    compute.cancel("connections");
+    // Edges index into the current positions; drop them as soon as the data changes
+    if (connectionLines && connectionLines.userData.positions !== compute.positions()) {
+      disposeConnectionLines();
     }
 
     const points = model.get("points") || [];
     const showConnections = model.get("show_connections");
-    if (!showConnections || points.length < 2) return;
-
     const kNeighbors = model.get("k_neighbors") || 0;
     const distanceThreshold = model.get("distance_threshold");
     const referencePoint = model.get("reference_point");
     const distanceMetric = model.get("distance_metric") || "euclidean";
-    const connectionColor = model.get("connection_color") || "#ffffff";
-    const connectionOpacity = model.get("connection_opacity") || 0.3;
-
-    const material = new THREE.LineBasicMaterial({
-      color: new THREE.Color(connectionColor),
-      transparent: true,
-      opacity: connectionOpacity,
-    });
+    const refIdx = referencePoint ? points.findIndex(p => p.id === referencePoint) : -1;
 
-    const computeDist = (p1, p2) => {
-      const fn = DISTANCE_METRICS[distanceMetric] || DISTANCE_METRICS.euclidean;
-      return fn(p1, p2);
-    };
+    const hasEdges = showConnections && points.length >= 2 && (referencePoint
+      ? refIdx !== -1 && (distanceThreshold != null || kNeighbors > 0)
+      : kNeighbors > 0);
+    if (!hasEdges) {
+      connectionLines?.geometry.setDrawRange(0, 0);
+      return;
+    }
 
+    // Neighbour search runs on the compute pool; a newer call supersedes this one.
+    // The previous edges stay on screen until the new ones arrive.
     if (referencePoint) {
-      const refIdx = points.findIndex(p => p.id === referencePoint);
-      if (refIdx === -1) return;
-      const ref = points[refIdx];
-      const distances = points.map((p, i) => ({
-        idx: i, point: p,
-        dist: i === refIdx ? Infinity : computeDist(ref, p)
-      })).filter(d => d.dist !== Infinity).sort((a, b) => a.dist - b.dist);
-
-      let neighbors;
-      if (distanceThreshold != null) neighbors = distances.filter(d => d.dist <= distanceThreshold);
-      else if (kNeighbors > 0) neighbors = distances.slice(0, kNeighbors);
-      else return;
-
-      neighbors.forEach(n => {
-        const geometry = new THREE.BufferGeometry();
-        geometry.setAttribute("position", new THREE.BufferAttribute(new Float32Array([
-          ref.x ?? 0, ref.y ?? 0, ref.z ?? 0,
-          n.point.x ?? 0, n.point.y ?? 0, n.point.z ?? 0
-        ]), 3));
-        connectionsGroup.add(new THREE.Line(geometry, material));
-      });
-    } else if (kNeighbors > 0) {
-      points.forEach((p, i) => {
-        const distances = points.map((other, j) => ({
-          idx: j, point: other,
-          dist: i === j ? Infinity : computeDist(p, other)
-        })).filter(d => d.dist !== Infinity).sort((a, b) => a.dist - b.dist).slice(0, kNeighbors);
-
-        distances.forEach(n => {
-          if (i < n.idx) {
-            const geometry = new THREE.BufferGeometry();
-            geometry.setAttribute("position", new THREE.BufferAttribute(new Float32Array([
-              p.x ?? 0, p.y ?? 0, p.z ?? 0,
-              n.point.x ?? 0, n.point.y ?? 0, n.point.z ?? 0
-            ]), 3));
-            connectionsGroup.add(new THREE.Line(geometry, material));
-          }
-        });
-      });
+      compute.run("connections", "neighbors", {
+        ref: refIdx, k: kNeighbors, threshold: distanceThreshold, metric: distanceMetric,
+      }).then(result => {
+        if (result) setConnectionEdges(edgesFromNeighbors(refIdx, result.indices), result.distances);
+      }).catch(err => console.error("Connection search failed:", err));
+    } else {
+      compute.run("connections", "knn", { k: kNeighbors, metric: distanceMetric }).then(edges => {
+        if (edges) setConnectionEdges(edges);
+      }).catch(err => console.error("Connection search failed:", err));
     }
   }
 
@@ -406,35 +1030,46 @@ export function createCanvas(model, container, callbacks) {
     mouse.x = ((event.clientX - rect.left) / rect.width) * 2 - 1;
     mouse.y = -((event.clientY - rect.top) / rect.height) * 2 + 1;
 
-    raycaster.setFromCamera(mouse, camera);
-    const intersects = raycaster.intersectObjects(pointsGroup.children, true);
+    const pointIndex = pickPoint();
 
-    if (intersects.length > 0) {
-      const hit = intersects[0];
+    if (pointIndex !== -1) {
       const points = model.get("points") || [];
-      let pointIndex, pointId;
-
-      if (hit.object.userData.isInstanced) {
-        pointIndex = hit.object.userData.pointIndices[hit.instanceId];
-        pointId = hit.object.userData.pointIds[hit.instanceId];
-      } else {
-        pointIndex = hit.object.userData.pointIndex;
-        pointId = hit.object.userData.pointId;
-      }
-
       const point = points[pointIndex];
+      const pointId = point?.id || `point_${pointIndex}`;
       if (point && (!hoveredObject || hoveredObject.pointId !== pointId)) {
+        if (hoveredObject) setPointHovered(hoveredObject.pointIndex, false);
+        setPointHovered(pointIndex, true);
         hoveredObject = { pointIndex, pointId };
-        callbacks.onHover?.(point);
-        showTooltip(event, point);
+        const full = metadata.get(pointIndex);
+        callbacks.onHover?.(full || point);
+        queueHoverSync(pointIndex, pointId);
+        showTooltip(event, full || point);
+        if (!full) fetchHoverMetadata(event, pointIndex);
       }
     } else if (hoveredObject) {
+      setPointHovered(hoveredObject.pointIndex, false);
       hoveredObject = null;
       callbacks.onHover?.(null);
+      queueHoverSync(-1);
       hideTooltip();
     }
   }
 
+  // Lazy metadata: fill in the tooltip and properties once the row arrives, and warm
+  // the cache with the hovered point's nearest neighbours
+  function fetchHoverMetadata(event, pointIndex) {
+    metadata.fetch(pointIndex).then(full => {
+      if (!full || hoveredObject?.pointIndex !== pointIndex) return;
+      callbacks.onHover?.(full);
+      showTooltip(event, full);
+    });
+    compute.run("metadataPrefetch", "neighbors", {
+      ref: pointIndex, k: METADATA_PREFETCH_NEIGHBORS, metric: "euclidean",
+    }).then(result => {
+      if (result) metadata.prefetch(result.indices);
+    }).catch(err => console.error("Metadata prefetch failed:", err));
+  }
+
   function onClick(event) {
     // Box mode handles selection via the overlay, not raycaster clicks
     if (currentMode === "box") return;
@@ -443,28 +1078,19 @@ export function createCanvas(model, container, callbacks) {
     mouse.x = ((event.clientX - rect.left) / rect.width) * 2 - 1;
     mouse.y = -((event.clientY - rect.top) / rect.height) * 2 + 1;
 
-    raycaster.setFromCamera(mouse, camera);
-    const intersects = raycaster.intersectObjects(pointsGroup.children, true);
-
-    if (intersects.length > 0) {
-      const hit = intersects[0];
-      let pointId;
-      if (hit.object.userData.isInstanced) {
-        pointId = hit.object.userData.pointIds[hit.instanceId];
-      } else {
-        pointId = hit.object.userData.pointId;
-      }
+    const pointIndex = pickPoint();
 
+    if (pointIndex !== -1) {
       const selectionMode = model.get("selection_mode") || "click";
-      const currentSelection = model.get("selected_points") || [];
+      const currentSelection = getSelectedRows(model);
 
       if (selectionMode === "click") {
-        setSelection([pointId]);
+        setSelection([pointIndex]);
       } else if (selectionMode === "multi") {
-        if (currentSelection.includes(pointId)) {
-          setSelection(currentSelection.filter(id => id !== pointId));
+        if (currentSelection.includes(pointIndex)) {
+          setSelection(currentSelection.filter(row => row !== pointIndex));
         } else {
-          setSelection([...currentSelection, pointId]);
+          setSelection([...currentSelection, pointIndex]);
         }
       }
     } else {
@@ -637,27 +1263,15 @@ export function createCanvas(model, container, callbacks) {
       // Ignore tiny drags (likely accidental clicks)
       if (x2 - x1 < 4 && y2 - y1 < 4) return;
 
-      const selectedIds = getPointsInScreenRect(
-        camera, model.get("points") || [],
-        { x1, y1, x2, y2 },
-        rect.width, rect.height
-      );
-      setSelection(selectedIds);
+      setSelection(getPointsInScreenRect({ x1, y1, x2, y2 }, rect.width, rect.height));
     });
   }
 
-  function getPointsInScreenRect(cam, points, rect, canvasWidth, canvasHeight) {
-    const { x1, y1, x2, y2 } = rect;
-    const selected = [];
-    points.forEach(p => {
-      const pos = new THREE.Vector3(p.x ?? 0, p.y ?? 0, p.z ?? 0).project(cam);
-      const sx = (pos.x * 0.5 + 0.5) * canvasWidth;
-      const sy = (-pos.y * 0.5 + 0.5) * canvasHeight;
-      if (sx >= x1 && sx <= x2 && sy >= y1 && sy <= y2) {
-        selected.push(p.id || `point_${points.indexOf(p)}`);
-      }
-    });
-    return selected;
+  // Rows of the points whose screen projection falls inside rect (and the optional lasso region)
+  function getPointsInScreenRect(rect, canvasWidth, canvasHeight, region = null) {
+    const index = currentSpatialIndex();
+    if (!index) return [];
+    return querySpatialIndex(index, updateViewProjection(), canvasWidth, canvasHeight, rect, region);
   }
 
   function showTooltip(event, point) {
@@ -682,8 +1296,25 @@ export function createCanvas(model, container, callbacks) {
   }
 
   function bindModelEvents() {
-    model.on("change:points", () => { createPoints(); createConnections(); updateSelectionHighlight(); });
-    model.on("change:background", () => { scene.background = new THREE.Color(model.get("background")); });
+    model.on("change:points", () => {
+      if (!morphPoints()) createPoints();
+      loadFrames();
+      createConnections();
+      updateSelectionHighlight();
+    });
+    model.on("change:_frames", loadFrames);
+    model.on("change:_hover_ack", () => {
+      clearTimeout(hoverSyncTimer);
+      hoverSyncTimer = null;
+      flushHoverSync();
+    });
+    model.on("change:frame", () => {
+      if (!playback) showFrame(model.get("frame") || 0);
+    });
+    model.on("change:background", () => {
+      scene.background = new THREE.Color(model.get("background"));
+      requestRender();
+    });
     model.on("change:show_axes", setupAxesAndGrid);
     model.on("change:show_grid", setupAxesAndGrid);
     model.on("change:color_field", createPoints);
@@ -698,30 +1329,52 @@ export function createCanvas(model, container, callbacks) {
     model.on("change:distance_threshold", createConnections);
     model.on("change:reference_point", createConnections);
     model.on("change:distance_metric", createConnections);
-    model.on("change:connection_color", createConnections);
-    model.on("change:connection_opacity", createConnections);
-    model.on("change:selected_points", updateSelectionHighlight);
+    model.on("change:connection_color", updateConnectionStyle);
+    model.on("change:connection_opacity", updateConnectionStyle);
+    model.on("change:_selection", updateSelectionHighlight);
     model.on("change:camera_position", () => {
       const pos = model.get("camera_position");
       if (pos) camera.position.set(pos[0], pos[1], pos[2]);
+      requestRender();
     });
     model.on("change:camera_target", () => {
       const target = model.get("camera_target");
       if (target) controls.target.set(target[0], target[1], target[2]);
+      requestRender();
     });
   }
 
-  function animate() {
-    animationId = requestAnimationFrame(animate);
+  function requestRender() {
+    needsRender = true;
+    if (animationId === null && isOnScreen) animationId = requestAnimationFrame(renderFrame);
+  }
+
+  function renderFrame() {
+    animationId = null;
+    if (!isOnScreen) return;
+    needsRender = false;
+    stepMorph();
+    stepPlayback();
+    // While damping is still moving the camera, update() fires "change" and schedules the next frame
     controls.update();
     renderer.render(scene, camera);
   }
 
   function cleanup() {
-    cancelAnimationFrame(animationId);
+    if (animationId !== null) cancelAnimationFrame(animationId);
+    playback = null;
+    clearTimeout(lodTimer);
+    clearTimeout(hoverSyncTimer);
+    if (selectionSyncTimer !== null) {
+      clearTimeout(selectionSyncTimer);
+      model.save_changes();
+    }
+    buildId++;
     resizeObserver.disconnect();
+    visibilityObserver.disconnect();
     controls.dispose();
     renderer.dispose();
+    resources.dispose();
     scene.traverse((obj) => {
       if (obj.geometry) obj.geometry.dispose();
       if (obj.material) {
@@ -731,104 +1384,30 @@ export function createCanvas(model, container, callbacks) {
     });
   }
 
-  function applyFilter(filterText, hard) {
+  // Resolves to { matched, total }, or null when superseded by a newer filter
+  async function applyFilter(filterText, hard) {
     const points = model.get("points") || [];
     const filter = (filterText || "").toLowerCase().trim();
     const total = points.length;
 
     if (!filter) {
       // Reset all to visible
-      pointsGroup.children.forEach(obj => {
-        if (obj.userData.isInstanced) {
-          if (obj.userData._filterOrigMatrices) {
-            const m = new THREE.Matrix4();
-            for (let i = 0; i < obj.userData.pointIndices.length; i++) {
-              m.fromArray(obj.userData._filterOrigMatrices, i * 16);
-              obj.setMatrixAt(i, m);
-            }
-            obj.instanceMatrix.needsUpdate = true;
-            obj.userData._filterOrigMatrices = null;
-          }
-          if (obj.userData._originalColors) {
-            const attr = obj.geometry.getAttribute("color");
-            attr.array.set(obj.userData._originalColors);
-            attr.needsUpdate = true;
-            obj.userData._originalColors = null;
-          }
-        } else {
-          obj.visible = true;
-          if (obj.material) {
-            obj.material.opacity = 1;
-            obj.material.transparent = false;
-            obj.material.needsUpdate = true;
-          }
-        }
-      });
+      compute.cancel("filter");
+      metadata.cancelSearch();
+      setPointFlag(POINT_FILTERED | POINT_DIMMED, () => false);
       return { matched: total, total };
     }
 
-    let matched = 0;
-    const matchSet = new Set();
-    points.forEach((point, idx) => {
-      if (pointMatchesFilter(point, filter)) {
-        matchSet.add(idx);
-        matched++;
-      }
-    });
+    // With lazy_metadata the browser only has render fields, so the kernel matches the rest
+    const result = model.get("lazy_metadata")
+      ? await metadata.search(filter)
+      : await compute.run("filter", "filter", { filter });
+    if (!result) return null;
+    const { mask, matched } = result;
 
-    if (hard) {
-      // Hard filter: completely hide non-matching
-      const zeroMatrix = new THREE.Matrix4().makeScale(0, 0, 0);
-      pointsGroup.children.forEach(obj => {
-        if (obj.userData.isInstanced) {
-          const indices = obj.userData.pointIndices;
-          if (!obj.userData._filterOrigMatrices) {
-            const buf = new Float32Array(indices.length * 16);
-            const m = new THREE.Matrix4();
-            for (let i = 0; i < indices.length; i++) {
-              obj.getMatrixAt(i, m);
-              m.toArray(buf, i * 16);
-            }
-            obj.userData._filterOrigMatrices = buf;
-          }
-          const m = new THREE.Matrix4();
-          for (let i = 0; i < indices.length; i++) {
-            if (matchSet.has(indices[i])) {
-              m.fromArray(obj.userData._filterOrigMatrices, i * 16);
-            } else {
-              m.copy(zeroMatrix);
-            }
-            obj.setMatrixAt(i, m);
-          }
-          obj.instanceMatrix.needsUpdate = true;
-        } else {
-          obj.visible = matchSet.has(obj.userData.pointIndex);
-        }
-      });
-    } else {
-      // Soft filter: dim non-matching
-      pointsGroup.children.forEach(obj => {
-        if (obj.userData.isInstanced) {
-          const indices = obj.userData.pointIndices;
-          const attr = obj.geometry.getAttribute("color");
-          if (!obj.userData._originalColors) {
-            obj.userData._originalColors = new Float32Array(attr.array);
-          }
-          for (let i = 0; i < indices.length; i++) {
-            const dim = matchSet.has(indices[i]) ? 1.0 : 0.08;
-            attr.array[i * 3] = obj.userData._originalColors[i * 3] * dim;
-            attr.array[i * 3 + 1] = obj.userData._originalColors[i * 3 + 1] * dim;
-            attr.array[i * 3 + 2] = obj.userData._originalColors[i * 3 + 2] * dim;
-          }
-          attr.needsUpdate = true;
-        } else if (obj.material) {
-          const matches = matchSet.has(obj.userData.pointIndex);
-          obj.material.transparent = !matches;
-          obj.material.opacity = matches ? 1.0 : 0.08;
-          obj.material.needsUpdate = true;
-        }
-      });
-    }
+    // Hard filter hides non-matching points, the soft preview only dims them
+    const [flag, other] = hard ? [POINT_FILTERED, POINT_DIMMED] : [POINT_DIMMED, POINT_FILTERED];
+    setPointFlag(flag, i => mask[i] !== 1, other);
 
     return { matched, total };
   }
@@ -879,36 +1458,25 @@ export function createCanvas(model, container, callbacks) {
       // Close the polygon
       lassoCoords.push(lassoCoords[0]);
 
+      // Cull by the lasso's bounding box first, then test survivors against a rasterized polygon
       const rect = container.getBoundingClientRect();
-      const selectedIds = [];
-      const points = model.get("points") || [];
-      points.forEach((p, idx) => {
-        const pos = new THREE.Vector3(p.x ?? 0, p.y ?? 0, p.z ?? 0).project(camera);
-        const sx = (pos.x * 0.5 + 0.5) * rect.width;
-        const sy = (-pos.y * 0.5 + 0.5) * rect.height;
-        if (pointInPolygon(sx, sy, lassoCoords)) {
-          selectedIds.push(p.id || `point_${idx}`);
-        }
-      });
-
-      setSelection(selectedIds);
+      let x1 = Infinity, y1 = Infinity, x2 = -Infinity, y2 = -Infinity;
+      for (const [x, y] of lassoCoords) {
+        if (x < x1) x1 = x;
+        if (x > x2) x2 = x;
+        if (y < y1) y1 = y;
+        if (y > y2) y2 = y;
+      }
+      setSelection(getPointsInScreenRect(
+        { x1, y1, x2, y2 }, rect.width, rect.height,
+        rasterizePolygon(lassoCoords, x1, y1, x2, y2)
+      ));
       lassoCoords = [];
     });
   }
 
-  function pointInPolygon(x, y, polygon) {
-    let inside = false;
-    for (let i = 0, j = polygon.length - 1; i < polygon.length; j = i++) {
-      const [xi, yi] = polygon[i];
-      const [xj, yj] = polygon[j];
-      if (((yi > y) !== (yj > y)) && (x < (xj - xi) * (y - yi) / (yj - yi) + xi)) {
-        inside = !inside;
-      }
-    }
-    return inside;
-  }
-
   function updateSelectionHighlight() {
+    requestRender();
     // Clear previous highlight rings
     while (selectionGroup.children.length > 0) {
       const obj = selectionGroup.children[0];
@@ -917,68 +1485,29 @@ export function createCanvas(model, container, callbacks) {
       selectionGroup.remove(obj);
     }
 
-    const selectedIds = model.get("selected_points") || [];
+    const rows = getSelectedRows(model);
     const points = model.get("points") || [];
 
-    if (selectedIds.length === 0) {
+    if (rows.length === 0) {
       // Restore all points: show everything
-      pointsGroup.children.forEach(obj => {
-        if (obj.userData.isInstanced) {
-          // Restore original instance matrices
-          if (obj.userData._selOrigMatrices) {
-            const m = new THREE.Matrix4();
-            for (let i = 0; i < obj.userData.pointIds.length; i++) {
-              m.fromArray(obj.userData._selOrigMatrices, i * 16);
-              obj.setMatrixAt(i, m);
-            }
-            obj.instanceMatrix.needsUpdate = true;
-            obj.userData._selOrigMatrices = null;
-          }
-        } else {
-          obj.visible = true;
-        }
-      });
+      setPointFlag(POINT_UNSELECTED, () => false);
       return;
     }
 
-    const selectedSet = new Set(selectedIds);
-    const zeroMatrix = new THREE.Matrix4().makeScale(0, 0, 0);
-
     // Hide non-selected points completely
-    pointsGroup.children.forEach(obj => {
-      if (obj.userData.isInstanced) {
-        const pointIds = obj.userData.pointIds;
-        // Back up original matrices on first selection
-        if (!obj.userData._selOrigMatrices) {
-          const buf = new Float32Array(pointIds.length * 16);
-          const m = new THREE.Matrix4();
-          for (let i = 0; i < pointIds.length; i++) {
-            obj.getMatrixAt(i, m);
-            m.toArray(buf, i * 16);
-          }
-          obj.userData._selOrigMatrices = buf;
-        }
-        // Scale non-selected instances to zero
-        const m = new THREE.Matrix4();
-        for (let i = 0; i < pointIds.length; i++) {
-          if (selectedSet.has(pointIds[i])) {
-            m.fromArray(obj.userData._selOrigMatrices, i * 16);
-          } else {
-            m.copy(zeroMatrix);
-          }
-          obj.setMatrixAt(i, m);
-        }
-        obj.instanceMatrix.needsUpdate = true;
-      } else {
-        obj.visible = selectedSet.has(obj.userData.pointId);
-      }
-    });
+    const selected = new Uint8Array(pointState.length);
+    const box = new THREE.Box3();
+    const corner = new THREE.Vector3();
+    for (let n = 0; n < rows.length; n++) {
+      const p = points[rows[n]];
+      if (!p) continue;
+      if (rows[n] < selected.length) selected[rows[n]] = 1;
+      box.expandByPoint(corner.set(p.x ?? 0, p.y ?? 0, p.z ?? 0));
+    }
+    setPointFlag(POINT_UNSELECTED, i => !selected[i]);
 
     // Zoom to fit selected points
-    const selectedPoints = points.filter(p => selectedSet.has(p.id));
-    if (selectedPoints.length > 0) {
-      const box = new THREE.Box3();
-      selectedPoints.forEach(p => box.expandByPoint(new THREE.Vector3(p.x ?? 0, p.y ?? 0, p.z ?? 0)));
+    if (!box.isEmpty()) {
       const center = box.getCenter(new THREE.Vector3());
       const size = box.getSize(new THREE.Vector3()).length() || 0.1;
       const distance = size / (2 * Math.tan(Math.PI * camera.fov / 360));
@@ -994,12 +1523,378 @@ export function createCanvas(model, container, callbacks) {
   return { cleanup, applyFilter };
 }
 
-function pointMatchesFilter(point, filter) {
-  for (const [key, val] of Object.entries(point)) {
-    if (key === "x" || key === "y" || key === "z" || key === "vector") continue;
-    if (val != null && String(val).toLowerCase().includes(filter)) return true;
+// === Resource pool ===
+// Per-widget cache of GPU resources. Between begin() and sweep() every resource
+// that is asked for is kept; sweep() disposes the ones the rebuild didn't use.
+
+function createResourcePool() {
+  const geometries = new Map();
+  const materials = new Map();
+  const meshes = new Map();
+  let generation = 0;
+
+  function take(map, key, create) {
+    let entry = map.get(key);
+    if (!entry) {
+      entry = { value: create() };
+      map.set(key, entry);
+    }
+    entry.generation = generation;
+    return entry.value;
+  }
+
+  return {
+    begin() {
+      generation++;
+    },
+    // Unit-sized shape geometry at a tessellation level
+    geometry(shape, lod = 0) {
+      return take(geometries, `${shape}:${lod}`, () => SHAPE_GEOMETRIES[shape](lod));
+    },
+    material(key, create) {
+      return take(materials, key, create);
+    },
+    // InstancedMesh drawing `count` instances; reused while its buffers are large enough,
+    // otherwise reallocated with room for `capacity`
+    instancedMesh(key, geometry, material, count, capacity = count) {
+      const entry = meshes.get(key);
+      if (entry && (entry.value.instanceMatrix.count < count || entry.base !== geometry)) {
+        disposeInstancedPointMesh(entry.value);
+        meshes.delete(key);
+      }
+      const mesh = take(meshes, key, () => createInstancedPointMesh(geometry, material, Math.max(count, capacity)));
+      meshes.get(key).base = geometry;
+      mesh.material = material;
+      mesh.count = count;
+      // Recomputed lazily from the new matrices for frustum culling
+      mesh.boundingSphere = null;
+      return mesh;
+    },
+    sweep() {
+      for (const [map, release] of [
+        [geometries, g => g.dispose()],
+        [materials, m => m.dispose()],
+        [meshes, disposeInstancedPointMesh],
+      ]) {
+        for (const [key, entry] of map) {
+          if (entry.generation === generation) continue;
+          release(entry.value);
+          map.delete(key);
+        }
+      }
+    },
+    dispose() {
+      generation++;
+      this.sweep();
+    },
+  };
+}
+
+// Instanced points over a pooled shape geometry. The mesh gets its own geometry
+// that references the shape's attributes (so their GPU buffers are shared) and
+// adds the per-instance POINT_* state byte and layout-transition start position.
+function createInstancedPointMesh(geometry, material, count) {
+  const own = new THREE.BufferGeometry();
+  own.setIndex(geometry.index);
+  for (const [name, attr] of Object.entries(geometry.attributes)) own.setAttribute(name, attr);
+  own.setAttribute("instanceState", new THREE.InstancedBufferAttribute(new Uint8Array(count), 1));
+  own.setAttribute("instanceOrigin", new THREE.InstancedBufferAttribute(new Float32Array(count * 3), 3));
+  const mesh = new THREE.InstancedMesh(own, material, count);
+  mesh.instanceColor = new THREE.InstancedBufferAttribute(new Float32Array(count * 3), 3);
+  return mesh;
+}
+
+function disposeInstancedPointMesh(mesh) {
+  // Detach the shared shape attributes so that only this mesh's buffers are freed
+  const own = mesh.geometry;
+  for (const name of Object.keys(own.attributes)) {
+    if (!name.startsWith("instance")) own.deleteAttribute(name);
+  }
+  own.setIndex(null);
+  own.dispose();
+  mesh.dispose();
+}
+
+// Phong material that applies the per-instance POINT_* state: hidden instances
+// collapse to a single point, dimmed ones darken and hovered ones lighten.
+// During a layout transition, instances are drawn between their instanceOrigin
+// and their instance matrix position at userData.morphProgress (0 to 1).
+function createInstancedPointMaterial() {
+  const material = new THREE.MeshPhongMaterial();
+  material.userData.morphProgress = { value: 1 };
+  // Flags are decoded arithmetically so the shader also compiles under WebGL 1
+  const flagFn = "float pointFlag(float state, float flag) { return mod(floor(state / flag + 0.5 / flag), 2.0); }";
+  material.onBeforeCompile = (shader) => {
+    shader.uniforms.morphProgress = material.userData.morphProgress;
+    shader.vertexShader = shader.vertexShader
+      .replace("#include <common>", `#include <common>
+        attribute float instanceState;
+        attribute vec3 instanceOrigin;
+        uniform float morphProgress;
+        varying float vPointState;
+        ${flagFn}`)
+      .replace("#include <begin_vertex>", `#include <begin_vertex>
+        // Offset in instance space, hence the division by the instance's uniform scale
+        transformed += (instanceOrigin - instanceMatrix[3].xyz) * (1.0 - morphProgress) / max(instanceMatrix[0][0], 1e-6);
+        vPointState = instanceState;
+        if (pointFlag(instanceState, ${POINT_UNSELECTED}.0) + pointFlag(instanceState, ${POINT_FILTERED}.0) > 0.5) {
+          transformed = vec3(0.0);
+        }`);
+    shader.fragmentShader = shader.fragmentShader
+      .replace("#include <common>", `#include <common>
+        varying float vPointState;
+        ${flagFn}`)
+      .replace("#include <color_fragment>", `#include <color_fragment>
+        if (pointFlag(vPointState, ${POINT_DIMMED}.0) > 0.5) diffuseColor.rgb *= 0.08;
+        if (pointFlag(vPointState, ${POINT_HOVERED}.0) > 0.5) diffuseColor.rgb = mix(diffuseColor.rgb, vec3(1.0), 0.35);`);
+  };
+  material.customProgramCacheKey = () => "point-state";
+  return material;
+}
+
+// [min, max] of the numeric values of `field`, or null if there are none
+function numericExtent(points, field) {
+  let min = Infinity, max = -Infinity;
+  for (const p of points) {
+    const v = p[field];
+    if (typeof v !== "number") continue;
+    if (v < min) min = v;
+    if (v > max) max = v;
+  }
+  return min <= max ? [min, max] : null;
+}
+
+// Star edges [ref, n, ref, n, ...] from a reference point to its neighbours
+function edgesFromNeighbors(ref, neighbors) {
+  const edges = new Uint32Array(neighbors.length * 2);
+  neighbors.forEach((n, i) => {
+    edges[i * 2] = ref;
+    edges[i * 2 + 1] = n;
+  });
+  return edges;
+}
+
+// === Spatial index ===
+// Octree over a flat xyz Float32Array. Leaves own a contiguous run of `order`,
+// so a fully covered subtree can be emitted without touching its points.
+
+function buildSpatialIndex(positions, radii, count) {
+  const order = new Uint32Array(count);
+  for (let i = 0; i < count; i++) order[i] = i;
+  const scratch = new Uint32Array(count);
+  const octants = new Uint8Array(count);
+  let maxRadius = 0;
+  for (let i = 0; i < count; i++) if (radii[i] > maxRadius) maxRadius = radii[i];
+
+  const root = makeOctreeNode(positions, order, 0, count);
+  const stack = [[root, 0]];
+  while (stack.length > 0) {
+    const [node, depth] = stack.pop();
+    const { start, end } = node;
+    if (end - start <= OCTREE_LEAF_SIZE || depth >= OCTREE_MAX_DEPTH) continue;
+
+    const cx = (node.min[0] + node.max[0]) * 0.5;
+    const cy = (node.min[1] + node.max[1]) * 0.5;
+    const cz = (node.min[2] + node.max[2]) * 0.5;
+    const counts = new Uint32Array(8);
+    for (let k = start; k < end; k++) {
+      const o = order[k] * 3;
+      const oct = (positions[o] > cx ? 1 : 0) | (positions[o + 1] > cy ? 2 : 0) | (positions[o + 2] > cz ? 4 : 0);
+      octants[k] = oct;
+      counts[oct]++;
+    }
+    // All points in one octant means coincident positions: keep as a leaf
+    if (counts.some(c => c === end - start)) continue;
+
+    const offsets = new Uint32Array(8);
+    for (let c = 1; c < 8; c++) offsets[c] = offsets[c - 1] + counts[c - 1];
+    const cursor = offsets.slice();
+    for (let k = start; k < end; k++) scratch[start + cursor[octants[k]]++] = order[k];
+    order.set(scratch.subarray(start, end), start);
+
+    node.children = [];
+    for (let c = 0; c < 8; c++) {
+      if (counts[c] === 0) continue;
+      const child = makeOctreeNode(positions, order, start + offsets[c], start + offsets[c] + counts[c]);
+      node.children.push(child);
+      stack.push([child, depth + 1]);
+    }
+  }
+  return { root, order, positions, radii, maxRadius };
+}
+
+function makeOctreeNode(positions, order, start, end) {
+  const min = [Infinity, Infinity, Infinity];
+  const max = [-Infinity, -Infinity, -Infinity];
+  for (let k = start; k < end; k++) {
+    const o = order[k] * 3;
+    for (let a = 0; a < 3; a++) {
+      const v = positions[o + a];
+      if (v < min[a]) min[a] = v;
+      if (v > max[a]) max[a] = v;
+    }
+  }
+  return { min, max, start, end, children: null };
+}
+
+// 0 = off-screen or outside rect, 1 = partially covered, 2 = fully inside rect.
+// The projected screen bounds are written to `bounds` as [x0, y0, x1, y1].
+function classifyOctreeNode(node, e, width, height, rect, bounds) {
+  let sx0 = Infinity, sy0 = Infinity, sx1 = -Infinity, sy1 = -Infinity;
+  for (let c = 0; c < 8; c++) {
+    const x = c & 1 ? node.max[0] : node.min[0];
+    const y = c & 2 ? node.max[1] : node.min[1];
+    const z = c & 4 ? node.max[2] : node.min[2];
+    const w = e[3] * x + e[7] * y + e[11] * z + e[15];
+    // A corner behind the camera makes the projected bounds meaningless
+    if (w <= 0) return 1;
+    const sx = ((e[0] * x + e[4] * y + e[8] * z + e[12]) / w * 0.5 + 0.5) * width;
+    const sy = (-(e[1] * x + e[5] * y + e[9] * z + e[13]) / w * 0.5 + 0.5) * height;
+    if (sx < sx0) sx0 = sx;
+    if (sx > sx1) sx1 = sx;
+    if (sy < sy0) sy0 = sy;
+    if (sy > sy1) sy1 = sy;
+  }
+  bounds[0] = sx0; bounds[1] = sy0; bounds[2] = sx1; bounds[3] = sy1;
+  if (sx1 < rect.x1 || sx0 > rect.x2 || sy1 < rect.y1 || sy0 > rect.y2) return 0;
+  if (sx0 >= rect.x1 && sx1 <= rect.x2 && sy0 >= rect.y1 && sy1 <= rect.y2) return 2;
+  return 1;
+}
+
+// Indices of points projecting into the screen rect, using a view-projection matrix.
+// An optional region ({ contains, covers }) narrows the rect, e.g. to a lasso polygon.
+function querySpatialIndex(index, viewProj, width, height, rect, region = null) {
+  const e = viewProj.elements;
+  const { order, positions } = index;
+  const result = new Uint32Array(order.length);
+  const bounds = new Float64Array(4);
+  let n = 0;
+  const stack = [index.root];
+  while (stack.length > 0) {
+    const node = stack.pop();
+    const cover = classifyOctreeNode(node, e, width, height, rect, bounds);
+    if (cover === 0) continue;
+    if (cover === 2 && (!region || region.covers(bounds[0], bounds[1], bounds[2], bounds[3]))) {
+      result.set(order.subarray(node.start, node.end), n);
+      n += node.end - node.start;
+      continue;
+    }
+    if (node.children) {
+      for (const child of node.children) stack.push(child);
+      continue;
+    }
+    for (let k = node.start; k < node.end; k++) {
+      const i = order[k];
+      const o = i * 3;
+      const x = positions[o], y = positions[o + 1], z = positions[o + 2];
+      const w = e[3] * x + e[7] * y + e[11] * z + e[15];
+      if (w <= 0) continue;
+      const sx = ((e[0] * x + e[4] * y + e[8] * z + e[12]) / w * 0.5 + 0.5) * width;
+      const sy = (-(e[1] * x + e[5] * y + e[9] * z + e[13]) / w * 0.5 + 0.5) * height;
+      if (sx < rect.x1 || sx > rect.x2 || sy < rect.y1 || sy > rect.y2) continue;
+      if (region && !region.contains(sx, sy)) continue;
+      result[n++] = i;
+    }
+  }
+  return result.subarray(0, n);
+}
+
+// Even-odd scanline fill of a screen-space polygon into a pixel mask over its bounding box.
+// contains() is one lookup per point; covers() uses a summed-area table so whole
+// octree nodes that land inside the polygon are accepted without per-point tests.
+function rasterizePolygon(polygon, x1, y1, x2, y2) {
+  const ox = Math.floor(x1), oy = Math.floor(y1);
+  const w = Math.ceil(x2) - ox + 1, h = Math.ceil(y2) - oy + 1;
+  const mask = new Uint8Array(w * h);
+  const crossings = [];
+  for (let row = 0; row < h; row++) {
+    const y = oy + row + 0.5;
+    crossings.length = 0;
+    for (let i = 0, j = polygon.length - 1; i < polygon.length; j = i++) {
+      const [xi, yi] = polygon[i];
+      const [xj, yj] = polygon[j];
+      if ((yi > y) !== (yj > y)) crossings.push((xj - xi) * (y - yi) / (yj - yi) + xi);
+    }
+    crossings.sort((a, b) => a - b);
+    for (let c = 0; c + 1 < crossings.length; c += 2) {
+      const from = Math.max(0, Math.ceil(crossings[c] - ox - 0.5));
+      const to = Math.min(w - 1, Math.floor(crossings[c + 1] - ox - 0.5));
+      if (to >= from) mask.fill(1, row * w + from, row * w + to + 1);
+    }
+  }
+
+  const sat = new Uint32Array((w + 1) * (h + 1));
+  for (let row = 0; row < h; row++) {
+    let rowSum = 0;
+    for (let col = 0; col < w; col++) {
+      rowSum += mask[row * w + col];
+      sat[(row + 1) * (w + 1) + col + 1] = sat[row * (w + 1) + col + 1] + rowSum;
+    }
+  }
+
+  return {
+    contains(sx, sy) {
+      const col = Math.floor(sx) - ox, row = Math.floor(sy) - oy;
+      return col >= 0 && col < w && row >= 0 && row < h && mask[row * w + col] === 1;
+    },
+    covers(sx0, sy0, sx1, sy1) {
+      const c0 = Math.floor(sx0) - ox, r0 = Math.floor(sy0) - oy;
+      const c1 = Math.floor(sx1) - ox + 1, r1 = Math.floor(sy1) - oy + 1;
+      if (c0 < 0 || r0 < 0 || c1 > w || r1 > h) return false;
+      const filled = sat[r1 * (w + 1) + c1] - sat[r0 * (w + 1) + c1] - sat[r1 * (w + 1) + c0] + sat[r0 * (w + 1) + c0];
+      return filled === (c1 - c0) * (r1 - r0);
+    },
+  };
+}
+
+// Closest point whose bounding sphere the ray hits, or -1
+function pickSpatialIndex(index, ray, isHidden) {
+  const { order, positions, radii, maxRadius } = index;
+  const ox = ray.origin.x, oy = ray.origin.y, oz = ray.origin.z;
+  const dx = ray.direction.x, dy = ray.direction.y, dz = ray.direction.z;
+  const dir = [dx, dy, dz];
+  const inv = [1 / dx, 1 / dy, 1 / dz];
+  const origin = [ox, oy, oz];
+  let bestT = Infinity, best = -1;
+
+  const stack = [index.root];
+  while (stack.length > 0) {
+    const node = stack.pop();
+    // Slab test against the node box grown by the largest point radius
+    let tmin = 0, tmax = bestT;
+    for (let a = 0; a < 3; a++) {
+      const lo = node.min[a] - maxRadius, hi = node.max[a] + maxRadius;
+      // Parallel to this slab: a miss unless the origin is inside it. Dividing would give
+      // 0 * Infinity = NaN for an origin on a slab plane (guarded as in Three's Ray.intersectBox)
+      if (dir[a] === 0) {
+        if (origin[a] < lo || origin[a] > hi) tmin = Infinity;
+        continue;
+      }
+      let t0 = (lo - origin[a]) * inv[a];
+      let t1 = (hi - origin[a]) * inv[a];
+      if (t0 > t1) { const t = t0; t0 = t1; t1 = t; }
+      if (t0 > tmin) tmin = t0;
+      if (t1 < tmax) tmax = t1;
+    }
+    if (tmin > tmax) continue;
+    if (node.children) {
+      for (const child of node.children) stack.push(child);
+      continue;
+    }
+    for (let k = node.start; k < node.end; k++) {
+      const i = order[k];
+      if (isHidden(i)) continue;
+      const o = i * 3;
+      const vx = positions[o] - ox, vy = positions[o + 1] - oy, vz = positions[o + 2] - oz;
+      const t = vx * dx + vy * dy + vz * dz;
+      const d2 = vx * vx + vy * vy + vz * vz - t * t;
+      const r = radii[i];
+      if (d2 > r * r) continue;
+      const hit = t - Math.sqrt(r * r - d2);
+      if (hit >= 0 && hit < bestT) { bestT = hit; best = i; }
+    }
   }
-  return false;
+  return best;
 }
 
 // Helper functions
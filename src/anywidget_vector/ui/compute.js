@@ -0,0 +1,194 @@
+// Worker pool for canvas-side heavy work (filtering, neighbour search, sidebar stats).
+// One pool is shared by every widget on the page; each widget talks to it through
+// a compute client that owns that widget's dataset.
+
+const COMPUTE_POOL_SIZE = Math.max(1, Math.min(2, (navigator.hardwareConcurrency || 2) - 1));
+
+let computePool = null;
+let nextComputeDatasetId = 1;
+let nextComputeTaskId = 1;
+
+function getComputePool() {
+  if (computePool) return computePool;
+
+  // Positions are shared zero-copy when the page is cross-origin isolated
+  let shared = typeof SharedArrayBuffer !== "undefined" && globalThis.crossOriginIsolated === true;
+  let workers = [];
+  try {
+    const url = URL.createObjectURL(new Blob([COMPUTE_WORKER_SOURCE], { type: "text/javascript" }));
+    for (let i = 0; i < COMPUTE_POOL_SIZE; i++) workers.push(new Worker(url));
+  } catch (err) {
+    console.warn("Compute workers unavailable, running on the main thread:", err);
+    workers.forEach(w => w.terminate());
+    workers = [createInlineWorker()];
+    shared = false;
+  }
+
+  const tasks = new Map();
+  const load = new Map(workers.map(w => [w, 0]));
+
+  function settle(id, value, error) {
+    const task = tasks.get(id);
+    if (!task) return;
+    tasks.delete(id);
+    load.set(task.worker, load.get(task.worker) - 1);
+    if (error) task.reject(new Error(error));
+    else task.resolve(value);
+  }
+
+  workers.forEach(worker => {
+    worker.onmessage = (e) => {
+      const { id, result, error, cancelled } = e.data;
+      settle(id, cancelled ? null : result, error);
+    };
+    worker.onerror = (e) => {
+      for (const [id, task] of tasks) {
+        if (task.worker === worker) settle(id, null, e.message || "Compute worker failed");
+      }
+    };
+  });
+
+  computePool = {
+    allocFloat32(length) {
+      if (!shared) return new Float32Array(length);
+      return new Float32Array(new SharedArrayBuffer(length * Float32Array.BYTES_PER_ELEMENT));
+    },
+    // Send a typed array to every worker: shared as-is, otherwise one transferred copy per worker
+    broadcast(message, key, array) {
+      workers.forEach(worker => {
+        if (!array || shared) {
+          worker.postMessage(array ? { ...message, [key]: array } : message);
+        } else {
+          const copy = array.slice();
+          worker.postMessage({ ...message, [key]: copy }, [copy.buffer]);
+        }
+      });
+    },
+    // Run a task on the least loaded worker; resolves to null if cancelled
+    submit(message) {
+      const id = nextComputeTaskId++;
+      const worker = workers.reduce((a, b) => (load.get(b) < load.get(a) ? b : a));
+      load.set(worker, load.get(worker) + 1);
+      const promise = new Promise((resolve, reject) => tasks.set(id, { resolve, reject, worker }));
+      worker.postMessage({ ...message, type: "run", id });
+      return { id, promise };
+    },
+    cancel(id) {
+      const task = tasks.get(id);
+      if (!task) return;
+      task.worker.postMessage({ type: "cancel", id });
+      settle(id, null);
+    },
+  };
+  return computePool;
+}
+
+// Same message protocol as a Worker, served by the inline copy of the worker code
+function createInlineWorker() {
+  const worker = {
+    onmessage: null,
+    onerror: null,
+    postMessage(msg) {
+      setTimeout(() => handleComputeMessage(msg, (data) => worker.onmessage?.({ data })), 0);
+    },
+    terminate() {},
+  };
+  return worker;
+}
+
+// Lowercased searchable text of a point, one segment per metadata value
+function pointSearchText(point) {
+  const parts = [];
+  for (const [key, val] of Object.entries(point)) {
+    if (key === "x" || key === "y" || key === "z" || key === "vector") continue;
+    if (val != null) parts.push(String(val).toLowerCase());
+  }
+  return parts.join("\u0000");
+}
+
+export function createComputeClient(model) {
+  const pool = getComputePool();
+  const dataset = nextComputeDatasetId++;
+  let points = [];
+  let positions = new Float32Array(0);
+  let textReady = false;
+  const columnsReady = new Set();
+  const inflight = new Map();
+
+  function setPoints(newPoints) {
+    // Results for the previous data version are meaningless now
+    for (const key of [...inflight.keys()]) cancel(key);
+    points = newPoints;
+    positions = pool.allocFloat32(points.length * 3);
+    points.forEach((p, i) => {
+      positions[i * 3] = p.x ?? 0;
+      positions[i * 3 + 1] = p.y ?? 0;
+      positions[i * 3 + 2] = p.z ?? 0;
+    });
+    textReady = false;
+    columnsReady.clear();
+    pool.broadcast({ type: "points", dataset, count: points.length }, "positions", positions);
+  }
+
+  // Search text is built lazily, once per data version, the first time a filter runs
+  function ensureText() {
+    if (textReady) return;
+    const offsets = new Uint32Array(points.length);
+    const segments = new Array(points.length);
+    let length = 0;
+    points.forEach((p, i) => {
+      offsets[i] = length;
+      segments[i] = pointSearchText(p);
+      length += segments[i].length + 1;
+    });
+    pool.broadcast({ type: "text", dataset, text: segments.join("\u0001") }, "offsets", offsets);
+    textReady = true;
+  }
+
+  function ensureColumn(name) {
+    if (columnsReady.has(name)) return;
+    pool.broadcast({ type: "column", dataset, name, values: points.map(p => p[name] ?? "unknown") });
+    columnsReady.add(name);
+  }
+
+  function cancel(key) {
+    const id = inflight.get(key);
+    if (id === undefined) return;
+    inflight.delete(key);
+    pool.cancel(id);
+  }
+
+  // Run a task under `key`; a newer run with the same key cancels this one,
+  // and a cancelled or superseded run resolves to null.
+  function run(key, task, args = {}) {
+    cancel(key);
+    if (task === "filter") ensureText();
+    if (task === "counts") ensureColumn(args.column);
+    const { id, promise } = pool.submit({ dataset, task, args });
+    inflight.set(key, id);
+    return promise.then(result => {
+      if (inflight.get(key) !== id) return null;
+      inflight.delete(key);
+      return result;
+    }, err => {
+      if (inflight.get(key) !== id) return null;
+      inflight.delete(key);
+      throw err;
+    });
+  }
+
+  function dispose() {
+    for (const key of [...inflight.keys()]) cancel(key);
+    pool.broadcast({ type: "drop", dataset });
+  }
+
+  setPoints(model.get("points") || []);
+  model.on("change:points", () => setPoints(model.get("points") || []));
+
+  return {
+    positions: () => positions,
+    run,
+    cancel,
+    dispose,
+  };
+}
@@ -0,0 +1,147 @@
+// Per-point metadata for the tooltip and properties panel. With lazy_metadata on, the
+// synced points only carry render fields; full rows are requested from the kernel by
+// row index and kept in a small LRU cache. Text filters run in the kernel as well,
+// since the browser does not hold the other fields to match against.
+
+const METADATA_CACHE_SIZE = 512;
+// Rows collected within this window are requested in one message
+const METADATA_BATCH_MS = 16;
+
+export function createMetadataClient(model) {
+  const cache = new Map();
+  const waiting = new Map();
+  const queued = new Set();
+  const sent = new Set();
+  let version = 0;
+  let batchTimer = null;
+  let searchSeq = 0;
+  let pendingSearch = null;
+
+  function lazy() {
+    return !!model.get("lazy_metadata");
+  }
+
+  // Full point at row if known: the synced point when not lazy, otherwise the cached row
+  function get(row) {
+    if (!lazy()) return (model.get("points") || [])[row] || null;
+    const point = cache.get(row);
+    if (point === undefined) return null;
+    // Refresh recency
+    cache.delete(row);
+    cache.set(row, point);
+    return point;
+  }
+
+  function remember(row, point) {
+    cache.delete(row);
+    cache.set(row, point);
+    while (cache.size > METADATA_CACHE_SIZE) cache.delete(cache.keys().next().value);
+  }
+
+  function flush() {
+    batchTimer = null;
+    if (queued.size === 0) return;
+    model.send({ type: "metadata", version, rows: [...queued] });
+    queued.forEach(row => sent.add(row));
+    queued.clear();
+  }
+
+  function request(row) {
+    if (cache.has(row) || queued.has(row) || sent.has(row)) return;
+    queued.add(row);
+    if (batchTimer === null) batchTimer = setTimeout(flush, METADATA_BATCH_MS);
+  }
+
+  // Resolves to the full point at row (null if the row is gone)
+  function fetch(row) {
+    const known = get(row);
+    if (known || !lazy()) return Promise.resolve(known);
+    request(row);
+    if (!waiting.has(row)) waiting.set(row, []);
+    return new Promise(resolve => waiting.get(row).push(resolve));
+  }
+
+  // Warm the cache for rows likely to be shown next
+  function prefetch(rows) {
+    if (!lazy()) return;
+    for (const row of rows) request(row);
+  }
+
+  // Drop the search in flight; it resolves to null
+  function cancelSearch() {
+    pendingSearch?.resolve(null);
+    pendingSearch = null;
+  }
+
+  // Match mask of a lowercase substring filter over every field, computed by the kernel.
+  // Resolves to { mask, matched }, or null when superseded, cancelled or the points changed.
+  function search(filter) {
+    cancelSearch();
+    const id = ++searchSeq;
+    model.send({ type: "filter", version, id, filter });
+    return new Promise(resolve => {
+      pendingSearch = { id, resolve };
+    });
+  }
+
+  function onSearchResult(msg) {
+    if (!pendingSearch || msg.id !== pendingSearch.id) return;
+    const { resolve } = pendingSearch;
+    pendingSearch = null;
+    if (msg.version !== version) {
+      resolve(null);
+      return;
+    }
+    const mask = new Uint8Array((model.get("points") || []).length);
+    for (const row of msg.rows) mask[row] = 1;
+    resolve({ mask, matched: msg.rows.length });
+  }
+
+  function onMessage(msg) {
+    if (msg?.type === "filter") {
+      onSearchResult(msg);
+      return;
+    }
+    if (msg?.type !== "metadata" || msg.version !== version) return;
+    msg.rows.forEach((row, n) => {
+      const point = msg.points[n];
+      sent.delete(row);
+      if (point) remember(row, point);
+      const resolvers = waiting.get(row);
+      if (!resolvers) return;
+      waiting.delete(row);
+      resolvers.forEach(resolve => resolve(point || null));
+    });
+  }
+
+  // Cached rows and pending answers belong to the previous points
+  function reset() {
+    version++;
+    cache.clear();
+    queued.clear();
+    sent.clear();
+    clearTimeout(batchTimer);
+    batchTimer = null;
+    for (const resolvers of waiting.values()) resolvers.forEach(resolve => resolve(null));
+    waiting.clear();
+    cancelSearch();
+  }
+
+  model.on("msg:custom", onMessage);
+  model.on("change:points", reset);
+  model.on("change:lazy_metadata", reset);
+
+  return {
+    get,
+    fetch,
+    prefetch,
+    search,
+    cancelSearch,
+    dispose() {
+      reset();
+      model.off("msg:custom", onMessage);
+      model.off("change:points", reset);
+      model.off("change:lazy_metadata", reset);
+    },
+  };
+}
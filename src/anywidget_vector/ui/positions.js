@@ -0,0 +1,64 @@
+// Quantized position transport. With position_encoding other than "float", points arrive
+// without x/y/z and `_positions` carries them quantized per chunk (layout in widget.py).
+// The positions are written back into the point objects before anything else reads them.
+import { asDataView } from "./selection.js";
+
+const POSITION_HEADER_BYTES = 12;
+
+// Points arrays whose positions were already filled from a given buffer
+const appliedPositions = new WeakMap();
+
+// Quantized buffer -> Float32Array of xyz, or null if the buffer is empty or malformed
+export function decodePositions(data) {
+  if (!data || data.byteLength < POSITION_HEADER_BYTES) return null;
+  const view = asDataView(data);
+  const encoding = view.getUint8(0);
+  const count = view.getUint32(4, true);
+  const chunk = view.getUint32(8, true);
+  const chunks = Math.ceil(count / chunk);
+  const body = POSITION_HEADER_BYTES + chunks * 24;
+  const levels = encoding === 1 ? 65535 : 1023;
+  const size = encoding === 1 ? count * 6 : count * 4;
+  if (!chunk || (encoding !== 1 && encoding !== 2) || view.byteLength < body + size) return null;
+
+  const out = new Float32Array(count * 3);
+  const lo = [0, 0, 0], step = [0, 0, 0];
+  for (let c = 0; c < chunks; c++) {
+    const b = POSITION_HEADER_BYTES + c * 24;
+    for (let a = 0; a < 3; a++) {
+      lo[a] = view.getFloat32(b + a * 4, true);
+      step[a] = (view.getFloat32(b + 12 + a * 4, true) - lo[a]) / levels;
+    }
+    const end = Math.min(count, (c + 1) * chunk);
+    for (let i = c * chunk; i < end; i++) {
+      if (encoding === 1) {
+        const o = body + i * 6;
+        out[i * 3] = lo[0] + view.getUint16(o, true) * step[0];
+        out[i * 3 + 1] = lo[1] + view.getUint16(o + 2, true) * step[1];
+        out[i * 3 + 2] = lo[2] + view.getUint16(o + 4, true) * step[2];
+      } else {
+        const packed = view.getUint32(body + i * 4, true);
+        out[i * 3] = lo[0] + (packed & 1023) * step[0];
+        out[i * 3 + 1] = lo[1] + ((packed >>> 10) & 1023) * step[1];
+        out[i * 3 + 2] = lo[2] + ((packed >>> 20) & 1023) * step[2];
+      }
+    }
+  }
+  return out;
+}
+
+// Fill x/y/z of the model's points from `_positions` when they were sent quantized
+export function applyQuantizedPositions(model) {
+  if ((model.get("position_encoding") || "float") === "float") return;
+  const points = model.get("points") || [];
+  const data = model.get("_positions");
+  if (!data || appliedPositions.get(points) === data) return;
+  const positions = decodePositions(data);
+  if (!positions || positions.length !== points.length * 3) return;
+  points.forEach((p, i) => {
+    p.x = positions[i * 3];
+    p.y = positions[i * 3 + 1];
+    p.z = positions[i * 3 + 2];
+  });
+  appliedPositions.set(points, data);
+}
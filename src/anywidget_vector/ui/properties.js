@@ -1,7 +1,8 @@
 // Properties panel component for VectorSpace widget
 import { ICONS } from "../static/icons.js";
+import { getSelectedRows } from "./selection.js";
 
-export function createPropertiesPanel(model, callbacks) {
+export function createPropertiesPanel(model, callbacks, metadata) {
   const panel = document.createElement("div");
   panel.className = "avs-panel avs-panel-right";
 
@@ -29,20 +30,27 @@ export function createPropertiesPanel(model, callbacks) {
   showEmpty(content);
 
   // Update on selection change
-  model.on("change:selected_points", () => {
-    const selectedIds = model.get("selected_points") || [];
+  model.on("change:_selection", () => {
+    const rows = getSelectedRows(model);
     const points = model.get("points") || [];
-    if (selectedIds.length === 0) {
+    if (rows.length === 0) {
       showEmpty(content);
-    } else if (selectedIds.length === 1) {
-      const point = points.find(p => p.id === selectedIds[0]);
+    } else if (rows.length === 1) {
+      const row = rows[0];
+      const point = metadata.get(row) || points[row];
       if (point) {
         showPointProperties(content, point);
+        if (point === points[row] && model.get("lazy_metadata")) {
+          metadata.fetch(row).then(full => {
+            const current = getSelectedRows(model);
+            if (full && current.length === 1 && current[0] === row) showPointProperties(content, full);
+          });
+        }
       } else {
         showEmpty(content);
       }
     } else {
-      showMultipleSelection(content, selectedIds.length);
+      showMultipleSelection(content, rows.length);
     }
   });
 
@@ -53,10 +61,10 @@ export function createPropertiesPanel(model, callbacks) {
     toggle: () => panel.classList.toggle("avs-open"),
     isOpen: () => panel.classList.contains("avs-open"),
     setHoveredPoint: (point) => {
-      const selectedIds = model.get("selected_points") || [];
-      if (point && selectedIds.length === 0) {
+      const selectedCount = getSelectedRows(model).length;
+      if (point && selectedCount === 0) {
         showPointProperties(content, point, true);
-      } else if (!point && selectedIds.length === 0) {
+      } else if (!point && selectedCount === 0) {
         showEmpty(content);
       }
     },
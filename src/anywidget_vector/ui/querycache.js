@@ -0,0 +1,167 @@
+// Result cache for browser-side backend queries, kept in IndexedDB so it survives
+// re-renders and reloads (in memory where IndexedDB is unavailable). Entries are keyed
+// by backend, a hash of the connection config and the normalized query text, expire
+// after query_cache_ttl seconds and are evicted least recently used beyond
+// query_cache_size. Hits and misses are reported through `_browser_cache_stats`.
+
+const QUERY_CACHE_DB = "anywidget-vector";
+const QUERY_CACHE_STORE = "queries";
+
+// JSON queries compare by content, anything else by text with whitespace collapsed
+export function normalizeQuery(query) {
+  const text = typeof query === "string" ? query.trim() : JSON.stringify(query);
+  try {
+    return stableStringify(JSON.parse(text));
+  } catch {
+    return text.replace(/\s+/g, " ");
+  }
+}
+
+function stableStringify(value) {
+  if (Array.isArray(value)) return `[${value.map(stableStringify).join(",")}]`;
+  if (value && typeof value === "object") {
+    const keys = Object.keys(value).sort();
+    return `{${keys.map(k => `${JSON.stringify(k)}:${stableStringify(value[k])}`).join(",")}}`;
+  }
+  return JSON.stringify(value);
+}
+
+// FNV-1a, so credentials in the config never end up in the key as plain text
+function hashText(text) {
+  let h = 0x811c9dc5;
+  for (let i = 0; i < text.length; i++) {
+    h ^= text.charCodeAt(i);
+    h = Math.imul(h, 0x01000193);
+  }
+  return (h >>> 0).toString(16);
+}
+
+function openStore() {
+  return new Promise((resolve, reject) => {
+    const request = indexedDB.open(QUERY_CACHE_DB, 1);
+    request.onupgradeneeded = () => {
+      const store = request.result.createObjectStore(QUERY_CACHE_STORE, { keyPath: "key" });
+      store.createIndex("used", "used");
+    };
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+function done(request) {
+  return new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+export function createQueryCache(model) {
+  const memory = new Map();
+  let hits = 0, misses = 0;
+  let db = null;
+  try {
+    db = typeof indexedDB === "undefined" ? null : openStore().catch(() => null);
+  } catch {
+    db = null;
+  }
+
+  function ttlMs() {
+    return (model.get("query_cache_ttl") ?? 0) * 1000;
+  }
+
+  function keyFor(backend, config, query) {
+    return `${backend}|${hashText(stableStringify(config || {}))}|${normalizeQuery(query)}`;
+  }
+
+  function report() {
+    const total = hits + misses;
+    model.set("_browser_cache_stats", { hits, misses, hit_rate: total ? hits / total : 0 });
+    model.save_changes();
+  }
+
+  async function store() {
+    return db ? await db : null;
+  }
+
+  async function read(key) {
+    const conn = await store();
+    if (!conn) return memory.get(key);
+    return done(conn.transaction(QUERY_CACHE_STORE).objectStore(QUERY_CACHE_STORE).get(key));
+  }
+
+  async function write(entry) {
+    const conn = await store();
+    if (!conn) {
+      memory.delete(entry.key);
+      memory.set(entry.key, entry);
+      while (memory.size > (model.get("query_cache_size") || 0)) memory.delete(memory.keys().next().value);
+      return;
+    }
+    const objects = conn.transaction(QUERY_CACHE_STORE, "readwrite").objectStore(QUERY_CACHE_STORE);
+    await done(objects.put(entry));
+    const excess = (await done(objects.count())) - (model.get("query_cache_size") || 0);
+    if (excess <= 0) return;
+    // Least recently used first
+    const cursor = objects.index("used").openCursor();
+    let removed = 0;
+    cursor.onsuccess = () => {
+      const c = cursor.result;
+      if (!c || removed >= excess) return;
+      c.delete();
+      removed++;
+      c.continue();
+    };
+  }
+
+  // Cached points for the query, or null (counted as a miss)
+  async function get(key) {
+    if (ttlMs() <= 0) return null;
+    let entry = null;
+    try {
+      entry = await read(key);
+    } catch {
+      entry = null;
+    }
+    const now = Date.now();
+    if (!entry || now - entry.stored > ttlMs()) {
+      misses++;
+      report();
+      return null;
+    }
+    hits++;
+    report();
+    write({ ...entry, used: now }).catch(() => {});
+    return entry.points;
+  }
+
+  async function put(key, points) {
+    if (ttlMs() <= 0) return;
+    const now = Date.now();
+    try {
+      await write({ key, points, stored: now, used: now });
+    } catch {
+      // Over quota or not cloneable: leave uncached
+    }
+  }
+
+  async function clear() {
+    memory.clear();
+    const conn = await store();
+    if (conn) await done(conn.transaction(QUERY_CACHE_STORE, "readwrite").objectStore(QUERY_CACHE_STORE).clear());
+  }
+
+  function onEpoch() {
+    clear().catch(() => {});
+  }
+  model.on("change:_cache_epoch", onEpoch);
+
+  return {
+    keyFor,
+    get,
+    put,
+    clear,
+    dispose() {
+      model.off("change:_cache_epoch", onEpoch);
+    },
+  };
+}
@@ -0,0 +1,135 @@
+// HTTP helper for the browser-side backend clients: abortable requests with a timeout,
+// and JSON bodies parsed as they stream in. Elements of the outermost arrays (result
+// lists) are parsed one at a time with JSON.parse, yielding to the event loop every
+// few milliseconds, so a large response never blocks the page in one long parse.
+
+const JSON_SLICE_MS = 8;
+// Stands in for an outermost array in the skeleton of the document
+const ARRAY_MARK = "\u0000avs-array:";
+
+const OPEN_BRACE = 123, CLOSE_BRACE = 125, OPEN_BRACKET = 91, CLOSE_BRACKET = 93;
+const QUOTE = 34, BACKSLASH = 92, COMMA = 44;
+
+function nextTask() {
+  return new Promise(resolve => setTimeout(resolve, 0));
+}
+
+// Incremental parser state: feed() text chunks in order, then finish()
+function createJsonStream() {
+  const skeleton = [];
+  const arrays = [];
+  let carry = "";
+  let depth = 0, arrayDepth = -1;
+  let inString = false, escaped = false;
+
+  function flushElement(text) {
+    if (text.trim()) arrays[arrays.length - 1].push(JSON.parse(text));
+  }
+
+  function feed(chunk) {
+    const buf = carry + chunk;
+    // Start of the text still needed: the current element, or the current skeleton piece
+    let start = 0;
+    // The carried-over text was already scanned
+    for (let i = carry.length; i < buf.length; i++) {
+      const c = buf.charCodeAt(i);
+      if (inString) {
+        if (escaped) escaped = false;
+        else if (c === BACKSLASH) escaped = true;
+        else if (c === QUOTE) inString = false;
+        continue;
+      }
+      if (c === QUOTE) {
+        inString = true;
+      } else if (c === OPEN_BRACKET || c === OPEN_BRACE) {
+        if (c === OPEN_BRACKET && arrayDepth < 0) {
+          skeleton.push(buf.slice(start, i), JSON.stringify(ARRAY_MARK + arrays.length));
+          arrays.push([]);
+          arrayDepth = depth;
+          start = i + 1;
+        }
+        depth++;
+      } else if (c === CLOSE_BRACKET || c === CLOSE_BRACE) {
+        depth--;
+        if (arrayDepth >= 0 && depth === arrayDepth) {
+          flushElement(buf.slice(start, i));
+          arrayDepth = -1;
+          start = i + 1;
+        }
+      } else if (c === COMMA && arrayDepth >= 0 && depth === arrayDepth + 1) {
+        flushElement(buf.slice(start, i));
+        start = i + 1;
+      }
+    }
+    if (arrayDepth < 0) {
+      skeleton.push(buf.slice(start));
+      carry = "";
+    } else {
+      carry = buf.slice(start);
+    }
+  }
+
+  function fill(value) {
+    if (typeof value === "string" && value.startsWith(ARRAY_MARK)) {
+      return arrays[Number(value.slice(ARRAY_MARK.length))];
+    }
+    if (value && typeof value === "object" && !Array.isArray(value)) {
+      for (const key of Object.keys(value)) value[key] = fill(value[key]);
+    }
+    return value;
+  }
+
+  function finish() {
+    if (arrayDepth >= 0 || depth !== 0) throw new SyntaxError("Unexpected end of JSON input");
+    return fill(JSON.parse(skeleton.join("")));
+  }
+
+  return { feed, finish };
+}
+
+// Parse a response body as JSON while it downloads (see above)
+export async function readJsonStream(resp) {
+  if (!resp.body?.getReader) return resp.json();
+  const reader = resp.body.getReader();
+  const decoder = new TextDecoder();
+  const stream = createJsonStream();
+  let sliceStart = performance.now();
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    stream.feed(decoder.decode(value, { stream: true }));
+    // Chunks of an already buffered body arrive without a task boundary
+    if (performance.now() - sliceStart > JSON_SLICE_MS) {
+      await nextTask();
+      sliceStart = performance.now();
+    }
+  }
+  stream.feed(decoder.decode());
+  return stream.finish();
+}
+
+// fetch() that aborts with `options.signal` or after `options.timeout` ms, throws
+// "<label> error: ..." on HTTP errors, and returns the parsed JSON body
+export async function fetchJson(url, init, options = {}, label = "Request") {
+  const { signal, timeout } = options;
+  const controller = new AbortController();
+  const abort = () => controller.abort(signal.reason);
+  if (signal) {
+    if (signal.aborted) abort();
+    else signal.addEventListener("abort", abort, { once: true });
+  }
+  const timer = timeout > 0
+    ? setTimeout(() => controller.abort(new Error(`${label} request timed out after ${timeout / 1000}s`)), timeout)
+    : null;
+  try {
+    const resp = await fetch(url, { ...init, signal: controller.signal });
+    if (!resp.ok) throw new Error(`${label} error: ${(await resp.text()) || resp.status}`);
+    return await readJsonStream(resp);
+  } catch (err) {
+    // Report why the request was aborted rather than a generic AbortError
+    throw controller.signal.aborted && controller.signal.reason ? controller.signal.reason : err;
+  } finally {
+    clearTimeout(timer);
+    signal?.removeEventListener("abort", abort);
+  }
+}
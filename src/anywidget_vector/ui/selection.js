@@ -0,0 +1,100 @@
+// Compact selection transport. `_selection` holds the selected row indices as a 4-byte
+// header (format byte, then padding) followed by either a bitset (bit i of the payload
+// marks row i) or little-endian uint32 [start, end) row ranges, whichever is smaller.
+// widget.py implements the same format.
+
+const SELECTION_BITSET = 0;
+const SELECTION_RANGES = 1;
+const NO_ROWS = new Uint32Array(0);
+
+// Decoded rows per received buffer, so every panel shares one decode
+const decodedSelections = new WeakMap();
+
+export function asDataView(data) {
+  if (!data) return null;
+  if (data instanceof DataView) return data;
+  if (ArrayBuffer.isView(data)) return new DataView(data.buffer, data.byteOffset, data.byteLength);
+  return new DataView(data);
+}
+
+// Sorted, unique row indices -> DataView in the selection format
+export function encodeSelection(rows) {
+  if (rows.length === 0) return new DataView(new ArrayBuffer(0));
+  let runs = 1;
+  for (let n = 1; n < rows.length; n++) {
+    if (rows[n] !== rows[n - 1] + 1) runs++;
+  }
+  const bitsetBytes = (rows[rows.length - 1] >> 3) + 1;
+  const useRanges = runs * 8 <= bitsetBytes;
+  const view = new DataView(new ArrayBuffer(4 + (useRanges ? runs * 8 : bitsetBytes)));
+  if (useRanges) {
+    view.setUint8(0, SELECTION_RANGES);
+    let offset = 4, start = rows[0];
+    for (let n = 1; n <= rows.length; n++) {
+      if (n < rows.length && rows[n] === rows[n - 1] + 1) continue;
+      view.setUint32(offset, start, true);
+      view.setUint32(offset + 4, rows[n - 1] + 1, true);
+      offset += 8;
+      start = rows[n];
+    }
+  } else {
+    view.setUint8(0, SELECTION_BITSET);
+    const bits = new Uint8Array(view.buffer, 4);
+    for (let n = 0; n < rows.length; n++) bits[rows[n] >> 3] |= 1 << (rows[n] & 7);
+  }
+  return view;
+}
+
+// Selection bytes -> sorted Uint32Array of row indices
+export function decodeSelection(data) {
+  const view = asDataView(data);
+  if (!view || view.byteLength < 4) return NO_ROWS;
+  if (view.getUint8(0) === SELECTION_RANGES) {
+    let total = 0;
+    for (let o = 4; o + 8 <= view.byteLength; o += 8) {
+      total += view.getUint32(o + 4, true) - view.getUint32(o, true);
+    }
+    const rows = new Uint32Array(total);
+    let n = 0;
+    for (let o = 4; o + 8 <= view.byteLength; o += 8) {
+      const end = view.getUint32(o + 4, true);
+      for (let row = view.getUint32(o, true); row < end; row++) rows[n++] = row;
+    }
+    return rows;
+  }
+  const bits = new Uint8Array(view.buffer, view.byteOffset + 4, view.byteLength - 4);
+  let total = 0;
+  for (let i = 0; i < bits.length; i++) {
+    for (let b = bits[i]; b; b &= b - 1) total++;
+  }
+  const rows = new Uint32Array(total);
+  let n = 0;
+  for (let i = 0; i < bits.length; i++) {
+    const byte = bits[i];
+    if (!byte) continue;
+    for (let bit = 0; bit < 8; bit++) {
+      if (byte & (1 << bit)) rows[n++] = (i << 3) + bit;
+    }
+  }
+  return rows;
+}
+
+// Selected row indices of the model, decoded once per received buffer
+export function getSelectedRows(model) {
+  const data = model.get("_selection");
+  if (!data || !data.byteLength) return NO_ROWS;
+  let rows = decodedSelections.get(data);
+  if (!rows) {
+    rows = decodeSelection(data);
+    decodedSelections.set(data, rows);
+  }
+  return rows;
+}
+
+// Set the model's selection from row indices in any order (not saved)
+export function setSelectedRows(model, rows) {
+  const sorted = Uint32Array.from(new Set(rows)).sort();
+  const view = encodeSelection(sorted);
+  decodedSelections.set(view, sorted);
+  model.set("_selection", view);
+}
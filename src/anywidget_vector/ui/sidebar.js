@@ -2,8 +2,9 @@
  * Left sidebar: Collections browser + Dimension/Cluster Explorer.
  */
 import { ICONS } from "../static/icons.js";
+import { getSelectedRows, setSelectedRows } from "./selection.js";
 
-export function createSidebar(model, callbacks) {
+export function createSidebar(model, callbacks, compute) {
   const panel = document.createElement("div");
   panel.className = "avs-panel avs-panel-left";
 
@@ -94,9 +95,8 @@ export function createSidebar(model, callbacks) {
       return;
     }
 
-    const sample = points[0];
-    const vec = sample.vector || [];
-    const dims = vec.length || 3;
+    // Vectors stay in the kernel; only their width is synced
+    const dims = model.get("_vector_dims") || points[0].vector?.length || 3;
 
     addStatRow(dimContent, "Points", points.length.toLocaleString());
     addStatRow(dimContent, "Dimensions", dims > 3 ? dims + "D → 3D" : "3D");
@@ -107,13 +107,12 @@ export function createSidebar(model, callbacks) {
     addStatRow(dimContent, "Y axis", axisLabels.y || "Y");
     addStatRow(dimContent, "Z axis", axisLabels.z || "Z");
 
-    // Compute basic stats
-    const xs = points.map((p) => p.x ?? 0);
-    const ys = points.map((p) => p.y ?? 0);
-    const zs = points.map((p) => p.z ?? 0);
-    addStatRow(dimContent, "X range", rangeStr(xs));
-    addStatRow(dimContent, "Y range", rangeStr(ys));
-    addStatRow(dimContent, "Z range", rangeStr(zs));
+    // Ranges are computed off-thread; rows show a placeholder until then
+    const rangeCells = ["X range", "Y range", "Z range"].map((key) => addStatRow(dimContent, key, "…"));
+    compute.run("extent", "extent").then((extent) => {
+      if (!extent) return;
+      rangeCells.forEach((cell, a) => { cell.textContent = rangeStr(extent.min[a], extent.max[a], extent.count); });
+    }).catch((err) => console.error("Extent failed:", err));
 
     // Visual mapping dimensions
     const colorField = model.get("color_field");
@@ -132,23 +131,19 @@ export function createSidebar(model, callbacks) {
     }
   }
 
-  function updateClusters() {
+  async function updateClusters() {
     clusterContent.innerHTML = "";
     const colorField = model.get("color_field");
 
     if (!colorField) {
+      compute.cancel("clusters");
       clusterContent.innerHTML = '<div class="avs-note">Set color_field to see clusters</div>';
       return;
     }
 
-    const points = model.get("points") || [];
-    const groups = {};
-    points.forEach((p) => {
-      const val = p[colorField] ?? "unknown";
-      groups[val] = (groups[val] || 0) + 1;
-    });
-
-    const sorted = Object.entries(groups).sort((a, b) => b[1] - a[1]);
+    const sorted = await compute.run("clusters", "counts", { column: colorField });
+    if (!sorted) return;
+    clusterContent.innerHTML = "";
     if (sorted.length === 0) {
       clusterContent.innerHTML = '<div class="avs-note">No clusters found</div>';
       return;
@@ -163,11 +158,12 @@ export function createSidebar(model, callbacks) {
 
       row.addEventListener("click", () => {
         // Filter/highlight cluster
-        const ids = points
-          .filter((p) => String(p[colorField] ?? "unknown") === String(key))
-          .map((p) => p.id)
-          .filter(Boolean);
-        model.set("selected_points", ids);
+        const points = model.get("points") || [];
+        const rows = [];
+        points.forEach((p, i) => {
+          if (String(p[colorField] ?? "unknown") === String(key)) rows.push(i);
+        });
+        setSelectedRows(model, rows);
         model.save_changes();
       });
 
@@ -207,9 +203,10 @@ export function createSidebar(model, callbacks) {
   metricSelect.addEventListener("change", () => {
     model.set("distance_metric", metricSelect.value);
     // Auto-enable connections when a point is selected
-    const selected = model.get("selected_points") || [];
-    if (selected.length === 1) {
-      model.set("reference_point", selected[0]);
+    const selected = getSelectedRows(model);
+    const ref = selected.length === 1 ? (model.get("points") || [])[selected[0]] : null;
+    if (ref) {
+      model.set("reference_point", ref.id || `point_${selected[0]}`);
       if (!model.get("show_connections") || model.get("k_neighbors") === 0) {
         model.set("k_neighbors", 5);
         model.set("show_connections", true);
@@ -252,34 +249,24 @@ export function createSidebar(model, callbacks) {
   distSection.appendChild(distContent);
   inner.appendChild(distSection);
 
-  function updateDistanceInfo() {
-    const selected = model.get("selected_points") || [];
+  async function updateDistanceInfo() {
+    const selected = getSelectedRows(model);
     if (selected.length === 0) {
+      compute.cancel("distanceInfo");
       distInfo.textContent = "Select a point to see distances";
       return;
     }
     const points = model.get("points") || [];
-    const ref = points.find(p => p.id === selected[0]);
+    const refIdx = selected[0];
+    const ref = points[refIdx];
     if (!ref) return;
 
-    const metric = metricSelect.value;
-    const others = points.filter(p => p.id !== ref.id);
-
-    function dist(a, b) {
-      const dx = (a.x ?? 0) - (b.x ?? 0), dy = (a.y ?? 0) - (b.y ?? 0), dz = (a.z ?? 0) - (b.z ?? 0);
-      if (metric === "manhattan") return Math.abs(dx) + Math.abs(dy) + Math.abs(dz);
-      if (metric === "cosine") {
-        const dot = (a.x??0)*(b.x??0) + (a.y??0)*(b.y??0) + (a.z??0)*(b.z??0);
-        const ma = Math.sqrt((a.x??0)**2 + (a.y??0)**2 + (a.z??0)**2);
-        const mb = Math.sqrt((b.x??0)**2 + (b.y??0)**2 + (b.z??0)**2);
-        return (ma === 0 || mb === 0) ? 1 : 1 - dot / (ma * mb);
-      }
-      if (metric === "dot_product") return -((a.x??0)*(b.x??0) + (a.y??0)*(b.y??0) + (a.z??0)*(b.z??0));
-      return Math.sqrt(dx*dx + dy*dy + dz*dz);
-    }
-
-    const sorted = others.map(p => ({ id: p.id, label: p.label || p.id, d: dist(ref, p) }))
-      .sort((a, b) => a.d - b.d).slice(0, 5);
+    const result = await compute.run("distanceInfo", "neighbors", { ref: refIdx, k: 5, metric: metricSelect.value });
+    if (!result) return;
+    const sorted = Array.from(result.indices, (idx, n) => {
+      const p = points[idx];
+      return { id: p.id, label: p.label || p.id, d: result.distances[n] };
+    });
 
     distInfo.innerHTML = "<strong>" + escapeHtml(ref.label || ref.id) + "</strong><br>" +
       sorted.map(n => '<span class="avs-property-key">' + escapeHtml(n.label) +
@@ -291,10 +278,11 @@ export function createSidebar(model, callbacks) {
     updateDimensions();
     updateClusters();
   });
+  model.on("change:_vector_dims", updateDimensions);
   model.on("change:color_field", updateClusters);
   model.on("change:backend_config", updateCollections);
   model.on("change:backend", updateCollections);
-  model.on("change:selected_points", updateDistanceInfo);
+  model.on("change:_selection", updateDistanceInfo);
   model.on("change:distance_metric", () => {
     metricSelect.value = model.get("distance_metric") || "euclidean";
     updateDistanceInfo();
@@ -323,12 +311,11 @@ function addStatRow(container, key, value) {
     '<span class="avs-property-key">' + key + "</span>" +
     '<span class="avs-property-value">' + value + "</span>";
   container.appendChild(row);
+  return row.lastChild;
 }
 
-function rangeStr(values) {
-  if (values.length === 0) return "—";
-  const min = Math.min(...values);
-  const max = Math.max(...values);
+function rangeStr(min, max, count) {
+  if (count === 0) return "—";
   return min.toFixed(2) + " … " + max.toFixed(2);
 }
 
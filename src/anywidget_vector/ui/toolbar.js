@@ -58,6 +58,15 @@ export function createToolbar(model, callbacks) {
   runBtn.addEventListener("click", () => callbacks.onRunQuery?.());
   toolbar.appendChild(runBtn);
 
+  // Cancel button, shown while a query runs
+  const cancelBtn = document.createElement("button");
+  cancelBtn.className = "avs-btn";
+  cancelBtn.innerHTML = ICONS.close;
+  cancelBtn.title = "Cancel Query";
+  cancelBtn.style.display = "none";
+  cancelBtn.addEventListener("click", () => callbacks.onCancelQuery?.());
+  toolbar.appendChild(cancelBtn);
+
   // Settings button with status dot (mutual exclusion with properties)
   const settingsBtn = document.createElement("button");
   settingsBtn.className = "avs-btn avs-settings-btn";
@@ -82,6 +91,10 @@ export function createToolbar(model, callbacks) {
   model.on("change:connection_status", () => {
     updateStatusDot(statusDot, model.get("connection_status"));
   });
+  model.on("change:query_latency", () => {
+    const ms = model.get("query_latency");
+    runBtn.title = ms == null ? "Run Query" : `Run Query (last: ${Math.round(ms)} ms)`;
+  });
 
   return {
     element: toolbar,
@@ -91,10 +104,23 @@ export function createToolbar(model, callbacks) {
         runBtn.innerHTML = ICONS.loader;
         runBtn.classList.add("avs-loading");
         runBtn.disabled = true;
+        cancelBtn.style.display = "";
       } else {
         runBtn.innerHTML = ICONS.play;
         runBtn.classList.remove("avs-loading");
         runBtn.disabled = false;
+        cancelBtn.style.display = "none";
+      }
+    },
+    // Progress of a time-sliced point build in [0, 1], or null once it is done
+    setBuildProgress: (fraction) => {
+      if (fraction == null) {
+        countBadge.classList.remove("avs-building");
+        updatePointCount();
+      } else {
+        const total = (model.get("points") || []).length;
+        countBadge.classList.add("avs-building");
+        countBadge.textContent = `Loading ${Math.round(fraction * 100)}% of ${total} points`;
       }
     },
     setFilterCount: (matched, total) => {
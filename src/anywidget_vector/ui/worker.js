@@ -0,0 +1,192 @@
+// Compute worker: filter matching, neighbour search and sidebar stats.
+// get_esm() bundles this file twice: as the source of the Blob-URL workers, and
+// inline as the fallback used when workers can't be created (e.g. a strict CSP).
+
+// Work longer than this between yields delays cancellation messages
+const COMPUTE_YIELD_MS = 25;
+
+// Distance metrics over a flat xyz position array
+const DISTANCE_METRICS = {
+  euclidean: (p, i, j) => {
+    const dx = p[i] - p[j], dy = p[i + 1] - p[j + 1], dz = p[i + 2] - p[j + 2];
+    return Math.sqrt(dx*dx + dy*dy + dz*dz);
+  },
+  cosine: (p, i, j) => {
+    const dot = p[i]*p[j] + p[i + 1]*p[j + 1] + p[i + 2]*p[j + 2];
+    const magA = Math.sqrt(p[i]*p[i] + p[i + 1]*p[i + 1] + p[i + 2]*p[i + 2]);
+    const magB = Math.sqrt(p[j]*p[j] + p[j + 1]*p[j + 1] + p[j + 2]*p[j + 2]);
+    if (magA === 0 || magB === 0) return 1;
+    return 1 - (dot / (magA * magB));
+  },
+  manhattan: (p, i, j) => Math.abs(p[i] - p[j]) + Math.abs(p[i + 1] - p[j + 1]) + Math.abs(p[i + 2] - p[j + 2]),
+  dot_product: (p, i, j) => -(p[i]*p[j] + p[i + 1]*p[j + 1] + p[i + 2]*p[j + 2]),
+};
+
+const computeDatasets = new Map();
+// Tasks in flight: id -> cancelled. Cancels for finished tasks are ignored, so the map
+// only ever holds running tasks.
+const computeInflight = new Map();
+
+class ComputeCancelled extends Error {}
+
+// Returns a checkpoint() that yields to the event loop every COMPUTE_YIELD_MS so
+// that "cancel" messages get a chance to arrive, then throws if this task was cancelled.
+function createCheckpoint(id) {
+  let last = performance.now();
+  return async () => {
+    if (performance.now() - last < COMPUTE_YIELD_MS) return;
+    await new Promise(resolve => setTimeout(resolve, 0));
+    last = performance.now();
+    if (computeInflight.get(id)) throw new ComputeCancelled();
+  };
+}
+
+// Insert (index, dist) into the ascending top-k arrays, keeping at most k entries
+function insertTopK(indices, dists, size, k, index, dist) {
+  if (size === k && dist >= dists[k - 1]) return size;
+  let pos = size < k ? size++ : k - 1;
+  while (pos > 0 && dists[pos - 1] > dist) {
+    dists[pos] = dists[pos - 1];
+    indices[pos] = indices[pos - 1];
+    pos--;
+  }
+  dists[pos] = dist;
+  indices[pos] = index;
+  return size;
+}
+
+const COMPUTE_TASKS = {
+  // Per-point match mask for a lowercase substring filter over the search text
+  async filter(data, { filter }, checkpoint) {
+    const { text, offsets, count } = data;
+    const mask = new Uint8Array(count);
+    let matched = 0;
+    let pos = text.indexOf(filter);
+    while (pos !== -1) {
+      // Binary search for the point whose text span contains pos
+      let lo = 0, hi = count - 1;
+      while (lo < hi) {
+        const mid = (lo + hi + 1) >> 1;
+        if (offsets[mid] <= pos) lo = mid; else hi = mid - 1;
+      }
+      mask[lo] = 1;
+      matched++;
+      pos = lo + 1 < count ? text.indexOf(filter, offsets[lo + 1]) : -1;
+      await checkpoint();
+    }
+    return { result: { mask, matched }, transfer: [mask.buffer] };
+  },
+
+  // Points nearest to `ref`: the k closest, or all within `threshold`, ascending
+  async neighbors(data, { ref, k, threshold, metric }, checkpoint) {
+    const { positions, count } = data;
+    const fn = DISTANCE_METRICS[metric] || DISTANCE_METRICS.euclidean;
+    const r = ref * 3;
+    let indices, dists, size = 0;
+    if (threshold != null) {
+      const all = [];
+      for (let j = 0; j < count; j++) {
+        if (j === ref) continue;
+        const d = fn(positions, r, j * 3);
+        if (d <= threshold) all.push([j, d]);
+        if ((j & 0xffff) === 0) await checkpoint();
+      }
+      all.sort((a, b) => a[1] - b[1]);
+      indices = Uint32Array.from(all, a => a[0]);
+      dists = Float32Array.from(all, a => a[1]);
+      size = all.length;
+    } else {
+      indices = new Uint32Array(k);
+      dists = new Float64Array(k);
+      for (let j = 0; j < count; j++) {
+        if (j === ref) continue;
+        size = insertTopK(indices, dists, size, k, j, fn(positions, r, j * 3));
+        if ((j & 0xffff) === 0) await checkpoint();
+      }
+      indices = indices.slice(0, size);
+      dists = Float32Array.from(dists.subarray(0, size));
+    }
+    return { result: { indices, distances: dists }, transfer: [indices.buffer, dists.buffer] };
+  },
+
+  // Undirected kNN graph as flat [i, j, i, j, ...] pairs with i < j
+  async knn(data, { k, metric }, checkpoint) {
+    const { positions, count } = data;
+    const fn = DISTANCE_METRICS[metric] || DISTANCE_METRICS.euclidean;
+    const indices = new Uint32Array(k);
+    const dists = new Float64Array(k);
+    const edges = [];
+    for (let i = 0; i < count; i++) {
+      let size = 0;
+      for (let j = 0; j < count; j++) {
+        if (j !== i) size = insertTopK(indices, dists, size, k, j, fn(positions, i * 3, j * 3));
+      }
+      for (let n = 0; n < size; n++) {
+        if (i < indices[n]) edges.push(i, indices[n]);
+      }
+      await checkpoint();
+    }
+    const pairs = Uint32Array.from(edges);
+    return { result: pairs, transfer: [pairs.buffer] };
+  },
+
+  // Per-axis min/max of the positions
+  async extent(data) {
+    const { positions, count } = data;
+    const min = [Infinity, Infinity, Infinity];
+    const max = [-Infinity, -Infinity, -Infinity];
+    for (let i = 0; i < count * 3; i += 3) {
+      for (let a = 0; a < 3; a++) {
+        const v = positions[i + a];
+        if (v < min[a]) min[a] = v;
+        if (v > max[a]) max[a] = v;
+      }
+    }
+    return { result: { min, max, count } };
+  },
+
+  // Value counts of an uploaded column, most frequent first
+  async counts(data, { column }) {
+    const values = data.columns[column] || [];
+    const groups = new Map();
+    for (const v of values) {
+      const key = String(v);
+      groups.set(key, (groups.get(key) || 0) + 1);
+    }
+    return { result: [...groups.entries()].sort((a, b) => b[1] - a[1]) };
+  },
+};
+
+async function handleComputeMessage(msg, reply) {
+  if (msg.type === "points") {
+    computeDatasets.set(msg.dataset, { positions: msg.positions, count: msg.count, columns: {} });
+  } else if (msg.type === "text") {
+    const data = computeDatasets.get(msg.dataset);
+    if (data) { data.text = msg.text; data.offsets = msg.offsets; }
+  } else if (msg.type === "column") {
+    const data = computeDatasets.get(msg.dataset);
+    if (data) data.columns[msg.name] = msg.values;
+  } else if (msg.type === "drop") {
+    computeDatasets.delete(msg.dataset);
+  } else if (msg.type === "cancel") {
+    if (computeInflight.has(msg.id)) computeInflight.set(msg.id, true);
+  } else if (msg.type === "run") {
+    const { id } = msg;
+    computeInflight.set(id, false);
+    try {
+      const data = computeDatasets.get(msg.dataset);
+      if (!data) throw new Error(`Unknown compute dataset ${msg.dataset}`);
+      const { result, transfer } = await COMPUTE_TASKS[msg.task](data, msg.args || {}, createCheckpoint(id));
+      reply({ id, result }, transfer);
+    } catch (err) {
+      if (err instanceof ComputeCancelled) reply({ id, cancelled: true });
+      else reply({ id, error: String(err?.message || err) });
+    } finally {
+      computeInflight.delete(id);
+    }
+  }
+}
+
+if (typeof WorkerGlobalScope !== "undefined" && self instanceof WorkerGlobalScope) {
+  self.onmessage = (e) => handleComputeMessage(e.data, (data, transfer) => self.postMessage(data, transfer || []));
+}
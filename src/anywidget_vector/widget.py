@@ -4,12 +4,19 @@ from __future__ import annotations
 
 import json
 import math
+import struct
+import threading
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
 
 import anywidget
 import traitlets
+from ipywidgets.widgets.trait_types import bytes_serialization
 
 from anywidget_vector.backends import is_python_backend
+from anywidget_vector.backends.cache import QueryCache, query_key
 from anywidget_vector.backends.chroma.client import execute_query as chroma_query
 from anywidget_vector.backends.grafeo.client import execute_query as grafeo_query
 from anywidget_vector.backends.lancedb.client import execute_query as lancedb_query
@@ -31,7 +38,9 @@ class VectorSpace(anywidget.AnyWidget):
     _css = get_css()
 
     # === Data ===
-    points = traitlets.List(trait=traitlets.Dict()).tag(sync=True)
+    points = traitlets.List(trait=traitlets.Dict()).tag(
+        sync=True, to_json=lambda points, widget: widget._points_to_json(points)
+    )
 
     # === Display ===
     # width=0 means "auto" (fill container). height=0 means "match width" (1:1 ratio).
@@ -66,9 +75,15 @@ class VectorSpace(anywidget.AnyWidget):
     camera_target = traitlets.List(default_value=[0, 0, 0]).tag(sync=True)
 
     # === Interaction ===
-    selected_points = traitlets.List(default_value=[]).tag(sync=True)
+    # Ids of the selected points; the browser only sees the row-encoded _selection
+    selected_points = traitlets.List(default_value=[])
+    _selection = traitlets.Bytes(default_value=b"").tag(sync=True, **bytes_serialization)
     _selection_version = traitlets.Int(default_value=0).tag(sync=True)
     hovered_point = traitlets.Dict(default_value=None, allow_none=True).tag(sync=True)
+    # Minimum milliseconds between hover syncs, and quiet period before a selection syncs
+    event_throttle = traitlets.Int(default_value=100).tag(sync=True)
+    _hover_sync = traitlets.Bool(default_value=False).tag(sync=True)
+    _hover_ack = traitlets.Int(default_value=0).tag(sync=True)
     selection_mode = traitlets.CaselessStrEnum(values=["click", "multi", "box", "lasso"], default_value="click").tag(
         sync=True
     )
@@ -80,6 +95,25 @@ class VectorSpace(anywidget.AnyWidget):
     # === Performance ===
     use_instancing = traitlets.Bool(default_value=True).tag(sync=True)
     point_budget = traitlets.Int(default_value=100000).tag(sync=True)
+    # Milliseconds to animate points to a new layout (0 to snap)
+    transition_duration = traitlets.Int(default_value=600).tag(sync=True)
+    # Sync only the columns needed to draw points; other metadata is fetched per row on demand
+    lazy_metadata = traitlets.Bool(default_value=False).tag(sync=True)
+    # "uint16" (6 bytes/point) or "packed10" (4 bytes/point) send positions quantized per chunk
+    position_encoding = traitlets.CaselessStrEnum(values=["float", "uint16", "packed10"], default_value="float").tag(
+        sync=True
+    )
+    _positions = traitlets.Bytes(default_value=b"").tag(sync=True)
+
+    # Width of the kernel-side vectors, shown in the explorer (the vectors themselves are not synced)
+    _vector_dims = traitlets.Int(default_value=0).tag(sync=True)
+
+    # === Frames (timeline playback) ===
+    _frames = traitlets.Bytes(default_value=b"").tag(sync=True)
+    frame_count = traitlets.Int(default_value=0).tag(sync=True)
+    frame_labels = traitlets.List(default_value=[]).tag(sync=True)
+    frame = traitlets.Float(default_value=0.0).tag(sync=True)
+    frame_rate = traitlets.Float(default_value=4.0).tag(sync=True)
 
     # === Distance and Connections ===
     distance_metric = traitlets.Unicode(default_value="euclidean").tag(sync=True)
@@ -108,16 +142,106 @@ class VectorSpace(anywidget.AnyWidget):
     query_input = traitlets.Unicode(default_value="").tag(sync=True)
     query_error = traitlets.Unicode(default_value=None, allow_none=True).tag(sync=True)
     _execute_query = traitlets.Int(default_value=0).tag(sync=True)
+    # Request id of the Python-side query in flight (0 when idle); the browser cancels by echoing it
+    _active_query = traitlets.Int(default_value=0).tag(sync=True)
+    _cancel_query = traitlets.Int(default_value=0).tag(sync=True)
+    query_latency = traitlets.Float(default_value=None, allow_none=True).tag(sync=True)  # Last query, in ms
+    # Seconds before a browser-side backend request is aborted (0 for no limit)
+    query_timeout = traitlets.Float(default_value=30.0).tag(sync=True)
+    # Query results are reused for this many seconds (0, the default, disables), in the kernel and in IndexedDB
+    query_cache_ttl = traitlets.Float(default_value=0.0).tag(sync=True)
+    query_cache_size = traitlets.Int(default_value=128).tag(sync=True)
+    _cache_epoch = traitlets.Int(default_value=0).tag(sync=True)
+    _browser_cache_stats = traitlets.Dict(default_value={}).tag(sync=True)
 
     # === Demo Mode (auto-populate WASM and run query) ===
     _demo_mode = traitlets.Bool(default_value=False).tag(sync=True)
     _demo_data = traitlets.Unicode(default_value="").tag(sync=True)
 
     def __init__(self, points: list[dict[str, Any]] | None = None, **kwargs: Any) -> None:
+        self._vectors: Any = None  # High-dim vectors for projection (numpy array, not synced to JS)
+        self._position_error = 0.0
         super().__init__(points=points or [], **kwargs)
         self._backend_client: Any = None
-        self._vectors: Any = None  # High-dim vectors for projection (numpy array, not synced to JS)
+        self._query_executor: ThreadPoolExecutor | None = None
+        self._query_future: Future[Any] | None = None
+        self._query_seq = 0
+        self._query_lock = threading.Lock()
+        self._query_cache = QueryCache(max_entries=self.query_cache_size, ttl=self.query_cache_ttl)
+        self.observe(self._on_query_cache_settings, names=["query_cache_ttl", "query_cache_size"])
         self.observe(self._on_execute_query, names=["_execute_query"])
+        self.observe(self._on_cancel_query, names=["_cancel_query"])
+        self._hover_callbacks: list[Any] = []
+        self.observe(self._on_hovered_point, names=["hovered_point"])
+        self._id_rows: dict[Any, int] | None = None
+        self._syncing_selection = False
+        self.observe(self._on_selected_points, names=["selected_points"])
+        self.observe(self._on_selection_bytes, names=["_selection"])
+        self.observe(self._on_points_selection, names=["points"])
+        if self.selected_points:
+            self._on_selected_points({"new": self.selected_points})
+        self.on_msg(self._on_custom_msg)
+        self.observe(self._resend_points, names=["lazy_metadata", "color_field", "size_field", "shape_field"])
+        self.observe(self._on_position_encoding, names=["position_encoding"])
+
+    # === Lazy Metadata ===
+
+    def _render_fields(self) -> set[str]:
+        """Point keys the canvas needs to draw, sync and filter by in lazy_metadata mode."""
+        fields = {"id", "x", "y", "z", "label", "color", "size", "shape"}
+        fields.update(f for f in (self.color_field, self.size_field, self.shape_field) if f)
+        return fields
+
+    def _points_to_json(self, points: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Serialize points for the browser, keeping only render fields in lazy_metadata mode."""
+        quantized = self.position_encoding != "float"
+        if self.lazy_metadata:
+            fields = self._render_fields() - ({"x", "y", "z"} if quantized else set())
+            return [{k: v for k, v in p.items() if k in fields} for p in points]
+        if quantized or any("vector" in p for p in points):
+            drop = {"vector", "x", "y", "z"} if quantized else {"vector"}
+            return [{k: v for k, v in p.items() if k not in drop} for p in points]
+        return points
+
+    def _resend_points(self, change: dict[str, Any]) -> None:
+        """Re-sync points when the set of lazily omitted fields changes."""
+        if self.lazy_metadata or change["name"] == "lazy_metadata":
+            self.send_state("points")
+
+    # === Quantized Positions ===
+
+    @property
+    def position_error(self) -> float:
+        """Largest per-axis error of the quantized positions, in data units (0 when sent as floats)."""
+        return self._position_error if self.position_encoding != "float" else 0.0
+
+    def _encode_positions(self, points: list[dict[str, Any]]) -> None:
+        """Quantize point positions into the binary _positions buffer."""
+        self._positions, self._position_error = _quantize_positions(points, self.position_encoding)
+
+    def _on_position_encoding(self, change: dict[str, Any]) -> None:
+        """Switch between float positions in points and the quantized buffer."""
+        with self.hold_sync():
+            if change["new"] == "float":
+                self._positions = b""
+            else:
+                self._encode_positions(self.points)
+            self.send_state("points")
+
+    def _on_custom_msg(self, widget: Any, content: dict[str, Any], buffers: list[Any]) -> None:
+        """Answer the browser's per-row metadata requests and, in lazy_metadata mode, text filters."""
+        if not isinstance(content, dict):
+            return
+        if content.get("type") == "filter":
+            rows = _search_rows(self.points, str(content.get("filter", "")))
+            self.send({"type": "filter", "version": content.get("version"), "id": content.get("id"), "rows": rows})
+            return
+        if content.get("type") != "metadata":
+            return
+        n = len(self.points)
+        rows = [r for r in content.get("rows", []) if isinstance(r, int)]
+        points = [{k: v for k, v in self.points[r].items() if k != "vector"} if 0 <= r < n else None for r in rows]
+        self.send({"type": "metadata", "version": content.get("version"), "rows": rows, "points": points})
 
     # === Backend Configuration ===
 
@@ -129,48 +253,150 @@ class VectorSpace(anywidget.AnyWidget):
             client: Client object for Python-side backends
             **config: Connection config (url, apiKey, collection, etc.)
 
+        Clears the kernel-side query result cache.
+
         Returns:
             Self for chaining
         """
         self.backend = backend
         self._backend_client = client
         self.backend_config = config
+        # Kernel-side results belong to the previous client (browser-side keys include the config)
+        self._query_cache.clear()
         self.show_toolbar = True
         self.show_settings = True
         return self
 
     def _on_execute_query(self, change: dict[str, Any]) -> None:
-        """Handle query execution for Python-side backends."""
+        """Dispatch a Python-side query to the background executor.
+
+        Each query gets the next request id; a newer query supersedes (and, if it
+        has not started yet, cancels) the previous one.
+        """
         if change["new"] == 0 or not is_python_backend(self.backend):
             return
-        try:
+        if self._query_executor is None:
+            self._query_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="anywidget-vector-query")
+        # The backend as configured now, not when the worker gets to the query
+        target = (self.backend, self._backend_client, dict(self.backend_config))
+        with self._query_lock:
+            self._query_seq += 1
+            request_id = self._query_seq
+            if self._query_future is not None:
+                self._query_future.cancel()
+            self._active_query = request_id
             self.connection_status = "connecting"
-            results = self._execute_python_query()
-            if results:
-                self.points = results
-                self.connection_status = "connected"
-        except Exception as e:
-            self.query_error = str(e)
-            self.connection_status = "error"
-
-    def _execute_python_query(self) -> list[dict[str, Any]]:
-        """Execute query using Python-side backend."""
-        if not self._backend_client:
+            self._query_future = self._query_executor.submit(
+                self._run_python_query, request_id, self.query_input, *target
+            )
+
+    def _run_python_query(self, request_id: int, query: str, backend: str, client: Any, config: dict[str, Any]) -> None:
+        """Run a query in the background and apply its result unless it was superseded or cancelled."""
+        start = time.perf_counter()
+        key = query_key(backend, config, query)
+        results, error = self._query_cache.get(key), None
+        if results is None:
+            try:
+                results = self._execute_python_query(query, backend, client)
+                self._query_cache.put(key, results)
+            except Exception as e:
+                error = e
+        with self._query_lock:
+            if request_id != self._active_query:
+                return
+            with self.hold_sync():
+                self.query_latency = (time.perf_counter() - start) * 1000
+                if error is not None:
+                    self.query_error = str(error)
+                    self.connection_status = "error"
+                else:
+                    if results:
+                        self.points = results
+                    self.query_error = None
+                    self.connection_status = "connected"
+                self._active_query = 0
+
+    def _on_query_cache_settings(self, change: dict[str, Any]) -> None:
+        """Apply query_cache_ttl / query_cache_size to the kernel-side cache."""
+        self._query_cache.ttl = self.query_cache_ttl
+        self._query_cache.max_entries = self.query_cache_size
+
+    @property
+    def query_cache_stats(self) -> dict[str, Any]:
+        """Hits, misses and hit rate of the kernel-side and browser-side query caches."""
+        return {"kernel": self._query_cache.stats(), "browser": dict(self._browser_cache_stats)}
+
+    def clear_query_cache(self) -> None:
+        """Drop cached query results in the kernel and in the browser's IndexedDB."""
+        self._query_cache.clear()
+        self._cache_epoch += 1
+
+    def _on_cancel_query(self, change: dict[str, Any]) -> None:
+        """Cancel the query in flight when the browser asks for it by request id."""
+        if change["new"] and change["new"] == self._active_query:
+            self.cancel_query()
+
+    def cancel_query(self) -> None:
+        """Cancel the Python-side query in flight.
+
+        A query that has not started is dropped; one already running in the
+        backend finishes in the background and its result is discarded.
+        """
+        with self._query_lock:
+            if not self._active_query:
+                return
+            if self._query_future is not None:
+                self._query_future.cancel()
+            self._active_query = 0
+        self.connection_status = "connected"
+
+    def _execute_python_query(
+        self, query: str | None = None, backend: str | None = None, client: Any = None
+    ) -> list[dict[str, Any]]:
+        """Execute query (default: ``query_input``) using a Python-side backend (default: the configured one)."""
+        if backend is None:
+            backend, client = self.backend, self._backend_client
+        if not client:
             raise ValueError("Backend not configured. Call set_backend() first.")
 
-        query = self.query_input
+        if query is None:
+            query = self.query_input
 
-        if self.backend == "chroma":
-            return chroma_query(self._backend_client, query)
-        elif self.backend == "lancedb":
-            return lancedb_query(self._backend_client, query)
-        elif self.backend == "grafeo":
-            return grafeo_query(self._backend_client, query)
+        if backend == "chroma":
+            return chroma_query(client, query)
+        elif backend == "lancedb":
+            return lancedb_query(client, query)
+        elif backend == "grafeo":
+            return grafeo_query(client, query)
 
-        raise ValueError(f"Unknown Python backend: {self.backend}")
+        raise ValueError(f"Unknown Python backend: {backend}")
 
     # === Event Decorators ===
 
+    def _on_hovered_point(self, change: dict[str, Any]) -> None:
+        """Run the hover callbacks, then acknowledge the event so the browser sends the newest pending one.
+
+        The browser keeps at most one hover in flight and replaces any it could not
+        send yet, so a slow callback sees the latest hover rather than a backlog.
+        """
+        try:
+            point = change["new"]
+            for callback in list(self._hover_callbacks):
+                if point:
+                    callback(point.get("id"), self._hovered_point_data(point))
+                else:
+                    callback(None, None)
+        finally:
+            self._hover_ack += 1
+
+    def _hovered_point_data(self, hovered: dict[str, Any]) -> dict[str, Any]:
+        """Resolve a compact {id, index} hover payload to the full point dict."""
+        index = hovered.get("index")
+        pid = hovered.get("id")
+        if isinstance(index, int) and 0 <= index < len(self.points) and self.points[index].get("id", pid) == pid:
+            return self.points[index]
+        return next((p for p in self.points if p.get("id") == pid), hovered)
+
     def on_click(self, callback: Any) -> Any:
         """Register a click handler.
 
@@ -191,16 +417,12 @@ class VectorSpace(anywidget.AnyWidget):
         """Register a hover handler.
 
         The callback receives (point_id, point_data) on hover, or (None, None) on leave.
+        Hover events are only sent from the browser while a handler is registered, at most
+        one per ``event_throttle`` milliseconds; hovers superseded while a callback runs are dropped.
         """
 
-        def _handler(change: dict[str, Any]) -> None:
-            point = change["new"]
-            if point:
-                callback(point.get("id"), point)
-            else:
-                callback(None, None)
-
-        self.observe(_handler, names=["hovered_point"])
+        self._hover_callbacks.append(callback)
+        self._hover_sync = True
         return callback
 
     def on_selection(self, callback: Any) -> Any:
@@ -211,7 +433,8 @@ class VectorSpace(anywidget.AnyWidget):
 
         def _handler(change: dict[str, Any]) -> None:
             pids = change["new"]
-            pdata = [p for p in self.points if p.get("id") in set(pids)]
+            selected = set(pids)
+            pdata = [p for p in self.points if p.get("id") in selected]
             callback(pids, pdata)
 
         self.observe(_handler, names=["selected_points"])
@@ -219,6 +442,63 @@ class VectorSpace(anywidget.AnyWidget):
 
     # === Add Points ===
 
+    def _load_pages(self, pages: Iterable[list[dict[str, Any]] | dict[str, Any]], *, stream: bool = False) -> None:
+        """Append pages of points, in a background thread when streaming.
+
+        A page is a list of point dicts or a columns dict (``ids``, ``vectors``,
+        ``metadata``) whose vector matrix is stacked into ``_vectors`` as is; its
+        points carry their vectors in ``vector`` fields like any other points.
+        Column pages without vectors leave those points without one, which is
+        reported through ``query_error`` when other pages have vectors.
+        While streaming, pages are held back until they at least match the points
+        already shown, so the number of syncs (each resending all points) stays
+        logarithmic and the total payload linear in the final size.
+        Errors in the background are reported through ``query_error``.
+        """
+
+        def append(batch: list[tuple[list[dict[str, Any]], Any]]) -> None:
+            # batch: (points, vector matrix or None) per page
+            points = [p for page, _ in batch for p in page]
+            matrices = [m for _, m in batch]
+            if matrices and all(m is not None for m in matrices):
+                import numpy as np
+
+                stored = 0 if self._vectors is None else len(self._vectors)
+                if stored == len(self.points) and (not stored or self._vectors.shape[1] == matrices[0].shape[1]):
+                    self._store_vectors(np.vstack([self._vectors, *matrices] if stored else matrices))
+            elif any(m is not None for m in matrices):
+                missing = sum("vector" not in p for p in points)
+                self.query_error = f"{missing} of {len(points)} loaded points have no vector"
+            self.points = [*self.points, *points]
+
+        def load() -> None:
+            pending: list[tuple[list[dict[str, Any]], Any]] = []
+            count = 0
+            for page in pages:
+                matrix = None
+                if isinstance(page, dict):
+                    matrix = page.get("vectors")
+                    page = _columns_to_points(page)
+                pending.append((page, matrix))
+                count += len(page)
+                if stream and count >= len(self.points):
+                    append(pending)
+                    pending, count = [], 0
+            if pending:
+                append(pending)
+
+        if not stream:
+            load()
+            return
+
+        def run() -> None:
+            try:
+                load()
+            except Exception as e:
+                self.query_error = str(e)
+
+        threading.Thread(target=run, daemon=True).start()
+
     def add_points(self, data: list[dict[str, Any]]) -> VectorSpace:
         """Append point dicts to the existing points.
 
@@ -231,6 +511,21 @@ class VectorSpace(anywidget.AnyWidget):
         self.points = [*self.points, *_normalize_points(data)]
         return self
 
+    def add_columns(self, columns: dict[str, Any]) -> VectorSpace:
+        """Append points from a columns dict, as returned by the backends' ``to_columns()``.
+
+        The vector matrix is stored as is, without re-stacking the points' vectors,
+        and the first three components give the coordinates.
+
+        Args:
+            columns: Dict with ``ids``, ``vectors`` ((N, D) array or None) and ``metadata``.
+
+        Returns:
+            Self for chaining.
+        """
+        self._load_pages([columns])
+        return self
+
     def add_numpy(
         self,
         positions: Any,
@@ -261,10 +556,7 @@ class VectorSpace(anywidget.AnyWidget):
 
         # High-dimensional: store vectors and project to 3D
         if n_dims > 3:
-            if self._vectors is not None:
-                self._vectors = np.vstack([self._vectors, arr])
-            else:
-                self._vectors = arr
+            self._store_vectors(arr if self._vectors is None else np.vstack([self._vectors, arr]))
             coords = _pca(arr, n_components=3)
         else:
             coords = arr
@@ -302,9 +594,49 @@ class VectorSpace(anywidget.AnyWidget):
         """
         import numpy as np
 
-        self._vectors = np.asarray(vectors, dtype=np.float64)
+        self._store_vectors(np.asarray(vectors, dtype=np.float64))
         return self
 
+    def _store_vectors(self, vectors: Any) -> None:
+        """Keep the vector matrix kernel-side and tell the browser its width."""
+        self._vectors = vectors
+        self._vector_dims = 0 if vectors is None else int(vectors.shape[1])
+
+    @traitlets.validate("points")
+    def _validate_points(self, proposal: dict[str, Any]) -> list[dict[str, Any]]:
+        """Stack vectors kernel-side and, when quantized, encode positions before points sync."""
+        points = proposal["value"]
+        self._collect_vectors(points)
+        if self.position_encoding != "float":
+            self._encode_positions(points)
+        return points
+
+    def _collect_vectors(self, points: list[dict[str, Any]]) -> None:
+        """Stack per-point ``vector`` fields into the ``_vectors`` matrix.
+
+        A matrix that already has a row per point (including one from
+        ``set_vectors()``) is kept as is. Points appended to stored rows only have
+        their own vectors stacked; without stored rows, every point must carry a
+        vector. The point dicts keep their ``vector`` fields; they are never sent to
+        the browser either way.
+        """
+        stored = 0 if self._vectors is None else len(self._vectors)
+        if stored == len(points):
+            return
+        start = stored if stored < len(points) else 0
+        tail = points[start:]
+        if not all("vector" in p for p in tail):
+            return
+        try:
+            import numpy as np
+
+            arr = np.array([p["vector"] for p in tail], dtype=np.float64)
+        except (ImportError, TypeError, ValueError):
+            return
+        if arr.ndim != 2 or (start and arr.shape[1] != self._vectors.shape[1]):
+            return
+        self._store_vectors(np.vstack([self._vectors, arr]) if start else arr)
+
     def project(self, method: str = "pca", *, n_components: int = 3, **kwargs: Any) -> VectorSpace:
         """Reproject point coordinates using dimensionality reduction.
 
@@ -348,6 +680,67 @@ class VectorSpace(anywidget.AnyWidget):
         self.points = points
         return self
 
+    def set_frames(
+        self,
+        frames: Any,
+        *,
+        labels: list[Any] | None = None,
+        max_frames: int = 200,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> VectorSpace:
+        """Load a sequence of layouts of the same points for timeline playback.
+
+        All frames are sent to the browser once, as a single float32 buffer.
+        The timeline then plays or scrubs them and interpolates between frames
+        on the GPU. Long runs are decimated to evenly spaced frames (always
+        keeping the first and last) so that at most ``max_frames`` frames and
+        ``max_bytes`` bytes are sent. If the widget has no points yet, they are
+        created from the first frame.
+
+        Args:
+            frames: Array of shape (T, N, 3) or (T, N, 2), rows in ``points`` order.
+            labels: Optional label per input frame (e.g. epoch); defaults to the frame index.
+            max_frames: Maximum number of frames to send.
+            max_bytes: Maximum size of the frame buffer in bytes.
+
+        Returns:
+            Self for chaining.
+        """
+        import numpy as np
+
+        arr = np.asarray(frames, dtype=np.float32)
+        if arr.ndim != 3 or arr.shape[2] not in (2, 3):
+            raise ValueError(f"frames must have shape (T, N, 3) or (T, N, 2), got {arr.shape}")
+        n_frames, n_points = arr.shape[:2]
+        if arr.shape[2] == 2:
+            arr = np.concatenate([arr, np.zeros((n_frames, n_points, 1), dtype=np.float32)], axis=2)
+        if labels is not None and len(labels) != n_frames:
+            raise ValueError(f"Got {len(labels)} labels for {n_frames} frames")
+        if not self.points:
+            self.add_numpy(arr[0])
+        elif len(self.points) != n_points:
+            raise ValueError(f"frames have {n_points} points per frame, but the widget has {len(self.points)}")
+
+        limit = max(1, min(max_frames, max_bytes // max(1, n_points * 3 * 4)))
+        keep = np.arange(n_frames)
+        if n_frames > limit:
+            keep = np.unique(np.linspace(0, n_frames - 1, limit).round().astype(int))
+
+        with self.hold_sync():
+            self.frame_labels = [str(labels[i]) if labels is not None else str(i) for i in keep]
+            self.frame_count = len(keep)
+            self.frame = 0.0
+            self._frames = np.ascontiguousarray(arr[keep], dtype="<f4").tobytes()
+        return self
+
+    def clear_frames(self) -> None:
+        """Remove loaded frames and show the points at their own positions."""
+        with self.hold_sync():
+            self._frames = b""
+            self.frame_count = 0
+            self.frame_labels = []
+            self.frame = 0.0
+
     def _resolve_vectors(self) -> Any:
         """Get the vector matrix for projection."""
         import numpy as np
@@ -469,54 +862,71 @@ class VectorSpace(anywidget.AnyWidget):
         client: Any,
         collection: str,
         *,
-        limit: int = 5000,
+        limit: int | None = 5000,
+        page_size: int = 1000,
+        stream: bool = False,
         **kwargs: Any,
     ) -> VectorSpace:
         """Create from a Qdrant collection.
 
+        Scrolls page by page, following the next-page offset, and fetches the next
+        page while the current one is converted.
+
         Args:
             client: qdrant_client.QdrantClient instance.
             collection: Collection name.
-            limit: Maximum number of points to fetch.
+            limit: Maximum number of points to fetch (None for the whole collection).
+            page_size: Points requested per scroll call.
+            stream: Return immediately and append pages in the background as they arrive.
             **kwargs: Additional widget options.
         """
-        records, _ = client.scroll(collection, limit=limit, with_vectors=True)
-        points = []
-        for r in records:
-            point: dict[str, Any] = {"id": str(r.id)}
-            vec = r.vector
-            if vec:
-                point["x"] = float(vec[0]) if len(vec) > 0 else 0.0
-                point["y"] = float(vec[1]) if len(vec) > 1 else 0.0
-                point["z"] = float(vec[2]) if len(vec) > 2 else 0.0
-                point["vector"] = list(vec)
-            if r.payload:
-                point.update(r.payload)
-            points.append(point)
-        return cls(points=points, **kwargs)
+        from anywidget_vector.backends.paging import prefetched
+        from anywidget_vector.backends.qdrant.client import scroll_pages
+        from anywidget_vector.backends.qdrant.converter import records_to_columns
+
+        pages = prefetched(scroll_pages(client, collection, page_size=page_size, limit=limit))
+        widget = cls(**kwargs)
+        widget._load_pages((records_to_columns(records) for records in pages), stream=stream)
+        return widget
 
     @classmethod
     def from_chroma(
         cls,
         collection: Any,
         *,
-        limit: int = 5000,
+        limit: int | None = 5000,
+        page_size: int = 1000,
+        max_workers: int = 1,
+        include: Sequence[str] = ("embeddings", "metadatas"),
+        where: dict[str, Any] | None = None,
+        stream: bool = False,
         **kwargs: Any,
     ) -> VectorSpace:
         """Create from a ChromaDB collection.
 
+        Pages through the collection by offset and converts each page to columns,
+        so embeddings go straight into a float32 matrix.
+
         Args:
             collection: chromadb Collection object.
-            limit: Maximum number of points to fetch.
+            limit: Maximum number of points to fetch (None for the whole collection).
+            page_size: Points requested per get call.
+            max_workers: Pages fetched concurrently.
+            include: Fields to fetch; add "documents" to show document text.
+            where: Optional metadata filter.
+            stream: Return immediately and append pages in the background as they arrive.
             **kwargs: Additional widget options.
         """
-        from anywidget_vector.backends.chroma.converter import to_points
+        from anywidget_vector.backends.chroma.client import get_pages
+        from anywidget_vector.backends.chroma.converter import to_columns
+        from anywidget_vector.backends.paging import prefetched
 
-        response = collection.get(
-            limit=limit,
-            include=["embeddings", "metadatas", "documents"],
+        pages = get_pages(
+            collection, page_size=page_size, limit=limit, where=where, include=include, max_workers=max_workers
         )
-        return cls(points=to_points(response), **kwargs)
+        widget = cls(**kwargs)
+        widget._load_pages((to_columns(page) for page in prefetched(pages)), stream=stream)
+        return widget
 
     @classmethod
     def from_pinecone(
@@ -524,29 +934,49 @@ class VectorSpace(anywidget.AnyWidget):
         index: Any,
         *,
         namespace: str = "",
-        limit: int = 5000,
+        limit: int | None = 5000,
+        batch_size: int = 100,
+        max_workers: int = 4,
+        on_progress: Any = None,
+        stream: bool = False,
         **kwargs: Any,
     ) -> VectorSpace:
         """Create from a Pinecone index.
 
-        Uses list() to fetch vectors, then converts via the Pinecone converter.
+        Enumerates ids with the list API, then fetches values and metadata in
+        parallel batches with retry and backoff. Pod-based indexes have no list
+        API; for those it falls back to a single zero-vector similarity query,
+        which returns at most 10,000 vectors and ignores ``stream``.
 
         Args:
-            index: pinecone.Index instance.
-            namespace: Namespace to query (default: "").
-            limit: Maximum number of vectors to fetch.
+            index: pinecone.Index instance, or a ``RestIndex`` for plain REST access.
+            namespace: Namespace to export (default: "").
+            limit: Maximum number of vectors to fetch (None for the whole namespace).
+            batch_size: Ids per fetch call (at most 100).
+            max_workers: Concurrent fetch calls.
+            on_progress: Optional callback receiving (fetched, listed) counts.
+            stream: Return immediately and append batches in the background as they arrive.
             **kwargs: Additional widget options.
         """
-        from anywidget_vector.backends.pinecone.converter import to_points
+        from anywidget_vector.backends.pinecone.client import fetch_pages, query_all, supports_list
+        from anywidget_vector.backends.pinecone.converter import records_to_columns, to_columns
 
-        response = index.query(
-            vector=[0.0] * index.describe_index_stats()["dimension"],
-            top_k=limit,
-            include_values=True,
-            include_metadata=True,
+        if not supports_list(index, namespace=namespace):
+            widget = cls(**kwargs)
+            widget._load_pages([to_columns(query_all(index, namespace=namespace, limit=limit))])
+            return widget
+
+        pages = fetch_pages(
+            index,
             namespace=namespace,
+            limit=limit,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            on_progress=on_progress,
         )
-        return cls(points=to_points(response), **kwargs)
+        widget = cls(**kwargs)
+        widget._load_pages((records_to_columns(records) for records in pages), stream=stream)
+        return widget
 
     @classmethod
     def from_weaviate(
@@ -554,45 +984,73 @@ class VectorSpace(anywidget.AnyWidget):
         client: Any,
         class_name: str,
         *,
-        limit: int = 5000,
+        limit: int | None = 5000,
+        page_size: int = 1000,
+        properties: Sequence[str] | None = None,
+        stream: bool = False,
         **kwargs: Any,
     ) -> VectorSpace:
         """Create from a Weaviate collection.
 
-        Fetches objects with vectors using a GraphQL Get query.
+        Fetches objects with vectors page by page using the ``after`` cursor, and
+        fetches the next page while the current one is converted.
 
         Args:
             client: weaviate.Client instance.
             class_name: Weaviate class name to query.
-            limit: Maximum number of objects to fetch.
+            limit: Maximum number of objects to fetch (None for the whole class).
+            page_size: Objects requested per GraphQL Get query.
+            properties: Properties to fetch besides id and vector.
+            stream: Return immediately and append pages in the background as they arrive.
             **kwargs: Additional widget options.
         """
-        from anywidget_vector.backends.weaviate.converter import to_points
+        from anywidget_vector.backends.paging import prefetched
+        from anywidget_vector.backends.weaviate.client import cursor_pages
+        from anywidget_vector.backends.weaviate.converter import to_columns
 
-        response = client.query.get(class_name).with_additional(["id", "vector"]).with_limit(limit).do()
-        return cls(points=to_points(response, class_name), **kwargs)
+        pages = prefetched(cursor_pages(client, class_name, page_size=page_size, limit=limit, properties=properties))
+        widget = cls(**kwargs)
+        widget._load_pages((to_columns(response, class_name) for response in pages), stream=stream)
+        return widget
 
     @classmethod
     def from_lancedb(
         cls,
         table: Any,
         *,
-        limit: int = 5000,
+        limit: int | None = 5000,
+        where: str | None = None,
+        columns: Sequence[str] | None = None,
+        batch_size: int = 4096,
+        stream: bool = False,
         **kwargs: Any,
     ) -> VectorSpace:
         """Create from a LanceDB table.
 
-        Reads rows from the table and converts them to visualization points.
+        Scans the table with the filter, projection and limit pushed down, reading
+        Arrow record batches whose vector column is taken without copying.
 
         Args:
             table: lancedb.table.Table instance.
-            limit: Maximum number of rows to fetch.
+            limit: Maximum number of rows to fetch (None for all matching rows).
+            where: Optional SQL filter, e.g. ``"year > 2020"``.
+            columns: Columns to read (None for all); include the id and vector columns.
+            batch_size: Rows per record batch.
+            stream: Return immediately and append batches in the background as they arrive.
             **kwargs: Additional widget options.
         """
-        from anywidget_vector.backends.lancedb.converter import to_points
+        from anywidget_vector.backends.lancedb.client import scan_batches
+        from anywidget_vector.backends.lancedb.converter import batch_to_columns
 
-        results = table.to_pandas().head(limit).to_dict("records")
-        return cls(points=to_points(results), **kwargs)
+        def pages() -> Iterator[dict[str, Any]]:
+            start = 0
+            for batch in scan_batches(table, where=where, columns=columns, limit=limit, batch_size=batch_size):
+                yield batch_to_columns(batch, start)
+                start += batch.num_rows
+
+        widget = cls(**kwargs)
+        widget._load_pages(pages(), stream=stream)
+        return widget
 
     # === Distance Methods ===
 
@@ -610,13 +1068,15 @@ class VectorSpace(anywidget.AnyWidget):
             vector_field: Use a high-dimensional vector field instead of x/y/z.
         """
         metric = metric or self.distance_metric
-        ref = next((p for p in self.points if p.get("id") == reference_id), None)
+        points = self.points
+        if vector_field == "vector" and self._vectors is not None and len(self._vectors) == len(points):
+            # Vectors moved out of the point dicts, row-aligned with points
+            points = [{"id": p.get("id"), "vector": v} for p, v in zip(points, self._vectors.tolist(), strict=True)]
+        ref = next((p for p in points if p.get("id") == reference_id), None)
         if not ref:
             return {}
         return {
-            p.get("id"): self._distance(ref, p, metric, vector_field)
-            for p in self.points
-            if p.get("id") != reference_id
+            p.get("id"): self._distance(ref, p, metric, vector_field) for p in points if p.get("id") != reference_id
         }
 
     def find_neighbors(
@@ -682,6 +1142,60 @@ class VectorSpace(anywidget.AnyWidget):
         """Clear all selected points."""
         self.selected_points = []
 
+    @property
+    def selection_indices(self) -> Any:
+        """Row indices of the selected points as a sorted NumPy int64 array."""
+        return _decode_selection_array(self._selection)
+
+    @property
+    def selection_mask(self) -> Any:
+        """Boolean NumPy mask over ``points``, True for selected rows."""
+        import numpy as np
+
+        mask = np.zeros(len(self.points), dtype=bool)
+        rows = self.selection_indices
+        mask[rows[rows < len(mask)]] = True
+        return mask
+
+    def _point_id(self, row: int) -> Any:
+        """Id of the point at ``row``, with the same fallback the canvas uses."""
+        return self.points[row].get("id") or f"point_{row}"
+
+    def _on_selected_points(self, change: dict[str, Any]) -> None:
+        """Encode an id selection set from Python into row-based _selection."""
+        if self._syncing_selection:
+            return
+        rows = []
+        if change["new"]:
+            # Built on first use after each points change
+            if self._id_rows is None:
+                self._id_rows = {self._point_id(i): i for i in range(len(self.points))}
+            rows = [self._id_rows[pid] for pid in change["new"] if pid in self._id_rows]
+        self._syncing_selection = True
+        try:
+            self._selection = _encode_selection(rows)
+        finally:
+            self._syncing_selection = False
+
+    def _on_selection_bytes(self, change: dict[str, Any]) -> None:
+        """Expose a browser selection (encoded rows) as selected_points ids."""
+        if self._syncing_selection:
+            return
+        n = len(self.points)
+        ids = [self._point_id(i) for i in _decode_selection(change["new"]) if i < n]
+        self._syncing_selection = True
+        try:
+            self.selected_points = ids
+        finally:
+            self._syncing_selection = False
+
+    def _on_points_selection(self, change: dict[str, Any]) -> None:
+        """Re-resolve the selected ids against new points, since rows may have moved."""
+        self._id_rows = None
+        # Nothing selected: nothing can have moved (and no id map to build)
+        if self.selected_points:
+            self._on_selected_points({"new": self.selected_points})
+
     # === Camera ===
 
     def reset_camera(self) -> None:
@@ -1078,6 +1592,28 @@ def _normalize_point(point: Any, index: int) -> dict[str, Any]:
     raise ValueError(f"Cannot normalize point: {point}")
 
 
+def _columns_to_points(columns: dict[str, Any]) -> list[dict[str, Any]]:
+    """Build point dicts from a columns dict, taking x/y/z from the first vector components.
+
+    Each point gets its row of the vector matrix as a ``vector`` list.
+    """
+    ids = columns["ids"]
+    vectors = columns.get("vectors")
+    rows = [None] * len(ids) if vectors is None else vectors.tolist()
+    fields = list(columns.get("metadata", {}).items())
+    points = []
+    for i, id_ in enumerate(ids):
+        x, y, z = (*(rows[i] or ())[:3], 0.0, 0.0, 0.0)[:3]
+        point: dict[str, Any] = {"id": id_, "x": x, "y": y, "z": z}
+        if rows[i] is not None:
+            point["vector"] = rows[i]
+        for key, values in fields:
+            if values[i] is not None:
+                point[key] = values[i]
+        points.append(point)
+    return points
+
+
 def _to_list(obj: Any) -> list[Any]:
     """Convert numpy arrays or other iterables to lists."""
     if hasattr(obj, "tolist"):
@@ -1085,6 +1621,17 @@ def _to_list(obj: Any) -> list[Any]:
     return list(obj)
 
 
+def _search_rows(points: list[dict[str, Any]], text: str) -> list[int]:
+    """Rows with a metadata value (not coordinates or vectors) containing text, ignoring case."""
+    text = text.lower()
+    skip = {"x", "y", "z", "vector"}
+    return [
+        i
+        for i, p in enumerate(points)
+        if any(v is not None and text in str(v).lower() for k, v in p.items() if k not in skip)
+    ]
+
+
 # === Projection Helpers ===
 
 
@@ -1116,3 +1663,110 @@ def _umap(vectors: Any, n_components: int = 3, **kwargs: Any) -> Any:
         raise ImportError("UMAP requires umap-learn: uv add umap-learn") from None
     kwargs.setdefault("n_neighbors", min(15, len(vectors) - 1))
     return UMAP(n_components=n_components, **kwargs).fit_transform(vectors)
+
+
+# === Selection Encoding ===
+# _selection is a 4-byte header (format byte, then padding) followed by either a bitset
+# (bit i of the payload marks row i) or little-endian uint32 [start, end) row ranges,
+# whichever is smaller. ui/selection.js implements the same format.
+
+_SELECTION_BITSET = 0
+_SELECTION_RANGES = 1
+
+
+def _encode_selection(rows: Any) -> bytes:
+    """Encode row indices as compact selection bytes (b"" when empty)."""
+    rows = sorted(set(rows))
+    if not rows:
+        return b""
+    ranges: list[int] = []
+    for row in rows:
+        if ranges and ranges[-1] == row:
+            ranges[-1] = row + 1
+        else:
+            ranges += [row, row + 1]
+    bitset_size = (rows[-1] >> 3) + 1
+    if len(ranges) * 4 <= bitset_size:
+        return bytes([_SELECTION_RANGES, 0, 0, 0]) + struct.pack(f"<{len(ranges)}I", *ranges)
+    bits = bytearray(bitset_size)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return bytes([_SELECTION_BITSET, 0, 0, 0]) + bytes(bits)
+
+
+def _decode_selection(data: bytes) -> list[int]:
+    """Decode selection bytes into sorted row indices."""
+    if len(data) < 4:
+        return []
+    body = memoryview(data)[4:]
+    if data[0] == _SELECTION_RANGES:
+        flat = struct.unpack(f"<{len(body) // 4}I", body[: len(body) // 4 * 4])
+        return [row for start, end in zip(flat[::2], flat[1::2], strict=False) for row in range(start, end)]
+    return [(i << 3) + bit for i, byte in enumerate(body) if byte for bit in range(8) if byte >> bit & 1]
+
+
+def _decode_selection_array(data: bytes) -> Any:
+    """Decode selection bytes into a sorted NumPy int64 row array."""
+    import numpy as np
+
+    if len(data) < 4:
+        return np.zeros(0, dtype=np.int64)
+    body = np.frombuffer(data, dtype=np.uint8, offset=4)
+    if data[0] == _SELECTION_RANGES:
+        flat = body[: len(body) // 8 * 8].view("<u4").astype(np.int64)
+        starts, ends = flat[::2], flat[1::2]
+        if not len(starts):
+            return np.zeros(0, dtype=np.int64)
+        lengths = ends - starts
+        offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        return np.arange(lengths.sum(), dtype=np.int64) + offsets
+    return np.flatnonzero(np.unpackbits(body, bitorder="little")).astype(np.int64)
+
+
+# === Position Quantization ===
+# _positions layout (little-endian): uint8 encoding (1 = uint16, 2 = packed10), 3 pad bytes,
+# uint32 point count, uint32 chunk size; then float32 [min x, y, z, max x, y, z] per chunk;
+# then per point either 3 x uint16 (padded to 4 bytes overall) or one uint32 holding
+# x | y << 10 | z << 20. ui/positions.js decodes it.
+
+_POSITION_ENCODINGS = {"uint16": (1, 65535), "packed10": (2, 1023)}
+_POSITION_CHUNK = 4096
+
+
+def _quantize_positions(points: list[dict[str, Any]], encoding: str) -> tuple[bytes, float]:
+    """Quantize x/y/z relative to per-chunk bounding boxes.
+
+    Returns:
+        The encoded buffer and the largest per-axis error in data units.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("Quantized positions require numpy: uv add numpy") from None
+
+    code, levels = _POSITION_ENCODINGS[encoding]
+    n = len(points)
+    header = struct.pack("<B3xII", code, n, _POSITION_CHUNK)
+    if n == 0:
+        return header, 0.0
+    xyz = np.array([(p.get("x") or 0, p.get("y") or 0, p.get("z") or 0) for p in points], dtype=np.float64)
+    n_chunks = -(-n // _POSITION_CHUNK)
+    padded = np.concatenate([xyz, np.repeat(xyz[-1:], n_chunks * _POSITION_CHUNK - n, axis=0)])
+    chunks = padded.reshape(n_chunks, _POSITION_CHUNK, 3)
+    # Bounds are sent as float32, so quantize against the rounded values the browser will see
+    lo = chunks.min(axis=1).astype(np.float32)
+    hi = chunks.max(axis=1).astype(np.float32)
+    lo64, hi64 = lo.astype(np.float64), hi.astype(np.float64)
+    span = hi64 - lo64
+    scale = np.divide(levels, span, out=np.zeros_like(span), where=span > 0)
+    q = np.clip(np.rint((chunks - lo64[:, None]) * scale[:, None]), 0, levels).astype(np.uint32)
+    q = q.reshape(-1, 3)[:n]
+    step = np.repeat(span / levels, _POSITION_CHUNK, axis=0)[:n]
+    error = float(np.abs(lo64.repeat(_POSITION_CHUNK, axis=0)[:n] + q * step - xyz).max())
+    bounds = np.concatenate([lo, hi], axis=1).astype("<f4").tobytes()
+    if encoding == "uint16":
+        body = q.astype("<u2").tobytes()
+        body += b"\0" * (-len(body) % 4)
+    else:
+        body = (q[:, 0] | q[:, 1] << 10 | q[:, 2] << 20).astype("<u4").tobytes()
+    return header + bounds + body, error
@@ -1,6 +1,13 @@
 """Tests for VectorSpace widget."""
 
 import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import pytest
 
 from anywidget_vector import VectorSpace
 
@@ -107,6 +114,11 @@ class TestDefaults:
         assert widget.camera_position == [2, 2, 2]
         assert widget.camera_target == [0, 0, 0]
 
+    def test_default_transition_duration(self):
+        """Test layout changes animate by default."""
+        widget = VectorSpace()
+        assert widget.transition_duration == 600
+
 
 class TestSelection:
     """Test selection methods."""
@@ -124,6 +136,50 @@ class TestSelection:
         widget.clear_selection()
         assert widget.selected_points == []
 
+    def test_selection_encoded_as_rows(self):
+        """Test Python selections reach the browser as compact row ranges."""
+        widget = VectorSpace(points=[{"id": f"p{i}"} for i in range(1000)])
+        widget.select([f"p{i}" for i in range(100, 600)])
+        assert len(widget._selection) == 4 + 8
+        widget.select(["p3", "p9"])
+        assert widget._selection == bytes([0, 0, 0, 0, 0b00001000, 0b00000010])
+
+    def test_browser_selection_sets_ids(self):
+        """Test a row-encoded browser selection fires on_selection with ids."""
+        widget = VectorSpace(points=[{"id": "a"}, {"id": "b"}, {"x": 0}])
+        calls = []
+
+        @widget.on_selection
+        def handle(point_ids, points_data):
+            calls.append(point_ids)
+
+        widget._selection = bytes([1, 0, 0, 0]) + (1).to_bytes(4, "little") + (3).to_bytes(4, "little")
+        assert widget.selected_points == ["b", "point_2"]
+        assert calls == [["b", "point_2"]]
+
+    def test_selection_numpy_views(self):
+        """Test selection_indices and selection_mask decode the row encoding."""
+        widget = VectorSpace(points=[{"id": str(i)} for i in range(20)])
+        widget.select(["2", "3", "17"])
+        assert widget.selection_indices.tolist() == [2, 3, 17]
+        assert widget.selection_mask.sum() == 3
+        assert widget.selection_mask[17]
+
+    def test_selection_follows_ids_across_points(self):
+        """Test the row encoding is rebuilt when points are reordered."""
+        widget = VectorSpace(points=[{"id": "a"}, {"id": "b"}])
+        widget.select(["b"])
+        widget.points = [{"id": "b"}, {"id": "a"}]
+        assert widget.selection_indices.tolist() == [0]
+
+    def test_no_id_map_without_selection(self):
+        """Test points changes build no id-to-row map while nothing is selected."""
+        widget = VectorSpace(points=[{"id": "a"}])
+        widget.points = [{"id": "a"}, {"id": "b"}]
+        assert widget._id_rows is None
+        widget.select(["b"])
+        assert widget._id_rows == {"a": 0, "b": 1}
+
 
 class TestCamera:
     """Test camera control methods."""
@@ -305,6 +361,643 @@ class TestFromNumpy:
         assert widget.points[0]["z"] == 0.0
 
 
+class TestFrames:
+    """Test set_frames timeline data."""
+
+    def test_set_frames_creates_points(self):
+        """set_frames on an empty widget creates points from the first frame."""
+        frames = [[[0, 0, 0], [1, 1, 1]], [[2, 2, 2], [3, 3, 3]]]
+        widget = VectorSpace().set_frames(frames)
+        assert len(widget.points) == 2
+        assert widget.points[1]["x"] == 1.0
+        assert widget.frame_count == 2
+        assert len(widget._frames) == 2 * 2 * 3 * 4
+
+    def test_set_frames_decimates(self):
+        """Long runs are reduced to evenly spaced frames including first and last."""
+        frames = [[[float(t), 0.0]] for t in range(100)]
+        widget = VectorSpace().set_frames(frames, labels=[f"epoch {t}" for t in range(100)], max_frames=10)
+        assert widget.frame_count == 10
+        assert widget.frame_labels[0] == "epoch 0"
+        assert widget.frame_labels[-1] == "epoch 99"
+        assert len(widget._frames) == 10 * 1 * 3 * 4
+
+    def test_set_frames_point_count_mismatch(self):
+        """Frames must have one row per existing point."""
+        widget = VectorSpace(points=[{"id": "a", "x": 0, "y": 0, "z": 0}])
+        with pytest.raises(ValueError):
+            widget.set_frames([[[0, 0, 0], [1, 1, 1]]])
+
+    def test_clear_frames(self):
+        """clear_frames removes the frame buffer."""
+        widget = VectorSpace().set_frames([[[0, 0, 0]], [[1, 1, 1]]])
+        widget.clear_frames()
+        assert widget.frame_count == 0
+        assert widget._frames == b""
+
+
+class TestLazyMetadata:
+    """Test lazy_metadata point projection and row requests."""
+
+    def test_lazy_points_keep_render_fields(self):
+        """Only render fields are serialized for the browser when lazy_metadata is on."""
+        point = {"id": "a", "x": 1, "y": 2, "z": 3, "label": "A", "cluster": "c1", "text": "long"}
+        widget = VectorSpace(points=[point], color_field="cluster")
+        assert widget._points_to_json(widget.points) == [point]
+        widget.lazy_metadata = True
+        sent = widget._points_to_json(widget.points)
+        assert sent == [{"id": "a", "x": 1, "y": 2, "z": 3, "label": "A", "cluster": "c1"}]
+        assert widget.points[0]["text"] == "long"
+
+    def test_metadata_request_answered_by_row(self):
+        """A metadata message is answered with the requested rows, minus vectors."""
+        widget = VectorSpace(points=[{"id": "a", "note": "n", "vector": [1.0]}, {"id": "b"}], lazy_metadata=True)
+        replies = []
+        widget.send = replies.append
+        widget._on_custom_msg(widget, {"type": "metadata", "version": 3, "rows": [0, 5]}, [])
+        assert replies[0]["version"] == 3
+        assert replies[0]["rows"] == [0, 5]
+        assert replies[0]["points"] == [{"id": "a", "note": "n"}, None]
+
+    def test_filter_message_matches_all_fields(self):
+        """A filter message is matched against every field kernel-side, not just the synced ones."""
+        points = [{"id": "a", "x": 0, "note": "Blue sky"}, {"id": "b", "x": 0, "note": "red"}, {"id": "sky"}]
+        widget = VectorSpace(points=points, lazy_metadata=True)
+        replies = []
+        widget.send = replies.append
+        widget._on_custom_msg(widget, {"type": "filter", "version": 2, "id": 7, "filter": "sky"}, [])
+        assert replies == [{"type": "filter", "version": 2, "id": 7, "rows": [0, 2]}]
+
+
+class TestKernelSideVectors:
+    """Test that vector fields stay in the kernel."""
+
+    def test_vectors_stacked_into_matrix(self):
+        """Per-point vectors are stacked into _vectors and never serialized."""
+        widget = VectorSpace(points=[{"id": "a", "vector": [1, 0, 0, 0]}, {"id": "b", "vector": [0, 1, 0, 0]}])
+        assert widget.points[0]["vector"] == [1, 0, 0, 0]
+        assert widget._vectors.shape == (2, 4)
+        assert widget._vector_dims == 4
+        assert "vector" not in widget.get_state()["points"][0]
+
+    def test_appended_vectors_stack(self):
+        """Adding points with vectors extends the stored matrix."""
+        widget = VectorSpace(points=[{"id": "a", "vector": [1.0, 0.0]}])
+        widget.add_points([{"id": "b", "x": 0, "y": 0, "vector": [0.0, 1.0]}])
+        assert widget._vectors.tolist() == [[1.0, 0.0], [0.0, 1.0]]
+
+    def test_reassignment_keeps_stored_matrix(self):
+        """Re-assigning points leaves a matrix that covers them alone, including one from set_vectors()."""
+        widget = VectorSpace(points=[{"id": "a", "vector": [1.0, 0.0]}, {"id": "b", "vector": [0.0, 1.0]}])
+        matrix = widget._vectors
+        widget.points = [{**p, "label": "x"} for p in widget.points]
+        assert widget._vectors is matrix
+        widget.set_vectors([[1, 2, 3], [4, 5, 6]])
+        widget.points = list(widget.points)
+        assert widget._vectors.shape == (2, 3)
+
+    def test_partial_vectors_stay_in_points(self):
+        """Points without a vector for every row keep their fields but do not sync them."""
+        widget = VectorSpace(points=[{"id": "a", "vector": [1.0]}, {"id": "b"}])
+        assert widget.points[0]["vector"] == [1.0]
+        assert widget._vectors is None
+        assert "vector" not in widget.get_state()["points"][0]
+
+    def test_export_and_callbacks_keep_vectors(self):
+        """to_json() and click/selection callback data still carry each point's vector."""
+        widget = VectorSpace(points=[{"id": "a", "x": 0, "y": 0, "vector": [1, 2, 3, 4]}])
+        assert json.loads(widget.to_json())[0]["vector"] == [1, 2, 3, 4]
+        clicked, selected = [], []
+        widget.on_click(lambda pid, data: clicked.append(data))
+        widget.on_selection(lambda pids, data: selected.extend(data))
+        widget.selected_points = ["a"]
+        assert clicked[0]["vector"] == [1, 2, 3, 4]
+        assert selected[0]["vector"] == [1, 2, 3, 4]
+
+    def test_vector_field_distance_uses_matrix(self):
+        """compute_distances(vector_field="vector") reads the moved vectors."""
+        widget = VectorSpace(points=[{"id": "a", "vector": [1.0, 0.0]}, {"id": "b", "vector": [0.0, 1.0]}])
+        distances = widget.compute_distances("a", metric="cosine", vector_field="vector")
+        assert abs(distances["b"] - 1.0) < 0.001
+
+
+class TestQuantizedPositions:
+    """Test quantized position transport."""
+
+    def test_quantized_buffer_replaces_xyz(self):
+        """Positions move from the points JSON into the quantized buffer."""
+        points = [{"id": str(i), "x": i / 10, "y": -i / 10, "z": 0.5} for i in range(100)]
+        widget = VectorSpace(points=points, position_encoding="packed10")
+        assert "x" not in widget.get_state()["points"][0]
+        assert len(widget._positions) == 12 + 24 + 100 * 4
+        assert 0 < widget.position_error <= 9.9 / 1023 / 2 + 1e-6
+
+    def test_uint16_error_bound(self):
+        """uint16 positions are accurate to half a step of each chunk's extent."""
+        widget = VectorSpace(points=[{"x": 0.0, "y": 0.0, "z": 0.0}, {"x": 1.0, "y": 0.3333, "z": 2.0}])
+        widget.position_encoding = "uint16"
+        assert len(widget._positions) == 12 + 24 + 12
+        assert widget.position_error <= 2.0 / 65535 / 2 + 1e-7
+
+    def test_switch_back_to_float(self):
+        """Returning to float positions clears the buffer."""
+        widget = VectorSpace(points=[{"x": 1.0, "y": 2.0, "z": 3.0}], position_encoding="uint16")
+        widget.position_encoding = "float"
+        assert widget._positions == b""
+        assert widget.position_error == 0.0
+        assert widget.get_state()["points"][0]["x"] == 1.0
+
+
+class _FakeQdrant:
+    """In-memory stand-in for QdrantClient.scroll."""
+
+    def __init__(self, n):
+        self.records = [
+            SimpleNamespace(id=i, vector=[float(i), 0.0, 1.0, 2.0], payload={"group": i % 3}) for i in range(n)
+        ]
+        self.calls = []
+
+    def scroll(self, collection, *, scroll_filter=None, limit=10, offset=None, with_payload=True, with_vectors=True):
+        start = offset or 0
+        self.calls.append((start, limit))
+        end = min(start + limit, len(self.records))
+        return self.records[start:end], (end if end < len(self.records) else None)
+
+
+class TestFromQdrant:
+    """Test paginated Qdrant loading."""
+
+    def test_follows_next_page_offset(self):
+        """All pages are fetched by following the next-page offset."""
+        client = _FakeQdrant(25)
+        widget = VectorSpace.from_qdrant(client, "c", limit=None, page_size=10)
+        assert [p["id"] for p in widget.points] == [str(i) for i in range(25)]
+        assert client.calls == [(0, 10), (10, 10), (20, 10)]
+        assert widget._vectors.shape == (25, 4)
+        assert widget.points[4]["group"] == 1
+
+    def test_to_json_keeps_vectors(self):
+        """Loaded points carry their vectors through to_json() like assigned points do."""
+        widget = VectorSpace.from_qdrant(_FakeQdrant(3), "c", limit=None)
+        exported = json.loads(widget.to_json())
+        assert [p["vector"] for p in exported] == [[float(i), 0.0, 1.0, 2.0] for i in range(3)]
+        assert "vector" not in widget.get_state()["points"][0]
+
+    def test_limit_caps_last_page(self):
+        """The last page only requests what is left of the limit."""
+        client = _FakeQdrant(100)
+        widget = VectorSpace.from_qdrant(client, "c", limit=15, page_size=10)
+        assert len(widget.points) == 15
+        assert client.calls == [(0, 10), (10, 5)]
+
+    def test_stream_appends_in_background(self):
+        """Streaming returns at once and fills the widget as pages arrive."""
+        widget = VectorSpace.from_qdrant(_FakeQdrant(50), "c", limit=None, page_size=7, stream=True)
+        deadline = time.monotonic() + 5
+        while len(widget.points) < 50 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [p["id"] for p in widget.points] == [str(i) for i in range(50)]
+        assert widget._vectors.shape == (50, 4)
+
+
+class _FakeChroma:
+    """In-memory stand-in for chromadb Collection.get."""
+
+    def __init__(self, n):
+        self.rows = [(f"c{i:03d}", [float(i), 1.0, 2.0, 3.0], {"group": i % 3}, f"doc {i}") for i in range(n)]
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, ids=None, where=None, limit=None, offset=None, include=()):
+        with self._lock:
+            self.calls.append((offset, limit, tuple(include)))
+        rows = self.rows[offset or 0 :][:limit]
+        return {
+            "ids": [r[0] for r in rows],
+            "embeddings": [r[1] for r in rows] if "embeddings" in include else None,
+            "metadatas": [r[2] for r in rows] if "metadatas" in include else None,
+            "documents": [r[3] for r in rows] if "documents" in include else None,
+        }
+
+
+class TestFromChroma:
+    """Test offset-paged Chroma loading."""
+
+    def test_pages_by_offset_into_columns(self):
+        """Pages are fetched by offset and embeddings land in a float32 matrix."""
+        collection = _FakeChroma(25)
+        widget = VectorSpace.from_chroma(collection, limit=None, page_size=10)
+        assert [p["id"] for p in widget.points] == [f"c{i:03d}" for i in range(25)]
+        assert [c[:2] for c in collection.calls] == [(0, 10), (10, 10), (20, 10)]
+        assert widget._vectors.shape == (25, 4)
+        assert widget._vectors.dtype.name == "float32"
+        assert widget.points[4]["x"] == 4.0
+        assert widget.points[4]["group"] == 1
+
+    def test_include_projection(self):
+        """Documents are only fetched when included."""
+        collection = _FakeChroma(5)
+        widget = VectorSpace.from_chroma(collection)
+        assert "document" not in widget.points[0]
+        assert collection.calls[0][2] == ("embeddings", "metadatas")
+        widget = VectorSpace.from_chroma(_FakeChroma(5), include=("embeddings", "metadatas", "documents"))
+        assert widget.points[2]["document"] == "doc 2"
+
+    def test_concurrent_pages_keep_order(self):
+        """Pages fetched on a thread pool are appended in offset order."""
+        collection = _FakeChroma(95)
+        widget = VectorSpace.from_chroma(collection, limit=None, page_size=10, max_workers=4)
+        assert [p["id"] for p in widget.points] == [f"c{i:03d}" for i in range(95)]
+        assert widget._vectors.shape == (95, 4)
+
+    def test_query_includes_distances_once(self):
+        """Embedding queries request distances without repeating a caller-supplied entry."""
+        from anywidget_vector.backends.chroma.client import execute_query
+
+        calls = []
+
+        def query(**kwargs):
+            calls.append(kwargs["include"])
+            return {"ids": [["a"]], "distances": [[0.0]]}
+
+        collection = SimpleNamespace(query=query)
+        execute_query(collection, {"query_embeddings": [[1, 0]], "include": ["metadatas", "distances"]})
+        execute_query(collection, {"query_embeddings": [[1, 0]], "include": ["metadatas"]})
+        assert calls == [["metadatas", "distances"], ["metadatas", "distances"]]
+
+    def test_execute_query_pages_get_all(self):
+        """Get-all queries run through the paged getter and respect the limit."""
+        from anywidget_vector.backends.chroma.client import execute_query
+
+        collection = _FakeChroma(50)
+        points = execute_query(collection, {"limit": 25, "include": ["metadatas"]}, page_size=10)
+        assert len(points) == 25
+        assert [c[:2] for c in collection.calls] == [(0, 10), (10, 10), (20, 5)]
+        assert "vector" not in points[0]
+
+
+class TestColumns:
+    """Test the columnar converters and column ingestion."""
+
+    def test_backends_agree_on_columns(self):
+        """Every backend yields the same ids, float32 matrix and metadata columns."""
+        from anywidget_vector.backends.chroma.converter import to_columns as chroma_columns
+        from anywidget_vector.backends.grafeo.converter import to_columns as grafeo_columns
+        from anywidget_vector.backends.lancedb.converter import to_columns as lancedb_columns
+        from anywidget_vector.backends.pinecone.converter import to_columns as pinecone_columns
+        from anywidget_vector.backends.qdrant.converter import to_columns as qdrant_columns
+        from anywidget_vector.backends.weaviate.converter import to_columns as weaviate_columns
+
+        vectors = [[1.0, 2.0, 3.0, 4.0], [5.0, 6.0, 7.0, 8.0]]
+        rows = [{"id": "a", "vector": vectors[0], "tag": "x"}, {"id": "b", "vector": vectors[1]}]
+        results = [
+            qdrant_columns(
+                {"result": [{"id": r["id"], "vector": r["vector"], "payload": {"tag": r.get("tag")}} for r in rows]}
+            ),
+            pinecone_columns(
+                {"matches": [{"id": r["id"], "values": r["vector"], "metadata": {"tag": r.get("tag")}} for r in rows]}
+            ),
+            chroma_columns({"ids": ["a", "b"], "embeddings": vectors, "metadatas": [{"tag": "x"}, {"tag": None}]}),
+            lancedb_columns([{**r, "tag": r.get("tag")} for r in rows]),
+            weaviate_columns(
+                {
+                    "data": {
+                        "Get": {
+                            "C": [
+                                {"tag": r.get("tag"), "_additional": {"id": r["id"], "vector": r["vector"]}}
+                                for r in rows
+                            ]
+                        }
+                    }
+                },
+                "C",
+            ),
+            grafeo_columns([{**r, "tag": r.get("tag")} for r in rows]),
+        ]
+        for columns in results:
+            assert columns["ids"] == ["a", "b"]
+            assert columns["vectors"].dtype.name == "float32"
+            assert columns["vectors"].tolist() == vectors
+            assert columns["metadata"] == {"tag": ["x", None]}
+
+    def test_missing_vectors_give_no_matrix(self):
+        """A record without a vector leaves the matrix out rather than misaligning rows."""
+        from anywidget_vector.backends.qdrant.converter import to_columns
+
+        columns = to_columns({"result": [{"id": 1, "vector": [1, 2]}, {"id": 2, "payload": {"x": 3}}]})
+        assert columns["vectors"] is None
+        assert columns["metadata"] == {"x": [None, 3]}
+
+    def test_add_columns(self):
+        """Columns append as points, with the matrix stored kernel-side."""
+        from anywidget_vector.backends.grafeo.converter import to_columns
+
+        widget = VectorSpace()
+        widget.add_columns(
+            to_columns([{"id": "a", "vector": [1, 2, 3, 4], "tag": "x"}, {"id": "b", "vector": [5, 6, 7, 8]}])
+        )
+        assert widget.points == [
+            {"id": "a", "x": 1.0, "y": 2.0, "z": 3.0, "vector": [1.0, 2.0, 3.0, 4.0], "tag": "x"},
+            {"id": "b", "x": 5.0, "y": 6.0, "z": 7.0, "vector": [5.0, 6.0, 7.0, 8.0]},
+        ]
+        assert widget._vectors.shape == (2, 4)
+
+    def test_pages_without_vectors_keep_the_others(self):
+        """A page without vectors leaves the other pages' vectors on their points and reports the gap."""
+        from anywidget_vector.backends.grafeo.converter import to_columns
+
+        pages = [
+            to_columns([{"id": "a", "vector": [1, 0, 0, 0]}, {"id": "b", "vector": [0, 1, 0, 0]}]),
+            {**to_columns([{"id": "c"}]), "vectors": None},
+            to_columns([{"id": "d", "vector": [0, 0, 0, 1]}]),
+        ]
+        widget = VectorSpace()
+        widget._load_pages(pages)
+        assert [p["id"] for p in widget.points] == ["a", "b", "c", "d"]
+        assert widget.points[1]["vector"] == [0.0, 1.0, 0.0, 0.0]
+        assert widget.points[3]["vector"] == [0.0, 0.0, 0.0, 1.0]
+        assert "vector" not in widget.points[2]
+        assert widget.query_error == "1 of 4 loaded points have no vector"
+
+
+class _FakeWeaviate:
+    """Stand-in for the weaviate v3 query builder (get, with_limit, with_after)."""
+
+    def __init__(self, n):
+        self.objects = [{"title": f"t{i}", "_additional": {"id": f"w{i:03d}", "vector": [i, 0, 1]}} for i in range(n)]
+        self.calls = []
+        self.query = self
+
+    def get(self, class_name, properties):
+        self.page = {"class": class_name, "limit": None, "after": None}
+        return self
+
+    def with_additional(self, fields):
+        return self
+
+    def with_limit(self, limit):
+        self.page["limit"] = limit
+        return self
+
+    def with_after(self, after):
+        self.page["after"] = after
+        return self
+
+    def do(self):
+        page = self.page
+        self.calls.append((page["after"], page["limit"]))
+        ids = [o["_additional"]["id"] for o in self.objects]
+        start = ids.index(page["after"]) + 1 if page["after"] else 0
+        return {"data": {"Get": {page["class"]: self.objects[start : start + page["limit"]]}}}
+
+
+class TestFromWeaviate:
+    """Test cursor-paged Weaviate loading."""
+
+    def test_follows_after_cursor(self):
+        """Each page continues after the last id of the previous one."""
+        client = _FakeWeaviate(25)
+        widget = VectorSpace.from_weaviate(client, "Article", limit=None, page_size=10)
+        assert [p["id"] for p in widget.points] == [f"w{i:03d}" for i in range(25)]
+        assert client.calls == [(None, 10), ("w009", 10), ("w019", 10)]
+        assert widget._vectors.shape == (25, 3)
+
+    def test_limit_caps_last_page(self):
+        """The last page only requests what is left of the limit."""
+        client = _FakeWeaviate(100)
+        widget = VectorSpace.from_weaviate(client, "Article", limit=15, page_size=10)
+        assert len(widget.points) == 15
+        assert client.calls == [(None, 10), ("w009", 5)]
+
+
+class _FakeLanceTable:
+    """Stand-in for a LanceDB table that scans in-memory Arrow data."""
+
+    def __init__(self, n):
+        pa = pytest.importorskip("pyarrow")
+        self.pc = pytest.importorskip("pyarrow.compute")
+        vectors = pa.array([[float(i), 1.0, 2.0, 3.0] for i in range(n)], type=pa.list_(pa.float32(), 4))
+        self.data = pa.table({"id": [f"r{i:03d}" for i in range(n)], "vector": vectors, "year": list(range(n))})
+        self.scans = []
+
+    def search(self):
+        return _FakeLanceScan(self)
+
+
+class _FakeLanceScan:
+    """Query builder supporting where ("year >= N" only), select, limit and to_batches."""
+
+    def __init__(self, table):
+        self.table, self.filter, self.columns, self.rows = table, None, None, None
+
+    def where(self, sql):
+        self.filter = int(sql.split(">=")[1])
+        return self
+
+    def select(self, columns):
+        self.columns = columns
+        return self
+
+    def limit(self, rows):
+        self.rows = rows
+        return self
+
+    def to_batches(self, batch_size):
+        self.table.scans.append((self.filter, self.columns, self.rows))
+        data = self.table.data
+        if self.filter is not None:
+            data = data.filter(self.table.pc.greater_equal(data["year"], self.filter))
+        if self.columns is not None:
+            data = data.select(self.columns)
+        if self.rows is not None:
+            data = data.slice(0, self.rows)
+        return iter(data.to_batches(max_chunksize=batch_size))
+
+
+class TestFromLanceDB:
+    """Test pushed-down LanceDB scans."""
+
+    def test_pushes_down_filter_projection_and_limit(self):
+        """from_lancedb hands the filter, columns and limit to the scanner."""
+        table = _FakeLanceTable(100)
+        widget = VectorSpace.from_lancedb(table, where="year >= 40", columns=["id", "vector"], limit=25, batch_size=10)
+        assert table.scans == [(40, ["id", "vector"], 25)]
+        assert [p["id"] for p in widget.points] == [f"r{i:03d}" for i in range(40, 65)]
+        assert "year" not in widget.points[0]
+        assert widget._vectors.shape == (25, 4)
+        assert widget.points[0]["x"] == 40.0
+
+    def test_vector_column_is_zero_copy(self):
+        """A fixed-size float vector column is viewed, not copied."""
+        from anywidget_vector.backends.lancedb.converter import batch_to_columns
+
+        batch = _FakeLanceTable(8).data.to_batches()[0]
+        columns = batch_to_columns(batch)
+        assert columns["vectors"].shape == (8, 4)
+        assert not columns["vectors"].flags.owndata
+        assert columns["metadata"]["year"] == list(range(8))
+
+    def test_vector_column_cast_to_float32(self):
+        """Vectors stored as float64 come out as float32, like every other backend's."""
+        pa = pytest.importorskip("pyarrow")
+        from anywidget_vector.backends.lancedb.converter import batch_to_columns
+
+        vectors = pa.array([[1.0, 2.0], [3.0, 4.0]], type=pa.list_(pa.float64(), 2))
+        columns = batch_to_columns(pa.record_batch({"id": ["a", "b"], "vector": vectors}))
+        assert columns["vectors"].dtype.name == "float32"
+        assert columns["vectors"].tolist() == [[1.0, 2.0], [3.0, 4.0]]
+
+    def test_execute_query_filters(self):
+        """Filter-only queries return only matching rows, up to the limit."""
+        from anywidget_vector.backends.lancedb.client import execute_query
+
+        points = execute_query(_FakeLanceTable(100), {"where": "year >= 90", "limit": 5})
+        assert [p["year"] for p in points] == [90, 91, 92, 93, 94]
+        assert points[0]["x"] == 90.0
+
+
+_PINECONE_VECTORS = {
+    f"v{i:03d}": {"id": f"v{i:03d}", "values": [i, 0.0, 1.0, 2.0], "metadata": {"n": i}} for i in range(250)
+}
+
+
+class _PineconeStandIn(BaseHTTPRequestHandler):
+    """Local stand-in for the Pinecone list and fetch REST endpoints."""
+
+    fail_next_fetch = False
+    # Pod-based index: no list API, only describe_index_stats and query
+    pod = False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        if url.path == "/vectors/list" and type(self).pod:
+            self.send_error(400, "List is not supported for pod-based indexes")
+            return
+        if url.path == "/vectors/list":
+            ids = sorted(_PINECONE_VECTORS)
+            start = int(params.get("paginationToken", ["0"])[0])
+            end = start + int(params["limit"][0])
+            body = {"vectors": [{"id": i} for i in ids[start:end]], "namespace": ""}
+            if end < len(ids):
+                body["pagination"] = {"next": str(end)}
+        elif url.path == "/vectors/fetch":
+            if type(self).fail_next_fetch:
+                type(self).fail_next_fetch = False
+                self.send_error(429)
+                return
+            body = {"vectors": {i: _PINECONE_VECTORS[i] for i in params["ids"]}, "namespace": ""}
+        else:
+            self.send_error(404)
+            return
+        self.reply(body)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path == "/describe_index_stats":
+            self.reply({"dimension": 4, "totalVectorCount": len(_PINECONE_VECTORS)})
+        elif self.path == "/query":
+            ids = sorted(_PINECONE_VECTORS)[: request["topK"]]
+            self.reply({"matches": [{**_PINECONE_VECTORS[i], "score": 0.0} for i in ids], "namespace": ""})
+        else:
+            self.send_error(404)
+
+    def reply(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def pinecone_host():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PineconeStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+class TestFromPinecone:
+    """Test Pinecone bulk export against a local REST stand-in."""
+
+    def test_exports_all_vectors_in_list_order(self, pinecone_host):
+        """Ids are listed page by page and fetched in parallel batches, keeping order."""
+        from anywidget_vector.backends.pinecone import RestIndex
+
+        progress = []
+        widget = VectorSpace.from_pinecone(
+            RestIndex(pinecone_host), limit=None, batch_size=40, on_progress=lambda f, n: progress.append(f)
+        )
+        assert [p["id"] for p in widget.points] == sorted(_PINECONE_VECTORS)
+        assert widget.points[7]["n"] == 7
+        assert widget._vectors.shape == (250, 4)
+        assert progress[-1] == 250
+
+    def test_retries_rate_limited_fetch(self, pinecone_host, monkeypatch):
+        """A 429 from fetch is retried with backoff."""
+        from anywidget_vector.backends.pinecone import RestIndex
+
+        monkeypatch.setattr(_PineconeStandIn, "fail_next_fetch", True)
+        monkeypatch.setattr("time.sleep", lambda s: None)
+        widget = VectorSpace.from_pinecone(RestIndex(pinecone_host), limit=30)
+        assert len(widget.points) == 30
+        assert _PineconeStandIn.fail_next_fetch is False
+
+    def test_pod_index_falls_back_to_query(self):
+        """Indexes without the list API are exported with one zero-vector query."""
+
+        class ListUnsupported(Exception):
+            status = 400
+
+        def list_paginated(**kwargs):
+            raise ListUnsupported()
+
+        queries = []
+
+        def query(**kwargs):
+            queries.append(kwargs)
+            return {"matches": [{"id": "p0", "score": 0.0, "values": [1, 2, 3, 4], "metadata": {"n": 0}}]}
+
+        index = SimpleNamespace(
+            list_paginated=list_paginated, describe_index_stats=lambda: {"dimension": 4}, query=query
+        )
+        widget = VectorSpace.from_pinecone(index, limit=20000)
+        assert [p["id"] for p in widget.points] == ["p0"]
+        assert widget._vectors.shape == (1, 4)
+        assert queries[0]["top_k"] == 10000
+        assert queries[0]["vector"] == [0.0] * 4
+
+    def test_rest_index_falls_back_on_pod_host(self, pinecone_host, monkeypatch):
+        """A RestIndex on a pod-based host exports through describe_index_stats and query."""
+        from anywidget_vector.backends.pinecone import RestIndex
+
+        monkeypatch.setattr(_PineconeStandIn, "pod", True)
+        widget = VectorSpace.from_pinecone(RestIndex(pinecone_host), limit=30)
+        assert [p["id"] for p in widget.points] == sorted(_PINECONE_VECTORS)[:30]
+        assert widget._vectors.shape == (30, 4)
+
+    def test_parse_errors_are_not_retried(self, monkeypatch):
+        """Only rate limits, server and connection errors are retried."""
+        from anywidget_vector.backends.pinecone.client import with_retry
+
+        monkeypatch.setattr("time.sleep", lambda s: None)
+        calls = []
+
+        def call():
+            calls.append(1)
+            raise (ConnectionResetError() if len(calls) == 1 else ValueError("bad json"))
+
+        with pytest.raises(ValueError):
+            with_retry(call)
+        assert len(calls) == 2
+
+
 class TestFromUmap:
     """Test from_umap factory method."""
 
@@ -454,6 +1147,37 @@ class TestEventDecorators:
         widget.hovered_point = None
         assert hovers[-1] is None
 
+    def test_on_hover_resolves_compact_payload(self):
+        """Test on_hover expands the browser's {id, index} payload to the full point."""
+        widget = VectorSpace(
+            points=[
+                {"id": "a", "x": 0, "y": 0, "z": 0},
+                {"id": "b", "x": 1, "y": 2, "z": 3, "label": "B"},
+            ]
+        )
+        hovers = []
+
+        @widget.on_hover
+        def handle(point_id, point_data):
+            hovers.append((point_id, point_data))
+
+        assert widget._hover_sync is True
+        widget.hovered_point = {"id": "b", "index": 1}
+        assert hovers[-1] == ("b", widget.points[1])
+        widget.hovered_point = {"id": "a", "index": 1}
+        assert hovers[-1] == ("a", widget.points[0])
+
+    def test_hover_events_are_acknowledged(self):
+        """Test each hover event bumps the ack counter the browser waits on, after the callbacks ran."""
+        widget = VectorSpace(points=[{"id": "a", "x": 0, "y": 0, "z": 0}])
+        assert widget._hover_sync is False
+        acks_seen = []
+        widget.on_hover(lambda pid, data: acks_seen.append(widget._hover_ack))
+        widget.hovered_point = {"id": "a", "index": 0}
+        widget.hovered_point = None
+        assert acks_seen == [0, 1]
+        assert widget._hover_ack == 2
+
     def test_on_selection_fires(self):
         """Test on_selection fires with multiple points."""
         widget = VectorSpace(
@@ -608,6 +1332,244 @@ class TestSetBackend:
         assert widget.show_settings is True
 
 
+class _GatedChroma:
+    """Chroma stand-in whose get() waits until the query's gate is opened."""
+
+    def __init__(self):
+        self.gates = {}
+        self.calls = 0
+
+    def gate(self, name):
+        return self.gates.setdefault(name, threading.Event())
+
+    def get(self, where=None, offset=None, limit=None, include=()):
+        name = where["q"]
+        self.calls += 1
+        self.gate(name).wait(5)
+        return {"ids": [name] if not offset else [], "embeddings": None, "metadatas": None, "documents": None}
+
+
+def _run_query(widget, name):
+    widget.query_input = json.dumps({"where": {"q": name}})
+    widget._execute_query += 1
+
+
+def _run_query_sync(widget, name):
+    """Run a query with its gate open and wait for the result."""
+    widget._backend_client.gate(name).set()
+    _run_query(widget, name)
+    deadline = time.monotonic() + 5
+    while widget._active_query and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def _wait_idle(widget):
+    deadline = time.monotonic() + 5
+    while widget._active_query and time.monotonic() < deadline:
+        time.sleep(0.01)
+    widget._query_executor.shutdown(wait=True)
+
+
+class TestBackgroundQueries:
+    """Test non-blocking Python-side query execution."""
+
+    def test_query_runs_in_background(self):
+        """The observer returns at once; the result, status and latency arrive later."""
+        collection = _GatedChroma()
+        widget = VectorSpace().set_backend("chroma", client=collection)
+        _run_query(widget, "a")
+        assert widget._active_query == 1
+        assert widget.connection_status == "connecting"
+        collection.gate("a").set()
+        _wait_idle(widget)
+        assert [p["id"] for p in widget.points] == ["a"]
+        assert widget.connection_status == "connected"
+        assert widget.query_latency >= 0
+
+    def test_newer_query_supersedes(self):
+        """A stale result is discarded when a newer query was started."""
+        collection = _GatedChroma()
+        widget = VectorSpace().set_backend("chroma", client=collection)
+        _run_query(widget, "old")
+        _run_query(widget, "new")
+        assert widget._active_query == 2
+        collection.gate("new").set()
+        deadline = time.monotonic() + 5
+        while widget._active_query and time.monotonic() < deadline:
+            time.sleep(0.01)
+        collection.gate("old").set()
+        _wait_idle(widget)
+        assert [p["id"] for p in widget.points] == ["new"]
+
+    def test_cancel_discards_result(self):
+        """Cancelling by request id, as the toolbar does, drops the query's result."""
+        collection = _GatedChroma()
+        widget = VectorSpace(points=[{"id": "keep", "x": 0, "y": 0}]).set_backend("chroma", client=collection)
+        _run_query(widget, "a")
+        widget._cancel_query = widget._active_query
+        assert widget._active_query == 0
+        assert widget.connection_status == "connected"
+        collection.gate("a").set()
+        _wait_idle(widget)
+        assert [p["id"] for p in widget.points] == ["keep"]
+
+    def test_query_uses_backend_at_submit_time(self):
+        """A set_backend() between submitting and running a query does not redirect it."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        first, second = _GatedChroma(), _GatedChroma()
+        first.gate("a").set()
+        second.gate("a").set()
+        widget = VectorSpace().set_backend("chroma", client=first)
+        widget._query_executor = ThreadPoolExecutor(max_workers=1)
+        busy = threading.Event()
+        widget._query_executor.submit(busy.wait, 5)
+        _run_query(widget, "a")
+        widget.set_backend("chroma", client=second)
+        busy.set()
+        _wait_idle(widget)
+        assert (first.calls, second.calls) == (1, 0)
+
+    def test_success_clears_error(self):
+        """A successful query clears the previous query's error."""
+        widget = VectorSpace().set_backend("chroma", client=_GatedChroma())
+        widget.query_error = "earlier failure"
+        _run_query_sync(widget, "a")
+        _wait_idle(widget)
+        assert widget.query_error is None
+        assert widget.connection_status == "connected"
+
+
+class TestQueryCache:
+    """Test the query result cache."""
+
+    def test_repeated_query_is_served_from_cache(self):
+        """Re-running the same query (modulo JSON formatting) does not hit the backend."""
+        collection = _GatedChroma()
+        widget = VectorSpace(query_cache_ttl=60).set_backend("chroma", client=collection)
+        _run_query_sync(widget, "a")
+        widget.points = []
+        widget.query_input = '{ "where": { "q": "a" } }'
+        widget._execute_query += 1
+        _wait_idle(widget)
+        assert [p["id"] for p in widget.points] == ["a"]
+        assert collection.calls == 1
+        assert widget.query_cache_stats["kernel"]["hits"] == 1
+        assert widget.query_cache_stats["kernel"]["hit_rate"] == 0.5
+
+    def test_clear_invalidates(self):
+        """clear_query_cache() drops kernel results and tells the browser to clear its store."""
+        collection = _GatedChroma()
+        widget = VectorSpace(query_cache_ttl=60).set_backend("chroma", client=collection)
+        _run_query_sync(widget, "a")
+        widget.clear_query_cache()
+        assert widget._cache_epoch == 1
+        _run_query_sync(widget, "a")
+        _wait_idle(widget)
+        assert collection.calls == 2
+
+    def test_set_backend_clears_cache(self):
+        """Switching the client drops results cached for the previous one."""
+        first, second = _GatedChroma(), _GatedChroma()
+        widget = VectorSpace(query_cache_ttl=60).set_backend("chroma", client=first)
+        _run_query_sync(widget, "a")
+        widget.set_backend("chroma", client=second)
+        _run_query_sync(widget, "a")
+        _wait_idle(widget)
+        assert second.calls == 1
+
+    def test_disabled_by_default(self):
+        """Without a query_cache_ttl every run hits the backend."""
+        collection = _GatedChroma()
+        widget = VectorSpace().set_backend("chroma", client=collection)
+        _run_query_sync(widget, "a")
+        _run_query_sync(widget, "a")
+        _wait_idle(widget)
+        assert collection.calls == 2
+
+    def test_ttl_and_lru(self):
+        """Entries expire after the TTL and the least recently used is evicted first."""
+        from anywidget_vector.backends.cache import QueryCache
+
+        cache = QueryCache(max_entries=2, ttl=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        short = QueryCache(ttl=0.01)
+        short.put("a", 1)
+        time.sleep(0.02)
+        assert short.get("a") is None
+
+
+class _FakeLanceSearch:
+    """Stands in for a LanceDB vector query over several query vectors."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def limit(self, limit):
+        self.limit_ = limit
+        return self
+
+    def to_list(self):
+        rows = []
+        for index, vector in enumerate(self.vectors):
+            for rank in range(self.limit_):
+                rows.append({"id": f"p{index + rank}", "vector": vector, "_distance": rank, "query_index": index})
+        return rows
+
+
+class TestBatchSearch:
+    """Test multi-query batch search."""
+
+    def test_merge_results(self):
+        """Points matched by several queries are merged, keeping the best score."""
+        from anywidget_vector.backends.batch import merge_results
+
+        merged = merge_results(
+            [[{"id": "a", "score": 0.5}, {"id": "b", "score": 0.9}], [{"id": "b", "score": 0.95}, {"id": "c"}]]
+        )
+        assert [p["id"] for p in merged] == ["a", "b", "c"]
+        assert merged[1] == {"id": "b", "score": 0.95, "query": 1, "queries": [0, 1]}
+        assert merged[0]["queries"] == [0]
+        assert merged[2]["query"] == 1
+
+    def test_chroma_multi_query(self):
+        """Every result set of a multi-embedding Chroma query is converted and merged."""
+        from anywidget_vector.backends.chroma import to_columns, to_points
+
+        response = {
+            "ids": [["a", "b"], ["b", "c"]],
+            "embeddings": [[[1, 0, 0], [0, 1, 0]], [[0, 1, 0], [0, 0, 1]]],
+            "metadatas": [[{"k": 1}, {"k": 2}], [{"k": 2}, {"k": 3}]],
+            "distances": [[0.0, 1.0], [0.0, 0.5]],
+        }
+        points = to_points(response)
+        assert [(p["id"], p["queries"]) for p in points] == [("a", [0]), ("b", [0, 1]), ("c", [1])]
+        assert points[1]["score"] == 1.0
+        assert points[1]["query"] == 1
+        columns = to_columns(response)
+        assert columns["ids"] == ["a", "b", "c"]
+        assert columns["metadata"]["query"] == [0, 1, 1]
+        assert columns["vectors"].shape == (3, 3)
+        single = to_points({key: value[:1] for key, value in response.items()})
+        assert "query" not in single[0]
+
+    def test_lancedb_vectors(self):
+        """A LanceDB "vectors" query runs one search and groups rows by query_index."""
+        from anywidget_vector.backends.lancedb import execute_query
+
+        table = SimpleNamespace(search=_FakeLanceSearch)
+        points = execute_query(table, {"vectors": [[1, 0, 0], [0, 1, 0]], "limit": 2})
+        assert [p["id"] for p in points] == ["p0", "p1", "p2"]
+        assert points[1]["queries"] == [0, 1]
+        assert points[1]["query"] == 1
+        assert "query_index" not in points[0]
+
+
 class TestSelectionModeTraitlet:
     """Test selection_mode CaselessStrEnum."""
 